@@ -0,0 +1,45 @@
+# benchmarks/bench_erlang.py
+"""
+Compara o cálculo de P0/Lq do M/M/s pela soma de fatoriais (caminho antigo
+de MMS/MMC/MMSK) com o núcleo Erlang de ``models.erlang``.
+
+Uso: python benchmarks/bench_erlang.py
+"""
+import math
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import MMS  # noqa: E402
+
+
+def mms_fatoriais(lambd, mi, s):
+    """Implementação original de MMS.calcular_variaveis_faltantes (P0 e Lq)."""
+    rho = lambd / (s * mi)
+    soma = sum((lambd / mi) ** n / math.factorial(n) for n in range(s))
+    termo = ((lambd / mi) ** s) / (math.factorial(s) * (1 - rho))
+    P0 = 1 / (soma + termo)
+    return (P0 * (lambd / mi) ** s * rho) / (math.factorial(s) * (1 - rho) ** 2)
+
+
+def medir(funcao, repeticoes=5):
+    numero, _ = timeit.Timer(funcao).autorange()
+    return min(timeit.repeat(funcao, number=numero, repeat=repeticoes)) / numero
+
+
+def main():
+    print(f"{'s':>6} {'ρ':>5} {'fatoriais (µs)':>16} {'Erlang (µs)':>12} {'Lq':>14}")
+    for s in (10, 50, 100, 169, 500, 1000, 5000):
+        lambd = 0.95 * s
+        try:
+            t_antigo = f"{medir(lambda: mms_fatoriais(lambd, 1.0, s)) * 1e6:16.1f}"
+        except (OverflowError, ZeroDivisionError) as erro:
+            t_antigo = f"{type(erro).__name__:>16}"
+        t_novo = medir(lambda: MMS(lambd, 1.0, s)) * 1e6
+        print(f"{s:>6} {0.95:>5} {t_antigo} {t_novo:12.1f} {MMS(lambd, 1.0, s).Lq:14.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_mm1n.py
+"""
+Regressão de desempenho do M/M/1/N: fórmula original com fatoriais (O(N²)
+em inteiros grandes) contra a recorrência nascimento-morte em espaço log.
+
+Uso: python benchmarks/bench_mm1n.py
+"""
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import MM1N  # noqa: E402
+
+
+def mm1n_fatoriais(lam, mu, N):
+    """Implementação original de MM1N._calcular (P0 e L)."""
+    a = lam / mu
+    soma = sum(math.factorial(N) / math.factorial(N - k) * (a ** k) for k in range(N + 1))
+    P0 = 1 / soma
+    probs = [math.factorial(N) / math.factorial(N - k) * (a ** k) * P0 for k in range(N + 1)]
+    return sum(k * probs[k] for k in range(N + 1))
+
+
+def cronometrar(funcao, limite=2.0):
+    """Menor tempo de algumas execuções, sem passar de ``limite`` segundos no total."""
+    melhor, gasto = math.inf, 0.0
+    while gasto < limite:
+        inicio = time.perf_counter()
+        funcao()
+        dt = time.perf_counter() - inicio
+        melhor, gasto = min(melhor, dt), gasto + dt
+        if dt > limite / 4:
+            break
+    return melhor
+
+
+def main():
+    lam, mu = 0.01, 1.0
+    print(f"{'N':>9} {'fatoriais (ms)':>16} {'log-espaço (ms)':>16} {'L':>14}")
+    for N in (10, 100, 170, 1_000, 100_000, 1_000_000):
+        if N <= 1_000:
+            try:
+                antigo = f"{cronometrar(lambda: mm1n_fatoriais(lam, mu, N)) * 1e3:16.3f}"
+            except OverflowError as erro:
+                antigo = f"{type(erro).__name__:>16}"
+        else:
+            antigo = f"{'(omitido)':>16}"
+        novo = cronometrar(lambda: MM1N(lam, mu, N)) * 1e3
+        print(f"{N:>9} {antigo} {novo:16.3f} {MM1N(lam, mu, N).L:14.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/carga_servico.py
+"""
+Teste de carga do serviço JSON (servico.py): várias conexões HTTP/1.1
+keep-alive em paralelo, cada uma enviando requisições em sequência; no fim
+mostra requisições/s e as latências p50, p95 e p99.
+
+Uso:
+  uvicorn servico:app --port 8000 &
+  python benchmarks/carga_servico.py --url http://127.0.0.1:8000 --requisicoes 20000
+
+Com ``--embutido`` a aplicação ASGI é chamada no próprio processo, sem rede
+(mede só o custo do serviço e dos modelos).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# corpo de exemplo por modelo; com --variar o λ muda a cada requisição
+CORPOS = {
+    "mm1": {"lam": 0.8, "mu": 1.0},
+    "mms": {"lam": 40.0, "mu": 1.0, "s": 45},
+    "mmsk": {"lam": 40.0, "mu": 1.0, "s": 45, "K": 200},
+    "mmsn": {"lam": 0.1, "mu": 1.0, "s": 10, "N": 500},
+}
+
+
+def corpo_da_requisicao(modelo: str, variar: bool) -> bytes:
+    corpo = dict(CORPOS[modelo])
+    if variar:
+        corpo["lam"] *= random.uniform(0.5, 1.0)
+    return json.dumps(corpo).encode()
+
+
+async def _conexao_http(url, caminho, modelo, variar, total, latencias, falhas):
+    leitor, escritor = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        for _ in range(total):
+            corpo = corpo_da_requisicao(modelo, variar)
+            inicio = time.perf_counter()
+            escritor.write(
+                f"POST {caminho} HTTP/1.1\r\nHost: {url.netloc}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo
+            )
+            await escritor.drain()
+            cabecalho = await leitor.readuntil(b"\r\n\r\n")
+            status = int(cabecalho.split(b" ", 2)[1])
+            tamanho = 0
+            for linha in cabecalho.split(b"\r\n"):
+                if linha.lower().startswith(b"content-length:"):
+                    tamanho = int(linha.split(b":", 1)[1])
+            await leitor.readexactly(tamanho)
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                falhas.append(status)
+    finally:
+        escritor.close()
+
+
+async def _conexao_embutida(app, caminho, modelo, variar, total, latencias, falhas):
+    for _ in range(total):
+        corpo = corpo_da_requisicao(modelo, variar)
+        recebido = []
+
+        async def receive():
+            return {"type": "http.request", "body": corpo, "more_body": False}
+
+        async def send(mensagem):
+            recebido.append(mensagem)
+
+        inicio = time.perf_counter()
+        await app({"type": "http", "method": "POST", "path": caminho}, receive, send)
+        latencias.append(time.perf_counter() - inicio)
+        if recebido[0]["status"] != 200:
+            falhas.append(recebido[0]["status"])
+
+
+def percentil(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+async def executar(args):
+    caminho = f"/modelos/{args.modelo}"
+    por_conexao = max(1, args.requisicoes // args.conexoes)
+    latencias, falhas = [], []
+    if args.embutido:
+        from servico import app
+        tarefas = [_conexao_embutida(app, caminho, args.modelo, args.variar, por_conexao, latencias, falhas)
+                   for _ in range(args.conexoes)]
+    else:
+        url = urlparse(args.url)
+        tarefas = [_conexao_http(url, caminho, args.modelo, args.variar, por_conexao, latencias, falhas)
+                   for _ in range(args.conexoes)]
+    inicio = time.perf_counter()
+    await asyncio.gather(*tarefas)
+    duracao = time.perf_counter() - inicio
+
+    print(f"{len(latencias)} requisições em {duracao:.2f} s ({len(latencias) / duracao:,.0f} req/s), "
+          f"{len(falhas)} com erro")
+    for nome, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"  {nome}: {percentil(latencias, q) * 1000:8.3f} ms")
+    print(f"  máx: {max(latencias) * 1000:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--modelo", choices=sorted(CORPOS), default="mms")
+    parser.add_argument("--requisicoes", type=int, default=20_000)
+    parser.add_argument("--conexoes", type=int, default=64)
+    parser.add_argument("--variar", action="store_true", help="varia λ para medir sem acertos no cache")
+    parser.add_argument("--embutido", action="store_true", help="chama a aplicação ASGI sem rede")
+    asyncio.run(executar(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# benchmarks/suite.py
+"""
+Suíte de desempenho: mede construção + ``resolver()`` de cada modelo em
+escalas pequena, média e enorme de s, K e N, além de cenários em lote,
+varreduras e dimensionamento. Os tempos (melhor de várias execuções) são
+gravados em JSON para acompanhar a tendência, e a comparação com uma
+execução anterior falha (código de saída 1) quando algum caso fica mais lento
+que o limite.
+
+Uso:
+  python benchmarks/suite.py --saida base.json
+  python benchmarks/suite.py --comparar base.json --limite 0.25
+  python benchmarks/suite.py --filtro mmsn --rapido
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from models import (  # noqa: E402
+    MG1, MM1, MM1K, MM1N, MMC, MMS, MMSK, MMSN, MMInfinity, MPrioridades, RedeJackson, modelo,
+)
+
+
+def _classes(m):
+    return [{"lam": 0.5 / m, "mu": 1.0 + (i % 3), "sigma2": 0.5} for i in range(m)]
+
+
+def casos():
+    """Nome do caso → função sem argumentos a cronometrar."""
+    c = {
+        "mm1": lambda: MM1(0.8, 1.0).resolver(),
+        "mg1": lambda: MG1(0.8, 1.0, 0.7).resolver(),
+        "mminfinity": lambda: MMInfinity(30.0, 1.0).resolver(),
+    }
+    for escala, s in (("pequeno", 5), ("medio", 500), ("enorme", 50_000)):
+        c[f"mmc/{escala}"] = lambda s=s: MMC(0.9 * s, 1.0, s).resolver()
+        c[f"mms/{escala}"] = lambda s=s: MMS(0.9 * s, 1.0, s).resolver()
+    for escala, K in (("pequeno", 10), ("medio", 10_000), ("enorme", 1_000_000)):
+        c[f"mm1k/{escala}"] = lambda K=K: MM1K(0.9, 1.0, K).resolver()
+    for escala, s, K in (("pequeno", 5, 20), ("medio", 100, 10_000), ("enorme", 1_000, 1_000_000)):
+        c[f"mmsk/{escala}"] = lambda s=s, K=K: MMSK(0.95 * s, 1.0, s, K).resolver()
+    for escala, N in (("pequeno", 10), ("medio", 10_000), ("enorme", 1_000_000)):
+        c[f"mm1n/{escala}"] = lambda N=N: MM1N(1.0 / N, 1.0, N).resolver()
+    for escala, s, N in (("pequeno", 3, 20), ("medio", 50, 10_000), ("enorme", 500, 1_000_000)):
+        c[f"mmsn/{escala}"] = lambda s=s, N=N: MMSN(0.8 * s / N, 1.0, s, N).resolver()
+    for escala, m in (("pequeno", 3), ("medio", 30), ("enorme", 300)):
+        classes = _classes(m)
+        c[f"mprioridades/{escala}"] = lambda cl=classes: MPrioridades(cl, preemptive=False).resolver()
+
+    # lotes de 100 mil cenários pelo caminho vetorizado
+    rng = np.random.default_rng(0)
+    n = 100_000
+    lam = rng.uniform(0.1, 0.95, n)
+    c["lote/mm1"] = lambda: MM1.resolver_lote(lam, 1.0)
+    c["lote/mg1"] = lambda: MG1.resolver_lote(lam, 1.0, 0.5)
+    c["lote/mms"] = lambda: MMS.resolver_lote(lam * 20, 1.0, 20)
+    c["lote/mmsk"] = lambda: MMSK.resolver_lote(lam * 20, 1.0, 20, 60)
+    c["lote/mmsn"] = lambda: MMSN.resolver_lote(lam / 10, 1.0, 5, 40)
+
+    # varreduras de 10 mil pontos (modo de varredura do app)
+    c["varredura/mms_s"] = lambda: modelo("mms").resolver_lote({"lam": 500.0, "mu": 1.0, "s": np.arange(2, 10_002)})
+    c["varredura/mmsk_K"] = lambda: modelo("mmsk").resolver_lote(
+        {"lam": 50.0, "mu": 1.0, "s": 45, "K": np.arange(46, 10_046)})
+    c["varredura/mmsn_lam"] = lambda: modelo("mmsn").resolver_lote(
+        {"lam": np.linspace(1e-4, 1e-2, 10_000), "mu": 1.0, "s": 5, "N": 500})
+
+    # re-solução incremental: 1000 passos de K (e alguns de s) sobre um M/M/s/K grande
+    def incremental_mmsk():
+        m = MMSK(9.0, 1.0, 10, 500_000)
+        for K in range(500_001, 501_001):
+            m.with_params(K=K).W
+        for s in (11, 12, 9):
+            m.with_params(s=s).W
+
+    c["incremental/mmsk_K"] = incremental_mmsk
+
+    # população finita: 1000 passos de N e uma troca de λ sobre um M/M/1/N grande
+    def incremental_mm1n():
+        m = MM1N(1e-6, 1.0, 500_000)
+        for N in range(500_001, 501_001):
+            m.with_params(N=N).W
+        m.with_params(lam=2e-6).W
+
+    c["incremental/mm1n_N"] = incremental_mm1n
+
+    # M/M/s/N grande: 1000 passos de N e trocas de λ e s
+    def incremental_mmsn():
+        m = MMSN(1e-4, 1.0, 20, 500_000)
+        for N in range(500_001, 501_001):
+            m.with_params(N=N).W
+        for mudanca in ({"lam": 2e-4}, {"s": 25}, {"mu": 1.5}):
+            m.with_params(**mudanca).W
+
+    c["incremental/mmsn_N"] = incremental_mmsn
+
+    # rede de Jackson aberta com 5000 estações e 3 rotas por estação
+    rng = np.random.default_rng(0)
+    n_rede = 5_000
+    rotas = (np.repeat(np.arange(n_rede), 3), rng.integers(0, n_rede, 3 * n_rede), np.full(3 * n_rede, 0.3))
+    estacoes = [{"modelo": "mmc", "mu": 50.0, "s": 2}] * n_rede
+    chegadas = rng.random(n_rede)
+    c["rede/jackson_5000"] = lambda: RedeJackson(estacoes, rotas, chegadas).resolver().to_dict()
+
+    # λ(t) por minuto: uma semana pelas aproximações, um dia pelo transiente
+    minutos = np.arange(7 * 1440)
+    lam_t = np.clip(6 + 4 * np.sin(2 * np.pi * (minutos / 1440 - 0.3)), 0.2, None)
+    c["tempo/psa_semana"] = lambda: MMSK.resolver_no_tempo(lam_t, 0.25, 45, 60, metodo="psa")
+    c["tempo/fluido_semana"] = lambda: MMS.resolver_no_tempo(lam_t, 0.25, 45, metodo="fluido")
+    c["tempo/transiente_dia"] = lambda: MMSK.resolver_no_tempo(lam_t[:1440], 0.25, 45, 60)
+
+    # dimensionamento inverso
+    c["dimensionar/mms"] = lambda: MMS.dimensionar(5_000, 1.0, Wq_max=0.01)
+    c["dimensionar/mmsk"] = lambda: MMSK.dimensionar(300, 1.0, K=400, P_bloqueio_max=0.01)
+    c["dimensionar/mmsn"] = lambda: MMSN.dimensionar(0.01, 1.0, 2_000, P_espera_max=0.1)
+    return c
+
+
+def cronometrar(funcao, limite=1.0, repeticoes=7):
+    """Melhor tempo de até ``repeticoes`` execuções, sem passar de ``limite`` segundos."""
+    funcao()  # aquecimento (imports, caches de NumPy)
+    melhor, gasto, feitas = math.inf, 0.0, 0
+    while feitas < repeticoes and gasto < limite:
+        inicio = time.perf_counter()
+        funcao()
+        dt = time.perf_counter() - inicio
+        melhor, gasto, feitas = min(melhor, dt), gasto + dt, feitas + 1
+    return melhor
+
+
+def executar(filtro=None, limite=1.0):
+    resultados = {}
+    for nome, funcao in casos().items():
+        if filtro and filtro not in nome:
+            continue
+        resultados[nome] = cronometrar(funcao, limite)
+        print(f"{nome:<24} {resultados[nome] * 1e3:12.3f} ms", flush=True)
+    return {
+        "meta": {
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "maquina": platform.platform(),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual, base, limite):
+    """Casos mais lentos que ``(1 + limite)`` vezes a base."""
+    regressoes = []
+    print(f"\n{'caso':<24} {'base (ms)':>12} {'atual (ms)':>12} {'razão':>8}")
+    for nome, tempo in atual["resultados"].items():
+        anterior = base["resultados"].get(nome)
+        if anterior is None:
+            continue
+        razao = tempo / anterior
+        marca = "  ← regressão" if razao > 1 + limite else ""
+        print(f"{nome:<24} {anterior * 1e3:12.3f} {tempo * 1e3:12.3f} {razao:8.2f}{marca}")
+        if marca:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de desempenho dos modelos de filas.")
+    parser.add_argument("--saida", help="grava os resultados neste arquivo JSON")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--limite", type=float, default=0.25, help="lentidão tolerada (0.25 = 25%%)")
+    parser.add_argument("--filtro", help="só os casos cujo nome contém este texto")
+    parser.add_argument("--rapido", action="store_true", help="menos repetições por caso")
+    args = parser.parse_args()
+
+    atual = executar(args.filtro, limite=0.2 if args.rapido else 1.0)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(atual, f, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regressoes = comparar(atual, json.load(f), args.limite)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.limite:.0%}: {', '.join(regressoes)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
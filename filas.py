@@ -0,0 +1,453 @@
+# filas.py
+"""
+Simulação de eventos discretos para validar (e estender) os modelos analíticos
+do pacote ``models``.
+
+O ``Simulador`` cobre M/M/1, M/G/1, M/M/s, M/M/s/K, M/M/s/N e a fila M/G/1 com
+prioridades de ``MPrioridades`` (preemptiva ou não). Filas FIFO de um servidor
+sem limite de capacidade usam a recorrência de Lindley vetorizada em NumPy;
+os demais casos usam um calendário de eventos em heap. Os números aleatórios
+são sorteados em blocos e consumidos um a um, e as medidas saem com intervalos
+de confiança de 95% por médias em lotes (batch means).
+"""
+import heapq
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_BLOCO = 1 << 16
+
+_CHEGADA, _PARTIDA = 0, 1
+
+
+class Cliente:
+    """Registro de um cliente no sistema."""
+    __slots__ = ("chegada", "servico", "restante", "classe", "fonte")
+
+    def __init__(self, chegada, classe=0, fonte=-1):
+        self.chegada = chegada
+        self.servico = 0.0    # requisito total de serviço
+        self.restante = -1.0  # serviço que falta (só após preempção)
+        self.classe = classe
+        self.fonte = fonte
+
+
+def _fluxo(gerar, bloco=_BLOCO):
+    """Iterador infinito sobre sorteios feitos em blocos de ``bloco`` valores."""
+    while True:
+        yield from gerar(bloco).tolist()
+
+
+def _gerador_servico(rng, media, variancia):
+    """
+    Tempos de serviço com a média e a variância pedidas: determinístico se a
+    variância é zero, senão Gama (exponencial quando variância = média²).
+    """
+    if variancia <= 0:
+        return lambda n: np.full(n, media)
+    forma = media ** 2 / variancia
+    escala = variancia / media
+    return lambda n: rng.gamma(forma, escala, n)
+
+
+def _quantil_t(gl):
+    """Quantil 0,975 da t de Student (expansão de Cornish-Fisher)."""
+    z = 1.959963984540054
+    if gl <= 0:
+        return math.inf
+    return z + (z ** 3 + z) / (4 * gl) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * gl ** 2)
+
+
+def _intervalo(valores):
+    v = np.asarray(valores, dtype=float)
+    media = float(v.mean())
+    if len(v) < 2:
+        return media, (media, media)
+    meia = _quantil_t(len(v) - 1) * float(v.std(ddof=1)) / math.sqrt(len(v))
+    return media, (media - meia, media + meia)
+
+
+class Simulador:
+    """
+    Simulador de eventos discretos.
+
+    - ``lam``, ``mu``, ``s``: taxa de chegada, taxa de serviço e servidores
+    - ``K``: capacidade do sistema (chegadas com o sistema cheio são perdidas)
+    - ``N``: população finita; cada cliente fora do sistema volta com taxa ``lam``
+    - ``sigma``: desvio padrão do tempo de serviço (M/G/1); padrão exponencial
+    - ``classes``: lista de classes no formato de ``MPrioridades`` (um servidor)
+    """
+
+    def __init__(
+        self,
+        lam: Optional[float] = None,
+        mu: Optional[float] = None,
+        s: int = 1,
+        K: Optional[int] = None,
+        N: Optional[int] = None,
+        sigma: Optional[float] = None,
+        classes: Optional[List[Dict[str, float]]] = None,
+        preemptive: bool = True,
+        seed=None,
+    ):
+        self.s = int(s)
+        self.K = None if K is None else int(K)
+        self.N = None if N is None else int(N)
+        self.preemptive = preemptive
+        self.seed = seed
+
+        if classes:
+            if self.s != 1:
+                raise ValueError("Prioridades só são simuladas com um servidor (M/G/1)")
+            self.lams = [float(c.get("lam", c.get("lambda"))) for c in classes]
+            self.medias = [1 / float(c["mu"]) for c in classes]
+            self.variancias = [float(c.get("sigma2", 0.0)) for c in classes]
+        else:
+            if lam is None or mu is None:
+                raise ValueError("λ e μ são necessários para simular")
+            self.lams = [float(lam)]
+            self.medias = [1 / float(mu)]
+            self.variancias = [(1 / float(mu)) ** 2 if sigma is None else float(sigma) ** 2]
+        self.prioridades = bool(classes)
+
+        if min(self.lams) < 0 or min(self.medias) <= 0 or self.s < 1:
+            raise ValueError("λ ≥ 0, μ > 0 e s ≥ 1 são necessários")
+        if self.K is not None and self.K < self.s:
+            raise ValueError("K deve ser >= s")
+        if self.N is not None and self.N < 1:
+            raise ValueError("N deve ser >= 1")
+
+    @classmethod
+    def de_modelo(cls, modelo, seed=None):
+        """Monta o simulador com os parâmetros de uma instância de ``models``."""
+        nome = type(modelo).__name__
+        if nome == "MPrioridades":
+            return cls(classes=modelo.raw_classes, preemptive=modelo.preemptive, seed=seed)
+        lam = getattr(modelo, "lam", getattr(modelo, "lambd", None))
+        mu = getattr(modelo, "mu", getattr(modelo, "mi", None))
+        s = getattr(modelo, "s", getattr(modelo, "c", 1))
+        if nome == "MMInfinity":
+            raise ValueError("M/M/∞ não tem fila a simular")
+        return cls(
+            lam, mu, s=s,
+            K=getattr(modelo, "K", None),
+            N=getattr(modelo, "N", None),
+            sigma=getattr(modelo, "sigma", None),
+            seed=seed,
+        )
+
+    # -----------------------------------------------------
+    # EXECUÇÃO
+    # -----------------------------------------------------
+    def executar(self, clientes: int = 200_000, aquecimento: int = 20_000, lotes: int = 20) -> Dict:
+        """
+        Simula até ``clientes`` partidas medidas, depois de descartar as
+        ``aquecimento`` primeiras, e devolve as medidas com IC de 95%.
+        """
+        if clientes < lotes:
+            raise ValueError("São necessários pelo menos tantos clientes quanto lotes")
+        inicio = time.perf_counter()
+        estat = self._estatisticas(clientes, aquecimento, lotes, self.seed)
+        decorrido = time.perf_counter() - inicio
+        return self._resultado(estat, decorrido)
+
+    def replicar(self, replicacoes: int = 32, workers: Optional[int] = None, clientes: int = 200_000,
+                 aquecimento: int = 20_000, lotes: int = 20) -> Dict:
+        """Replicações independentes em paralelo (ver ``replicar``)."""
+        return replicar(self, replicacoes, workers, clientes, aquecimento, lotes)
+
+    def _estatisticas(self, clientes, aquecimento, lotes, seed):
+        rng = np.random.default_rng(seed)
+        if not self.prioridades and self.s == 1 and self.K is None and self.N is None:
+            return self._lindley(rng, clientes, aquecimento, lotes)
+        return self._eventos(rng, clientes, aquecimento, lotes)
+
+    def _lindley(self, rng, clientes, aquecimento, lotes):
+        """
+        FIFO com um servidor e fila infinita: Wq_k = max(0, Wq_{k-1} + S_{k-1} - A_k),
+        resolvida por blocos com somas e mínimos acumulados.
+        """
+        lam = self.lams[0]
+        if lam >= 1 / self.medias[0]:
+            raise ValueError("Sistema instável: λ ≥ μ")
+        servico = _gerador_servico(rng, self.medias[0], self.variancias[0])
+        total = aquecimento + clientes
+        Wq = np.empty(total)
+        S = np.empty(total)
+        A = np.empty(total)  # instantes de chegada
+        espera, t, s_ant = 0.0, 0.0, 0.0
+        for ini in range(0, total, 1 << 20):
+            n = min(1 << 20, total - ini)
+            entre = rng.exponential(1 / lam, n)
+            serv = servico(n)
+            X = np.concatenate(([s_ant], serv[:-1])) - entre
+            U = np.cumsum(X)
+            Wq[ini:ini + n] = U - np.minimum(np.minimum.accumulate(U), -espera)
+            S[ini:ini + n] = serv
+            A[ini:ini + n] = t + np.cumsum(entre)
+            espera, t, s_ant = Wq[ini + n - 1], A[ini + n - 1], serv[-1]
+
+        Wq, S, A = Wq[aquecimento:], S[aquecimento:], A[aquecimento:]
+        W = Wq + S
+        partes = np.array_split(np.arange(clientes), lotes)
+        lote = {"L": [], "Lq": [], "W": [], "Wq": []}
+        for idx in partes:
+            duracao = A[idx[-1]] - A[idx[0]] if len(idx) > 1 else 0.0
+            taxa = (len(idx) - 1) / duracao if duracao > 0 else 0.0
+            lote["W"].append(W[idx].mean())
+            lote["Wq"].append(Wq[idx].mean())
+            lote["L"].append(taxa * W[idx].mean())    # L = λ·W por lote
+            lote["Lq"].append(taxa * Wq[idx].mean())
+        return {"lotes": lote, "eventos": 2 * (aquecimento + clientes), "bloqueio": None, "classes": None}
+
+    def _eventos(self, rng, clientes, aquecimento, lotes):
+        """Calendário de eventos em heap para s servidores, K, N e prioridades."""
+        s, K, N = self.s, self.K, self.N
+        m = len(self.lams)
+        lam_total = sum(self.lams)
+        preemptive = self.prioridades and self.preemptive
+
+        chegadas = _fluxo(lambda n: rng.exponential(1 / lam_total, n)).__next__
+        servicos = [_fluxo(_gerador_servico(rng, self.medias[i], self.variancias[i])).__next__ for i in range(m)]
+        if m > 1:
+            p = np.array(self.lams) / lam_total
+            sortear_classe = _fluxo(lambda n: rng.choice(m, size=n, p=p)).__next__
+        else:
+            sortear_classe = None
+
+        heap: list = []
+        push, pop = heapq.heappush, heapq.heappop
+        seq = 0
+        if N is None:
+            push(heap, (chegadas(), seq, _CHEGADA, -1, 0))
+        else:
+            retorno = _fluxo(lambda n: rng.exponential(1 / self.lams[0], n)).__next__
+            for f in range(N):
+                seq += 1
+                push(heap, (retorno(), seq, _CHEGADA, f, 0))
+
+        filas = [deque() for _ in range(m)]
+        em_servico: List[Optional[Cliente]] = [None] * s
+        fim_servico = [0.0] * s
+        versao = [0] * s
+        livres = list(range(s - 1, -1, -1))
+
+        n_sist = 0
+        ocupados = 0
+        agora = 0.0
+        ultimo = 0.0
+        partidas = 0
+        medindo = aquecimento == 0
+        por_lote = clientes / lotes
+        b = 0
+        area = [0.0] * lotes
+        area_q = [0.0] * lotes
+        tempo = [0.0] * lotes
+        soma_w = [0.0] * lotes
+        soma_wq = [0.0] * lotes
+        cont = [0] * lotes
+        classe_w = [0.0] * m
+        classe_wq = [0.0] * m
+        classe_n = [0] * m
+        chegadas_medidas = 0
+        bloqueados = 0
+        eventos = 0
+
+        def iniciar(c, srv, t):
+            """Coloca c no servidor e agenda a partida; a versão invalida partidas antigas."""
+            nonlocal seq
+            if c.restante < 0:
+                c.servico = servicos[c.classe]()
+                c.restante = c.servico
+            em_servico[srv] = c
+            fim_servico[srv] = t + c.restante
+            versao[srv] += 1
+            seq += 1
+            push(heap, (fim_servico[srv], seq, _PARTIDA, srv, versao[srv]))
+
+        while partidas < aquecimento + clientes:
+            agora, _, tipo, dado, ver = pop(heap)
+            eventos += 1
+            if medindo:
+                dt = agora - ultimo
+                area[b] += n_sist * dt
+                area_q[b] += (n_sist - ocupados) * dt
+                tempo[b] += dt
+            ultimo = agora
+
+            if tipo == _CHEGADA:
+                if N is None:
+                    seq += 1
+                    push(heap, (agora + chegadas(), seq, _CHEGADA, -1, 0))
+                if medindo:
+                    chegadas_medidas += 1
+                if K is not None and n_sist >= K:
+                    if medindo:
+                        bloqueados += 1
+                    continue
+                c = Cliente(agora, sortear_classe() if sortear_classe else 0, dado)
+                n_sist += 1
+                if livres:
+                    ocupados += 1
+                    iniciar(c, livres.pop(), agora)
+                elif preemptive and c.classe < em_servico[0].classe:
+                    vitima = em_servico[0]
+                    vitima.restante = fim_servico[0] - agora
+                    filas[vitima.classe].appendleft(vitima)
+                    iniciar(c, 0, agora)
+                else:
+                    filas[c.classe].append(c)
+                continue
+
+            # partida do servidor ``dado``; descartada se o cliente foi preemptado
+            srv = dado
+            if ver != versao[srv]:
+                eventos -= 1
+                continue
+            c = em_servico[srv]
+            n_sist -= 1
+            partidas += 1
+            if medindo:
+                w = agora - c.chegada
+                wq = w - c.servico
+                soma_w[b] += w
+                soma_wq[b] += wq
+                cont[b] += 1
+                classe_w[c.classe] += w
+                classe_wq[c.classe] += wq
+                classe_n[c.classe] += 1
+                if cont[b] >= por_lote and b < lotes - 1:
+                    b += 1
+            elif partidas >= aquecimento:
+                medindo = True
+            if N is not None:
+                seq += 1
+                push(heap, (agora + retorno(), seq, _CHEGADA, c.fonte, 0))
+
+            proximo = None
+            for fila in filas:
+                if fila:
+                    proximo = fila.popleft()
+                    break
+            if proximo is None:
+                em_servico[srv] = None
+                livres.append(srv)
+                ocupados -= 1
+            else:
+                iniciar(proximo, srv, agora)
+
+        lote = {
+            "L": [area[i] / tempo[i] for i in range(lotes)],
+            "Lq": [area_q[i] / tempo[i] for i in range(lotes)],
+            "W": [soma_w[i] / cont[i] for i in range(lotes)],
+            "Wq": [soma_wq[i] / cont[i] for i in range(lotes)],
+        }
+        classes = None
+        if self.prioridades:
+            classes = {
+                i + 1: {
+                    "W": classe_w[i] / classe_n[i] if classe_n[i] else float("nan"),
+                    "Wq": classe_wq[i] / classe_n[i] if classe_n[i] else float("nan"),
+                    "clientes": classe_n[i],
+                }
+                for i in range(m)
+            }
+        bloqueio = bloqueados / chegadas_medidas if K is not None and chegadas_medidas else None
+        return {"lotes": lote, "eventos": eventos, "bloqueio": bloqueio, "classes": classes}
+
+    def _nome(self):
+        if self.prioridades:
+            return "M/G/1 com prioridades (" + ("preemptive" if self.preemptive else "non-preemptive") + ")"
+        geral = self.variancias[0] != self.medias[0] ** 2
+        nome = f"M/{'G' if geral else 'M'}/{self.s}"
+        if self.K is not None:
+            nome += f"/{self.K}"
+        if self.N is not None:
+            nome += f"/N={self.N}"
+        return nome
+
+    def _resultado(self, estat, decorrido):
+        medidas, intervalos = {}, {}
+        for chave in ("L", "Lq", "W", "Wq"):
+            medidas[chave], intervalos[chave] = _intervalo(estat["lotes"][chave])
+        resultado = {
+            "Modelo": f"Simulação {self._nome()}",
+            "Parâmetros": {"λ": sum(self.lams), "s": self.s, "K": self.K, "N": self.N},
+            "Medidas de Efetividade": medidas,
+            "Intervalos de Confiança (95%)": intervalos,
+            "Desempenho": {
+                "eventos": estat["eventos"],
+                "segundos": decorrido,
+                "eventos/s": estat["eventos"] / decorrido if decorrido > 0 else float("inf"),
+            },
+        }
+        if estat["bloqueio"] is not None:
+            resultado["Probabilidades"] = {"P(bloqueio)": estat["bloqueio"]}
+        if estat["classes"] is not None:
+            resultado["Resultados por Classe"] = estat["classes"]
+        return resultado
+
+
+# -----------------------------------------------------
+# REPLICAÇÕES EM PARALELO
+# -----------------------------------------------------
+def _replicacao(simulador, seed, clientes, aquecimento, lotes):
+    return simulador._estatisticas(clientes, aquecimento, lotes, seed)
+
+
+def replicar(
+    simulador: Simulador,
+    replicacoes: int = 32,
+    workers: Optional[int] = None,
+    clientes: int = 200_000,
+    aquecimento: int = 20_000,
+    lotes: int = 20,
+) -> Dict:
+    """
+    Executa ``replicacoes`` rodadas independentes do simulador, distribuídas
+    entre ``workers`` processos (padrão: todos os núcleos). Cada rodada recebe
+    um fluxo próprio de ``SeedSequence(simulador.seed).spawn``, então o
+    resultado é reprodutível e não depende do número de processos.
+
+    Cada processo devolve só as médias por lote, e os intervalos de confiança
+    são calculados sobre as médias das replicações (independentes entre si).
+    """
+    if replicacoes < 2:
+        raise ValueError("Use pelo menos 2 replicações")
+    sementes = np.random.SeedSequence(simulador.seed).spawn(replicacoes)
+    workers = min(workers or os.cpu_count() or 1, replicacoes)
+    inicio = time.perf_counter()
+    args = ([simulador] * replicacoes, sementes, [clientes] * replicacoes,
+            [aquecimento] * replicacoes, [lotes] * replicacoes)
+    if workers == 1:
+        rodadas = list(map(_replicacao, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rodadas = list(pool.map(_replicacao, *args, chunksize=max(1, replicacoes // (4 * workers))))
+    decorrido = time.perf_counter() - inicio
+
+    agregado = {
+        "lotes": {k: [float(np.mean(r["lotes"][k])) for r in rodadas] for k in ("L", "Lq", "W", "Wq")},
+        "eventos": sum(r["eventos"] for r in rodadas),
+        "bloqueio": None,
+        "classes": None,
+    }
+    if rodadas[0]["bloqueio"] is not None:
+        agregado["bloqueio"] = float(np.mean([r["bloqueio"] for r in rodadas]))
+    if rodadas[0]["classes"] is not None:
+        agregado["classes"] = {
+            i: {
+                "W": float(np.mean([r["classes"][i]["W"] for r in rodadas])),
+                "Wq": float(np.mean([r["classes"][i]["Wq"] for r in rodadas])),
+                "clientes": sum(r["classes"][i]["clientes"] for r in rodadas),
+            }
+            for i in rodadas[0]["classes"]
+        }
+    resultado = simulador._resultado(agregado, decorrido)
+    resultado["Desempenho"].update({"replicações": replicacoes, "processos": workers})
+    return resultado
@@ -1,11 +1,11 @@
 # main.py — VERSÃO FINAL, COMPLETA E PERFEITA
+import time
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-from models import (
-    MM1, MM1K, MMS, MMSK, MMSN, MM1N,
-    MMInfinity, MMC, MG1,
-    MPrioridades
-)
+from models import cache_padrao, instrumentacao, modelo
+from models.registro import rotulos
 
 # ----------------- UTILIDADES -----------------
 def safe_float(value):
@@ -59,74 +59,59 @@ st.title("Teoria das Filas")
 def num(label, minv=0.0):
     return st.number_input(label, min_value=minv, step=1e-6, format="%.6f")
 
+# ========================= CACHE =========================
+with st.sidebar:
+    st.markdown("### Cache de resultados")
+    estat_cache = cache_padrao.estatisticas()
+    st.metric("Taxa de acerto", f"{estat_cache['taxa de acerto']:.1%}")
+    st.caption(
+        f"{estat_cache['entradas']}/{estat_cache['capacidade']} entradas • "
+        f"{estat_cache['acertos']} acertos • {estat_cache['falhas']} falhas • "
+        f"{estat_cache['remoções']} remoções"
+    )
+    if st.button("Limpar cache"):
+        cache_padrao.limpar()
+
+    # medições por fase acumuladas na sessão: o coletor vale só para esta
+    # execução do script (contexto da thread), sem afetar as outras sessões
+    st.markdown("### Instrumentação")
+    coletor = None
+    if st.checkbox("Medir tempo por fase"):
+        coletor = st.session_state.setdefault("coletor", instrumentacao.ColetorMemoria())
+        if st.button("Zerar medições"):
+            coletor.limpar()
+    instrumentacao.ativar_no_contexto(*([coletor] if coletor is not None else []))
+
 # ========================= SELEÇÃO DO MODELO =========================
-opcao = st.selectbox("Selecione o modelo desejado:", [
-    "Selecione",
-    "M/M/1",
-    "M/M/∞",
-    "M/M/C",
-    "M/M/s>1",
-    "M/M/1/K",
-    "M/M/s>1/K",
-    "M/M/1/N",
-    "M/M/s>1/N",
-    "M/G/1",
-    "Modelo com prioridades (M/G/1)"
-], index=0)
+opcao = st.selectbox("Selecione o modelo desejado:", ["Selecione", *rotulos()], index=0)
+PRIORIDADES = "Modelo com prioridades (M/G/1)"
 
 # ========================= VARIÁVEIS =========================
-lam = mu = s = K = N = c = sigma2 = None
+espec = modelo(opcao) if opcao != "Selecione" else None
+valores = {}
 classes_data = []
 prioridade_tipo = None
 
 # ========================= ENTRADA DE DADOS =========================
-if opcao in ["M/M/1", "M/M/∞"]:
-    col1, col2 = st.columns(2)
-    with col1: lam = num("Taxa de chegada (λ)")
-    with col2: mu  = num("Taxa de serviço (μ)")
-
-elif opcao == "M/M/C":
-    col1, col2, col3 = st.columns(3)
-    with col1: lam = num("Taxa de chegada (λ)")
-    with col2: mu  = num("Taxa de serviço (μ)")
-    with col3: c   = st.number_input("Número de servidores (c)", min_value=1, step=1)
-
-elif opcao in ["M/M/s>1", "M/M/s>1/K"]:
-    col1, col2, col3 = st.columns(3)
-    with col1: lam = num("Taxa de chegada (λ)")
-    with col2: mu  = num("Taxa de serviço (μ)")
-    with col3: s   = st.number_input("Número de servidores (s)", min_value=2, step=1)
-    if opcao == "M/M/s>1/K":
-        K = st.number_input("Capacidade do sistema (K)", min_value=s+1, step=1)
-
-elif opcao == "M/M/1/K":
-    col1, col2, col3 = st.columns(3)
-    with col1: lam = num("Taxa de chegada (λ)")
-    with col2: mu  = num("Taxa de serviço (μ)")
-    with col3: K   = st.number_input("Capacidade do sistema (K)", min_value=1, step=1)
-
-elif opcao == "M/M/1/N":
-    col1, col2, col3 = st.columns(3)
-    with col1: lam = num("Taxa de chegada (λ)")
-    with col2: mu  = num("Taxa de serviço (μ)")
-    with col3: N   = st.number_input("Tamanho da população (N)", min_value=1, step=1)
-
-elif opcao == "M/M/s>1/N":
-    col1, col2, col3, col4 = st.columns(4)
-    with col1: lam = num("Taxa de chegada (λ)")
-    with col2: mu  = num("Taxa de serviço (μ)")
-    with col3: s   = st.number_input("Número de servidores (s)", min_value=2, step=1)
-    with col4: N   = st.number_input("Tamanho da população (N)", min_value=s, step=1)
-
-elif opcao == "M/G/1":
-    col1, col2, col3 = st.columns(3)
-    with col1: lam    = num("Taxa de chegada (λ)")
-    with col2: mu     = num("Taxa média de serviço (μ)")
-    with col3: sigma2 = num("Variância do tempo de serviço (σ²)", minv=0.0)
-
-elif opcao == "Modelo com prioridades (M/G/1)":
+# os campos saem do esquema de parâmetros declarado no registro de modelos
+if espec is not None and espec.vetorizavel:
+    campos = [p for p in espec.parametros if p.obrigatorio]
+    for p, col in zip(campos, st.columns(len(campos))):
+        with col:
+            if p.tipo is int:
+                minimo = int(p.limite(valores))
+                valores[p.nome] = st.number_input(p.rotulo, min_value=minimo, step=1)
+            else:
+                valores[p.nome] = num(p.rotulo)
+    if espec.chave == "mg1":
+        familia = st.selectbox("Distribuição do serviço (para P(n) e percentis):",
+                               ["gama (padrão)", "deterministica", "erlang", "hiperexponencial", "lognormal"])
+        if familia != "gama (padrão)":
+            valores["distribuicao"] = familia
+
+elif opcao == PRIORIDADES:
     prioridade_tipo = st.selectbox("Tipo de prioridade:", ["Não-preemptiva", "Preemptiva"])
-    num_classes = st.number_input("Número de classes de prioridade:", min_value=2, max_value=10, value=2, step=1)
+    num_classes = st.number_input("Número de classes de prioridade:", min_value=2, max_value=500, value=2, step=1)
 
     st.markdown("### Parâmetros por classe (da maior para a menor prioridade)")
     cols = st.columns(3)
@@ -139,44 +124,83 @@ elif opcao == "Modelo com prioridades (M/G/1)":
             sigma2_i = num(f"σ² da classe {i+1}", minv=0.0)
             classes_data.append({"lam": lam_i, "mu": mu_i, "sigma2": sigma2_i})
 
+# ========================= VARREDURA DE PARÂMETRO =========================
+modo = "Ponto único"
+if espec is not None and espec.vetorizavel:
+    modo = st.radio("Modo de cálculo:", ["Ponto único", "Varredura de parâmetro"], horizontal=True)
+
+if modo == "Varredura de parâmetro":
+    variaveis = {p.simbolo: p for p in espec.parametros if p.obrigatorio}
+    col1, col2, col3, col4 = st.columns(4)
+    with col1: variavel = st.selectbox("Parâmetro variado", list(variaveis))
+    with col2: inicio   = num("Início")
+    with col3: fim      = num("Fim")
+    with col4: pontos   = st.number_input("Pontos", min_value=2, max_value=100_000, value=500, step=1)
+
+    if st.button("Gerar curva", type="primary", use_container_width=True):
+        if fim <= inicio:
+            st.warning("O fim da varredura deve ser maior que o início.")
+            st.stop()
+        parametro = variaveis[variavel]
+        grade = np.linspace(inicio, fim, int(pontos))
+        if parametro.tipo is int:
+            grade = np.unique(np.round(grade))
+
+        # uma única chamada vetorizada para a curva inteira
+        t0 = time.perf_counter()
+        tabela = espec.resolver_lote({**valores, parametro.nome: grade})
+        duracao = time.perf_counter() - t0
+
+        df = pd.DataFrame({variavel: grade})
+        for campo in ("L", "Lq", "W", "Wq", "P_bloqueio"):
+            df[campo] = tabela[campo]
+        df = df.set_index(variavel)
+
+        st.markdown("---")
+        st.subheader(f"Varredura de {variavel} — {opcao}")
+        st.markdown("**Número médio no sistema e na fila**")
+        st.line_chart(df[["L", "Lq"]])
+        st.markdown("**Tempo no sistema e na fila**")
+        st.line_chart(df[["W", "Wq"]])
+        if "K" in valores or "N" in valores:
+            st.markdown("**Probabilidade de bloqueio**")
+            st.line_chart(df[["P_bloqueio"]])
+
+        instaveis = int((~tabela["estavel"]).sum())
+        if instaveis:
+            st.info(f"{instaveis} ponto(s) instáveis ou inválidos foram omitidos das curvas.")
+        st.caption(f"{len(grade)} pontos calculados em {duracao * 1000:.1f} ms")
+        with st.expander("Tabela da varredura"):
+            st.dataframe(df, use_container_width=True)
+
 # ========================= BOTÃO CALCULAR =========================
-if st.button("Calcular", type="primary", use_container_width=True):
+elif st.button("Calcular", type="primary", use_container_width=True):
     if opcao == "Selecione":
         st.warning("Por favor, selecione um modelo.")
         st.stop()
 
     try:
         # ==================== CÁLCULO DO MODELO ====================
-        if   opcao == "M/M/1":           result = MM1(lam, mu).resolver()
-        elif opcao == "M/M/∞":           result = MMInfinity(lam, mu).resolver()
-        elif opcao == "M/M/C":           result = MMC(lam, mu, c).resolver()
-        elif opcao == "M/M/s>1":         result = MMS(lam, mu, s).resolver()
-        elif opcao == "M/M/1/K":         result = MM1K(lam, mu, K).resolver()
-        elif opcao == "M/M/s>1/K":       result = MMSK(lam, mu, s, K).resolver()
-        elif opcao == "M/M/1/N":         result = MM1N(lam, mu, N).resolver()
-        elif opcao == "M/M/s>1/N":       result = MMSN(lam, mu, s, N).resolver()
-        elif opcao == "M/G/1":           result = MG1(lam, mu, sigma2).resolver()
-        elif opcao == "Modelo com prioridades (M/G/1)":
+        # despacho pelo registro; reexecuções do Streamlit saem do cache
+        if opcao == PRIORIDADES:
             preemptive = (prioridade_tipo == "Preemptiva")
-            result = MPrioridades(classes_data, preemptive=preemptive).resolver()
+            result = espec.resolver({"classes": classes_data, "preemptive": preemptive})
+        else:
+            result = espec.resolver(valores)
 
         st.markdown("---")
         st.subheader(f"Resultados — {opcao}")
 
         # ==================== PARÂMETROS DE ENTRADA ====================
-        params = result.get("Parâmetros", {})
+        # o resultado vem do cache (compartilhado): copia antes de alterar
+        params = dict(result.get("Parâmetros", {}))
 
         # Se o modelo não retornou, reconstruímos manualmente
         if not params:
-            params = {"λ": lam, "μ": mu}
-            if s is not None: params["s"] = s
-            if c is not None: params["c"] = c
-            if K is not None: params["K"] = K
-            if N is not None: params["N"] = N
-            if sigma2 is not None: params["σ²"] = sigma2
+            params = {p.simbolo: valores[p.nome] for p in espec.parametros if p.nome in valores}
 
         # Prioridades dinâmicas
-        if opcao == "Modelo com prioridades (M/G/1)":
+        if opcao == PRIORIDADES:
             params = {}
             for i, cls in enumerate(classes_data, 1):
                 params[f"λ{i}"] = cls["lam"]
@@ -234,7 +258,7 @@ if st.button("Calcular", type="primary", use_container_width=True):
         if result.get("Resultados por Classe"):
             st.markdown("### Resultados por classe de prioridade")
             df = pd.DataFrame.from_dict(result["Resultados por Classe"], orient="index")
-            df = df.applymap(safe_float_fmt)
+            df = df.apply(pd.to_numeric, errors="coerce")
             st.dataframe(df.style.format("{:.6f}"), use_container_width=True)
 
         # ==================== PROBABILIDADES ====================
@@ -244,9 +268,22 @@ if st.button("Calcular", type="primary", use_container_width=True):
                      for k, v in result["Probabilidades"].items()]
             st.dataframe(pd.DataFrame(probs), use_container_width=True, hide_index=True)
 
+        # ==================== DISTRIBUIÇÃO DE ESTADOS ====================
+        # a tabela sai direto do vetor float64 do modelo (sem montar um dict por estado)
+        instancia = espec.instanciar(valores, cache=cache_padrao) if opcao != PRIORIDADES else None
+        processo = getattr(instancia, "processo", None)
+        if processo is not None and len(processo) > 1:
+            st.markdown("### Distribuição do número de clientes")
+            serie = processo.para_pandas()
+            # o gráfico mostra só a faixa onde está a massa
+            st.area_chart(serie.loc[processo.quantil(1e-6):processo.quantil(1 - 1e-6)])
+            with st.expander(f"Tabela de P(n) ({len(serie):,} estados)"):
+                st.dataframe(serie.to_frame(), use_container_width=True)
+
         # ==================== DETALHES TÉCNICOS ====================
         outros = {k: v for k, v in result.items()
-                  if k not in ["Parâmetros", "Medidas de Efetividade", "Resultados por Classe", "Probabilidades"]}
+                  if k not in ["Parâmetros", "Medidas de Efetividade", "Resultados por Classe", "Probabilidades",
+                               "Distribuicao"]}
         if outros:
             with st.expander("Detalhes técnicos avançados"):
                 st.json(outros)
@@ -255,4 +292,23 @@ if st.button("Calcular", type="primary", use_container_width=True):
 
     except Exception as e:
         st.error(f"Erro no cálculo: {e}")
-        st.info("Verifique os valores inseridos (ex: ρ < 1, parâmetros positivos, etc).")
\ No newline at end of file
+        st.info("Verifique os valores inseridos (ex: ρ < 1, parâmetros positivos, etc).")
+
+# ========================= INSTRUMENTAÇÃO =========================
+if coletor is not None:
+    resumo = coletor.resumo()
+    with st.expander("Tempo por fase (instrumentação)", expanded=True):
+        if not resumo["fases"]:
+            st.caption("Nenhuma fase medida ainda: calcule um modelo com a instrumentação ligada.")
+        else:
+            fases = pd.DataFrame.from_dict(resumo["fases"], orient="index")
+            histogramas = pd.DataFrame(list(fases.pop("histograma")), index=fases.index)
+            st.dataframe(fases.style.format({"total (s)": "{:.6f}", "média (ms)": "{:.3f}",
+                                             "mínimo (ms)": "{:.3f}", "máximo (ms)": "{:.3f}"}),
+                         use_container_width=True)
+            st.markdown("**Tempo total por fase (s)**")
+            st.bar_chart(fases["total (s)"])
+            st.markdown("**Histograma de duração (chamadas por faixa)**")
+            st.dataframe(histogramas, use_container_width=True)
+        if resumo["contadores"]:
+            st.caption(" • ".join(f"{nome}: {valor:,.0f}" for nome, valor in resumo["contadores"].items()))
@@ -1,13 +1,14 @@
-from .mg1 import MG1
-from .mm1 import MM1
-from .mm1k import MM1K
-from .mm1n import MM1N
-from .mmc import MMC
-from .mms import MMS
-from .mmsk import MMSK
-from .mmsn import MMSN
-from .mmInfinity import MMInfinity
-from .priority_queue import MPrioridades
+# Os modelos são carregados sob demanda (PEP 562): ``from models import MMS``
+# importa só models/mms.py, o que reduz a partida do app e dos processos de
+# trabalho que usam poucos modelos.
+import importlib
+
+from .cache import CacheResolvedor, cache_padrao, resolver_com_cache
+from .registro import REGISTRO, modelo
+from .resultado import Resultado
+
+_MODULOS = {m.nome_classe: m.modulo for m in REGISTRO.values()}
+_MODULOS["RedeJackson"] = ".rede"
 
 __all__ = [
     "MG1",
@@ -19,5 +20,24 @@ __all__ = [
     "MMSK",
     "MMSN",
     "MMInfinity",
-    "MPrioridades"
+    "MPrioridades",
+    "RedeJackson",
+    "CacheResolvedor",
+    "cache_padrao",
+    "resolver_com_cache",
+    "Resultado",
+    "REGISTRO",
+    "modelo",
 ]
+
+
+def __getattr__(nome):
+    if nome in _MODULOS:
+        classe = getattr(importlib.import_module(_MODULOS[nome], __name__), nome)
+        globals()[nome] = classe
+        return classe
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,269 @@
+# models/__main__.py
+"""
+Resolução em lote pela linha de comando, sem o Streamlit.
+
+    python -m models cenarios.csv resultados.csv --modelo mmsk
+    python -m models cenarios.parquet resultados.jsonl --workers 4
+
+A entrada (CSV, JSON Lines ou Parquet) é lida em blocos de ``--bloco``
+linhas; cada bloco é resolvido por ``resolver_lote`` (via registro de
+modelos) e escrito na saída antes do próximo, então a memória não cresce com
+o tamanho do arquivo. As colunas são os parâmetros canônicos do modelo
+(``lam``, ``mu``, ``s``, ``K``, ``N``, ``sigma2``); sem ``--modelo``, cada
+linha indica o seu na coluna ``modelo``. Parquet requer ``pyarrow``.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from . import instrumentacao
+from .lote import CAMPOS
+from .registro import REGISTRO, modelo
+
+Bloco = Dict[str, np.ndarray]
+
+FORMATOS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def _formato(caminho: str, informado: Optional[str]) -> str:
+    if informado:
+        return informado
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao not in FORMATOS:
+        raise ValueError(f"Formato de {caminho!r} não reconhecido; use --formato-entrada/--formato-saida")
+    return FORMATOS[extensao]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Arquivos Parquet requerem o pacote pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _numero(valor) -> float:
+    return float(valor) if valor not in ("", None) else np.nan
+
+
+def _colunas(linhas, nomes) -> Bloco:
+    if "modelo" not in nomes:
+        try:  # caminho rápido: todas as células numéricas
+            matriz = np.array(linhas, dtype=float)
+            return {nome: matriz[:, i] for i, nome in enumerate(nomes)}
+        except (TypeError, ValueError):
+            pass
+    bloco = {}
+    for i, nome in enumerate(nomes):
+        valores = [linha[i] for linha in linhas]
+        if nome == "modelo":
+            bloco[nome] = np.array([str(v).lower() for v in valores], dtype=object)
+        else:
+            bloco[nome] = np.array([_numero(v) for v in valores], dtype=float)
+    return bloco
+
+
+# ------------------------------ leitura ------------------------------
+def ler_csv(caminho: str, tamanho: int) -> Iterator[Bloco]:
+    with open(caminho, newline="", encoding="utf-8") as f:
+        leitor = csv.reader(f)
+        nomes = [n.strip() for n in next(leitor)]
+        linhas = []
+        for linha in leitor:
+            linhas.append(linha)
+            if len(linhas) == tamanho:
+                yield _colunas(linhas, nomes)
+                linhas = []
+        if linhas:
+            yield _colunas(linhas, nomes)
+
+
+def ler_jsonl(caminho: str, tamanho: int) -> Iterator[Bloco]:
+    with open(caminho, encoding="utf-8") as f:
+        nomes, linhas = None, []
+        for texto in f:
+            if not texto.strip():
+                continue
+            registro = json.loads(texto)
+            if nomes is None:
+                nomes = list(registro)
+            linhas.append([registro.get(n) for n in nomes])
+            if len(linhas) == tamanho:
+                yield _colunas(linhas, nomes)
+                linhas = []
+        if linhas:
+            yield _colunas(linhas, nomes)
+
+
+def ler_parquet(caminho: str, tamanho: int) -> Iterator[Bloco]:
+    pa = _pyarrow()
+    for lote in pa.parquet.ParquetFile(caminho).iter_batches(batch_size=tamanho):
+        bloco = {}
+        for nome, coluna in zip(lote.schema.names, lote.columns):
+            if nome == "modelo":
+                bloco[nome] = np.array([str(v).lower() for v in coluna.to_pylist()], dtype=object)
+            else:
+                bloco[nome] = coluna.to_numpy(zero_copy_only=False).astype(float)
+        yield bloco
+
+
+LEITORES = {"csv": ler_csv, "jsonl": ler_jsonl, "parquet": ler_parquet}
+
+
+# ------------------------------ escrita ------------------------------
+class EscritorCSV:
+    def __init__(self, caminho: str):
+        self._arquivo = open(caminho, "w", newline="", encoding="utf-8")
+        self._escritor = csv.writer(self._arquivo)
+        self._cabecalho = False
+
+    def escrever(self, bloco: Bloco):
+        nomes = list(bloco)
+        if not self._cabecalho:
+            self._escritor.writerow(nomes)
+            self._cabecalho = True
+        self._escritor.writerows(zip(*(bloco[n].tolist() for n in nomes)))
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class EscritorJSONL:
+    def __init__(self, caminho: str):
+        self._arquivo = open(caminho, "w", encoding="utf-8")
+
+    def escrever(self, bloco: Bloco):
+        nomes = list(bloco)
+        colunas = [bloco[n].tolist() for n in nomes]
+        for valores in zip(*colunas):
+            linha = {n: (None if isinstance(v, float) and v != v else v) for n, v in zip(nomes, valores)}
+            self._arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class EscritorParquet:
+    def __init__(self, caminho: str):
+        self._pa = _pyarrow()
+        self._caminho = caminho
+        self._escritor = None
+
+    def escrever(self, bloco: Bloco):
+        tabela = self._pa.table({n: (v.tolist() if v.dtype == object else v) for n, v in bloco.items()})
+        if self._escritor is None:
+            self._escritor = self._pa.parquet.ParquetWriter(self._caminho, tabela.schema)
+        self._escritor.write_table(tabela)
+
+    def fechar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+ESCRITORES = {"csv": EscritorCSV, "jsonl": EscritorJSONL, "parquet": EscritorParquet}
+
+
+# ------------------------------ resolução ------------------------------
+def resolver_bloco(bloco: Bloco, chave: Optional[str] = None) -> Bloco:
+    """Resolve um bloco; com ``chave`` None, agrupa as linhas pela coluna ``modelo``."""
+    n = len(next(iter(bloco.values())))
+    saida = dict(bloco)
+    for campo in CAMPOS:
+        saida[campo] = np.full(n, np.nan)
+    saida["estavel"] = np.zeros(n, dtype=bool)
+
+    if chave is not None:
+        grupos = [(chave, slice(None))]
+    elif "modelo" in bloco:
+        grupos = [(c, bloco["modelo"] == c) for c in np.unique(bloco["modelo"])]
+    else:
+        raise ValueError("Informe --modelo ou uma coluna 'modelo' na entrada")
+
+    for c, linhas in grupos:
+        espec = modelo(c)
+        faltando = [p for p in espec.obrigatorios if p not in bloco]
+        if faltando:
+            raise ValueError(f"Colunas ausentes para {espec.rotulo}: {', '.join(faltando)}")
+        tabela = espec.resolver_lote({p: bloco[p][linhas] for p in espec.obrigatorios})
+        for campo in CAMPOS + ("estavel",):
+            saida[campo][linhas] = tabela[campo]
+    return saida
+
+
+def _blocos_resolvidos(blocos, chave, workers):
+    if workers <= 1:
+        for bloco in blocos:
+            yield resolver_bloco(bloco, chave)
+        return
+    # no máximo 2 blocos por processo em voo: a ordem da saída é preservada
+    # e a memória continua limitada
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendentes = []
+        for bloco in blocos:
+            pendentes.append(pool.submit(resolver_bloco, bloco, chave))
+            if len(pendentes) >= 2 * workers:
+                yield pendentes.pop(0).result()
+        for futuro in pendentes:
+            yield futuro.result()
+
+
+def executar(entrada: str, saida: str, chave: Optional[str] = None, bloco: int = 100_000, workers: int = 1,
+             formato_entrada: Optional[str] = None, formato_saida: Optional[str] = None) -> Dict:
+    if chave is not None and not modelo(chave).vetorizavel:
+        raise ValueError(f"{modelo(chave).rotulo} não tem versão vetorizada")
+    leitor = LEITORES[_formato(entrada, formato_entrada)]
+    escritor = ESCRITORES[_formato(saida, formato_saida)](saida)
+    inicio = time.perf_counter()
+    linhas = 0
+    try:
+        for resolvido in _blocos_resolvidos(leitor(entrada, bloco), chave, workers):
+            with instrumentacao.medir("escrita"):
+                escritor.escrever(resolvido)
+            linhas += len(resolvido["estavel"])
+    finally:
+        escritor.fechar()
+    duracao = time.perf_counter() - inicio
+    return {"linhas": linhas, "segundos": duracao, "linhas/s": linhas / duracao if duracao > 0 else float("inf")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m models", description="Resolve cenários de filas em lote.")
+    parser.add_argument("entrada", help="arquivo .csv, .jsonl ou .parquet com os cenários")
+    parser.add_argument("saida", help="arquivo de resultados (.csv, .jsonl ou .parquet)")
+    parser.add_argument("--modelo", choices=[c for c, m in REGISTRO.items() if m.vetorizavel],
+                        help="modelo de todas as linhas (senão, coluna 'modelo')")
+    parser.add_argument("--bloco", type=int, default=100_000, help="linhas por bloco (padrão: 100000)")
+    parser.add_argument("--workers", type=int, default=1, help="processos para resolver blocos em paralelo")
+    parser.add_argument("--formato-entrada", choices=sorted(LEITORES))
+    parser.add_argument("--formato-saida", choices=sorted(ESCRITORES))
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="grava os tempos por fase no formato texto do Prometheus "
+                             "(com --workers, a resolução dos blocos roda nos outros processos e não entra)")
+    args = parser.parse_args(argv)
+    coletor = instrumentacao.ativar(instrumentacao.ColetorPrometheus(args.metricas)) if args.metricas else None
+    try:
+        resumo = executar(args.entrada, args.saida, args.modelo, args.bloco, args.workers,
+                          args.formato_entrada, args.formato_saida)
+        if coletor is not None:
+            coletor.gravar()
+    except (ValueError, KeyError, OSError) as e:
+        print(f"erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if coletor is not None:
+            instrumentacao.desativar()
+    print(f"{resumo['linhas']} linhas em {resumo['segundos']:.2f} s ({resumo['linhas/s']:,.0f} linhas/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
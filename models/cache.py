@@ -0,0 +1,150 @@
+# models/cache.py
+"""
+Cache LRU de resultados de ``resolver()``.
+
+A chave é o nome do modelo mais os parâmetros canonizados (floats
+arredondados para ``digitos`` algarismos significativos, listas e dicts
+convertidos em tuplas), de modo que reexecuções do Streamlit com os mesmos
+valores não recalculam o modelo. O cache é limitado em número de entradas,
+conta acertos/falhas/remoções e pode ser salvo em disco.
+
+Cada entrada guarda o ``Resultado`` preguiçoso do modelo, e quem consulta
+recebe esse mesmo ``Resultado`` (compartilhado: não altere): um acerto não
+custa nada além da consulta, e só as seções lidas são calculadas, uma única
+vez. ``to_dict()`` dá dicts novos para quem precisa alterá-los ou
+serializá-los.
+"""
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from . import instrumentacao
+from .resultado import Resultado
+
+
+def _canonico(valor, digitos):
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, float):
+        if valor.is_integer():
+            return int(valor)
+        return float(f"{valor:.{digitos}g}")
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _canonico(v, digitos)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_canonico(v, digitos) for v in valor)
+    try:
+        return _canonico(float(valor), digitos)  # escalares NumPy
+    except (TypeError, ValueError):
+        return repr(valor)
+
+
+class CacheResolvedor:
+    """Cache LRU (modelo, parâmetros) → instância resolvida e resultado de ``resolver()``."""
+
+    def __init__(self, capacidade: int = 512, digitos: int = 12, arquivo: Optional[str] = None):
+        if capacidade < 1:
+            raise ValueError("A capacidade do cache deve ser >= 1")
+        self.capacidade = capacidade
+        self.digitos = digitos
+        self.arquivo = arquivo
+        self._dados: "OrderedDict[tuple, list]" = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        if arquivo and os.path.exists(arquivo):
+            self.carregar()
+
+    def chave(self, classe, args, kwargs) -> tuple:
+        return (
+            classe.__name__,
+            _canonico(list(args), self.digitos),
+            _canonico(dict(kwargs), self.digitos),
+        )
+
+    def _entrada(self, classe, args, kwargs):
+        k = self.chave(classe, args, kwargs)
+        with self._trava:
+            entrada = self._dados.get(k)
+            if entrada is not None:
+                self._dados.move_to_end(k)
+                self.acertos += 1
+                instrumentacao.contar("cache.acertos")
+                return entrada
+            self.falhas += 1
+        instrumentacao.contar("cache.falhas")
+        # resolve fora da trava: modelos grandes não bloqueiam as outras consultas
+        with instrumentacao.medir(f"{classe.__name__}.construcao"):
+            entrada = [classe(*args, **kwargs), None]
+        with self._trava:
+            self._dados[k] = entrada
+            self._dados.move_to_end(k)
+            while len(self._dados) > self.capacidade:
+                self._dados.popitem(last=False)
+                self.remocoes += 1
+        return entrada
+
+    def modelo(self, classe, *args, **kwargs):
+        """Instância resolvida de ``classe(*args, **kwargs)`` (compartilhada: não altere)."""
+        entrada = self._entrada(classe, args, kwargs)
+        if entrada[0] is None:  # entrada vinda do disco guarda só o resultado
+            with instrumentacao.medir(f"{classe.__name__}.construcao"):
+                entrada[0] = classe(*args, **kwargs)
+        return entrada[0]
+
+    def resolver(self, classe, *args, **kwargs) -> Resultado:
+        """``Resultado`` de ``classe(*args, **kwargs).resolver()`` (compartilhado: não altere; ``to_dict()`` copia)."""
+        entrada = self._entrada(classe, args, kwargs)
+        if entrada[1] is None:
+            with instrumentacao.medir(f"{classe.__name__}.resultado"):
+                entrada[1] = entrada[0].resolver()
+        return entrada[1]
+
+    def estatisticas(self) -> Dict:
+        consultas = self.acertos + self.falhas
+        return {
+            "entradas": len(self._dados),
+            "capacidade": self.capacidade,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remoções": self.remocoes,
+            "taxa de acerto": self.acertos / consultas if consultas else 0.0,
+        }
+
+    def limpar(self):
+        with self._trava:
+            self._dados.clear()
+            self.acertos = self.falhas = self.remocoes = 0
+
+    def salvar(self, arquivo: Optional[str] = None):
+        """Grava em disco os resultados já calculados (as instâncias não são salvas)."""
+        arquivo = arquivo or self.arquivo
+        if not arquivo:
+            raise ValueError("Informe o arquivo do cache")
+        with self._trava:
+            dados = [(k, e[1].to_dict()) for k, e in self._dados.items() if e[1] is not None]
+        temporario = arquivo + ".tmp"
+        with open(temporario, "wb") as f:
+            pickle.dump(dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, arquivo)
+
+    def carregar(self, arquivo: Optional[str] = None):
+        arquivo = arquivo or self.arquivo
+        with open(arquivo, "rb") as f:
+            dados = pickle.load(f)
+        with self._trava:
+            for k, resultado in dados[-self.capacidade:]:
+                self._dados[k] = [None, resultado if isinstance(resultado, Resultado) else Resultado(resultado)]
+
+
+cache_padrao = CacheResolvedor()
+
+
+def resolver_com_cache(classe, *args, **kwargs) -> Resultado:
+    """``classe(*args, **kwargs).resolver()`` através do cache padrão do pacote."""
+    return cache_padrao.resolver(classe, *args, **kwargs)
@@ -0,0 +1,189 @@
+# models/dimensionamento.py
+"""
+Dimensionamento inverso: menor número de servidores s (ou capacidade K)
+que atende a uma meta de nível de serviço.
+
+Para M/M/s e M/M/s/K a série de Erlang-B é estendida incrementalmente
+(``SerieErlang``, O(1) por servidor) e as medidas são avaliadas de uma vez,
+com NumPy, sobre janelas de candidatos que dobram de tamanho (galope) até
+conter a primeira solução. Para M/M/s/N, que não tem recorrência em s,
+cada candidato é resolvido por inteiro e a busca é por galope + bisseção.
+"""
+import math
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .erlang import SerieErlang
+from .lote import mmsk_forma_fechada
+
+
+def _galope(avaliar: Callable, inicio: int, limite: int, passo: int) -> Dict:
+    """
+    Avalia janelas [inicio, fim] crescentes até encontrar o primeiro candidato
+    que atende à meta. ``avaliar(ini, fim)`` devolve (candidatos, atende, curvas).
+    """
+    partes = []
+    while inicio <= limite:
+        fim = min(inicio + passo - 1, limite)
+        candidatos, atende, curvas = avaliar(inicio, fim)
+        partes.append(curvas)
+        if atende.any():
+            i = int(np.argmax(atende))
+            curva = {k: np.concatenate([p[k] for p in partes]) for k in curvas}
+            corte = len(curva[next(iter(curva))]) - len(candidatos) + i + 1
+            return {"otimo": int(candidatos[i]), "curva": {k: v[:corte] for k, v in curva.items()}}
+        inicio = fim + 1
+        passo *= 2
+    raise ValueError(f"Nenhum valor até {limite} atende às metas informadas")
+
+
+def _exigir_meta(*metas):
+    if all(m is None for m in metas):
+        raise ValueError("Informe pelo menos uma meta de nível de serviço")
+
+
+def dimensionar_mms(
+    lambd: float,
+    mi: float,
+    Wq_max: Optional[float] = None,
+    t_fila: Optional[float] = None,
+    P_espera_max: Optional[float] = None,
+    s_max: int = 10 ** 7,
+) -> Dict:
+    """
+    Menor s estável do M/M/s tal que Wq ≤ ``Wq_max`` e/ou P(Wq > ``t_fila``) ≤
+    ``P_espera_max`` (sem ``t_fila``, a meta vale para P(Wq > 0) = C).
+    """
+    _exigir_meta(Wq_max, P_espera_max)
+    if lambd <= 0 or mi <= 0:
+        raise ValueError("λ e μ devem ser positivos")
+    a = lambd / mi
+    s_estavel = math.floor(a) + 1
+    serie = SerieErlang(a, inicio=s_estavel)
+    t = 0.0 if t_fila is None else float(t_fila)
+
+    def avaliar(ini, fim):
+        log_inv_b, _ = serie.ate(fim)
+        s = np.arange(ini, fim + 1)
+        B = np.exp(-log_inv_b[ini - s_estavel:])
+        C = B / (1 - (a / s) * (1 - B))
+        folga = s * mi - lambd
+        Wq = C / folga
+        P_espera = C * np.exp(-folga * t)
+        atende = np.ones(len(s), dtype=bool)
+        if Wq_max is not None:
+            atende &= Wq <= Wq_max
+        if P_espera_max is not None:
+            atende &= P_espera <= P_espera_max
+        return s, atende, {"s": s, "C": C, "Wq": Wq, "P(Wq>t)": P_espera}
+
+    res = _galope(avaliar, s_estavel, s_max, passo=max(16, int(4 * math.sqrt(a))))
+    return {"s": res["otimo"], "curva": res["curva"]}
+
+
+def dimensionar_mmsk(
+    lambd: float,
+    mi: float,
+    s: Optional[int] = None,
+    K: Optional[int] = None,
+    P_bloqueio_max: Optional[float] = None,
+    Wq_max: Optional[float] = None,
+    limite: int = 10 ** 7,
+) -> Dict:
+    """
+    M/M/s/K: com ``K`` fixo, procura o menor s ≤ K; com ``s`` fixo, o menor
+    K ≥ s. Metas: P(K) ≤ ``P_bloqueio_max`` e/ou Wq ≤ ``Wq_max``.
+    Como Wq cresce com K, no modo s fixo a meta de espera só é verificada.
+    """
+    _exigir_meta(P_bloqueio_max, Wq_max)
+    if (s is None) == (K is None):
+        raise ValueError("Fixe exatamente um entre s e K")
+    if lambd <= 0 or mi <= 0:
+        raise ValueError("λ e μ devem ser positivos")
+
+    def metas(m):
+        atende = np.ones(len(m["Wq"]), dtype=bool)
+        if P_bloqueio_max is not None:
+            atende &= m["P_bloqueio"] <= P_bloqueio_max
+        if Wq_max is not None:
+            atende &= m["Wq"] <= Wq_max
+        return atende
+
+    if K is not None:
+        serie = SerieErlang(lambd / mi)
+
+        def avaliar(ini, fim):
+            log_inv_b, log_ts = serie.ate(fim)
+            cand = np.arange(ini, fim + 1)
+            m = mmsk_forma_fechada(lambd, mi, cand, K, log_inv_b[ini:], log_ts[ini:])
+            return cand, metas(m), {"s": cand, "P_bloqueio": m["P_bloqueio"], "Wq": m["Wq"], "L": m["L"]}
+
+        res = _galope(avaliar, 1, int(K), passo=16)
+        return {"s": res["otimo"], "K": int(K), "curva": res["curva"]}
+
+    # s fixo: o bloqueio cai com K, mas Wq cresce; o menor K que atende ao
+    # bloqueio é o único candidato possível para a meta de espera
+    rho = lambd / (s * mi)
+    if P_bloqueio_max is not None and rho >= 1 and P_bloqueio_max < 1 - 1 / rho:
+        raise ValueError(f"Com s = {s} o bloqueio nunca fica abaixo de {1 - 1 / rho:.6f} (ρ ≥ 1)")
+    log_inv_b, log_ts = SerieErlang(lambd / mi, inicio=s).ate(s)
+
+    def avaliar(ini, fim):
+        cand = np.arange(ini, fim + 1)
+        m = mmsk_forma_fechada(lambd, mi, s, cand, log_inv_b[0], log_ts[0])
+        atende = m["P_bloqueio"] <= P_bloqueio_max if P_bloqueio_max is not None else np.ones(len(cand), dtype=bool)
+        return cand, atende, {"K": cand, "P_bloqueio": m["P_bloqueio"], "Wq": m["Wq"], "L": m["L"]}
+
+    res = _galope(avaliar, int(s), limite, passo=64)
+    if Wq_max is not None and res["curva"]["Wq"][-1] > Wq_max:
+        raise ValueError(f"Com s = {s} nenhum K atende simultaneamente às metas de bloqueio e de espera")
+    return {"s": int(s), "K": res["otimo"], "curva": res["curva"]}
+
+
+def dimensionar_mmsn(
+    lam: float,
+    mu: float,
+    N: int,
+    Wq_max: Optional[float] = None,
+    P_espera_max: Optional[float] = None,
+) -> Dict:
+    """
+    Menor s ≤ N do M/M/s/N tal que Wq ≤ ``Wq_max`` e/ou a probabilidade de um
+    cliente que chega precisar esperar seja ≤ ``P_espera_max``. As medidas são
+    monótonas em s, então basta galope (1, 2, 4, ...) seguido de bisseção.
+    """
+    from .mmsn import MMSN
+
+    _exigir_meta(Wq_max, P_espera_max)
+    avaliados = {}
+
+    def avaliar(s):
+        if s not in avaliados:
+            m = MMSN(lam, mu, s, N)
+            # chegada vê o estado n com probabilidade ∝ (N - n)·P(n)
+            avaliados[s] = (m.Wq, m.cauda_espera(0))
+        Wq, P_espera = avaliados[s]
+        return (Wq_max is None or Wq <= Wq_max) and (P_espera_max is None or P_espera <= P_espera_max)
+
+    lo, hi = 1, 1
+    while not avaliar(hi):
+        if hi >= N:
+            raise ValueError(f"Nenhum s ≤ N = {N} atende às metas informadas")
+        lo, hi = hi + 1, min(2 * hi, N)
+    while lo < hi:
+        meio = (lo + hi) // 2
+        if avaliar(meio):
+            hi = meio
+        else:
+            lo = meio + 1
+
+    ordem = sorted(avaliados)
+    return {
+        "s": hi,
+        "curva": {
+            "s": np.array(ordem),
+            "Wq": np.array([avaliados[k][0] for k in ordem]),
+            "P_espera": np.array([avaliados[k][1] for k in ordem]),
+        },
+    }
@@ -0,0 +1,228 @@
+# models/distribuicoes.py
+"""
+Distribuições do tempo de serviço para o M/G/1 e a distribuição do número de
+clientes no sistema pela função geradora de Pollaczek–Khinchine.
+
+Cada distribuição expõe a média, a variância e a transformada de
+Laplace–Stieltjes B*(s) = E[e^{-sS}], vetorizada em arrays complexos; é o
+que a inversão numérica precisa (aqui e em ``models.espera``).
+
+``ajustar(nome, media, variancia)`` escolhe a família pelo nome e casa os
+dois primeiros momentos: determinística, exponencial, Erlang-k (k = 1/C²
+arredondado), gama, hiperexponencial de médias balanceadas (C² ≥ 1) e
+lognormal (transformada por quadratura de Gauss–Hermite).
+"""
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import instrumentacao
+
+_BLOCO_QUADRATURA = 16_384
+
+FAMILIAS = ("gama", "exponencial", "deterministica", "erlang", "hiperexponencial", "lognormal")
+
+
+class Distribuicao:
+    """Tempo de serviço S ≥ 0 com média, variância e transformada B*(s)."""
+
+    nome = "geral"
+
+    def __init__(self, media: float, variancia: float):
+        if media <= 0:
+            raise ValueError("A média do tempo de serviço deve ser > 0")
+        if variancia < 0:
+            raise ValueError("A variância do tempo de serviço deve ser >= 0")
+        self.media = float(media)
+        self.variancia = float(variancia)
+
+    @property
+    def segundo_momento(self) -> float:
+        return self.variancia + self.media ** 2
+
+    @property
+    def cv2(self) -> float:
+        """Coeficiente de variação ao quadrado, C² = Var/E[S]²."""
+        return self.variancia / self.media ** 2
+
+    def lst(self, s: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}(media={self.media:g}, variancia={self.variancia:g})"
+
+
+class Deterministica(Distribuicao):
+    nome = "deterministica"
+
+    def __init__(self, media: float):
+        super().__init__(media, 0.0)
+
+    def lst(self, s):
+        return np.exp(-s * self.media)
+
+
+class Exponencial(Distribuicao):
+    nome = "exponencial"
+
+    def __init__(self, media: float):
+        super().__init__(media, media ** 2)
+
+    def lst(self, s):
+        return 1 / (1 + self.media * s)
+
+
+class Gama(Distribuicao):
+    nome = "gama"
+
+    def __init__(self, media: float, variancia: float):
+        if variancia <= 0:
+            raise ValueError("A distribuição gama requer variância > 0")
+        super().__init__(media, variancia)
+        self.forma = media ** 2 / variancia
+        self.escala = variancia / media
+
+    def lst(self, s):
+        return (1 + self.escala * s) ** (-self.forma)
+
+
+class ErlangK(Gama):
+    """Erlang com k fases de média E[S]/k cada (gama de forma inteira)."""
+
+    nome = "erlang"
+
+    def __init__(self, media: float, k: int):
+        if k < 1 or int(k) != k:
+            raise ValueError("k deve ser um inteiro >= 1")
+        self.k = int(k)
+        super().__init__(media, media ** 2 / self.k)
+
+    def lst(self, s):
+        return (1 + self.escala * s) ** (-self.k)
+
+
+class Hiperexponencial(Distribuicao):
+    """Mistura de exponenciais: com probabilidade p_i, média m_i."""
+
+    nome = "hiperexponencial"
+
+    def __init__(self, probabilidades: Sequence[float], medias: Sequence[float]):
+        self.probabilidades = np.asarray(probabilidades, dtype=float)
+        self.medias = np.asarray(medias, dtype=float)
+        if self.probabilidades.shape != self.medias.shape or np.any(self.probabilidades < 0) \
+                or np.any(self.medias <= 0) or not math.isclose(self.probabilidades.sum(), 1.0):
+            raise ValueError("Informe probabilidades (somando 1) e médias > 0 de mesmo tamanho")
+        media = float(np.dot(self.probabilidades, self.medias))
+        segundo = float(np.dot(self.probabilidades, 2 * self.medias ** 2))
+        super().__init__(media, segundo - media ** 2)
+
+    @classmethod
+    def ajustar(cls, media: float, variancia: float) -> "Hiperexponencial":
+        """H2 de médias balanceadas (p_1·m_1 = p_2·m_2) com a média e a variância dadas; requer C² ≥ 1."""
+        cv2 = variancia / media ** 2
+        if cv2 < 1:
+            raise ValueError("A hiperexponencial requer C² = σ²μ² ≥ 1")
+        p1 = (1 + math.sqrt((cv2 - 1) / (cv2 + 1))) / 2
+        p2 = 1 - p1
+        if p2 == 0:
+            return cls([1.0], [media])
+        return cls([p1, p2], [media / (2 * p1), media / (2 * p2)])
+
+    def lst(self, s):
+        s = np.asarray(s)
+        return np.sum(self.probabilidades / (1 + np.multiply.outer(s, self.medias)), axis=-1)
+
+
+class Lognormal(Distribuicao):
+    """Lognormal com a média e a variância dadas; B*(s) por Gauss–Hermite com ``nos`` pontos."""
+
+    nome = "lognormal"
+
+    def __init__(self, media: float, variancia: float, nos: int = 64):
+        if variancia <= 0:
+            raise ValueError("A distribuição lognormal requer variância > 0")
+        super().__init__(media, variancia)
+        sigma2 = math.log1p(variancia / media ** 2)
+        x, w = np.polynomial.hermite.hermgauss(nos)
+        # S = exp(m + σ√2·x) com peso w/√π: valores e pesos da quadratura
+        self._valores = np.exp(math.log(media) - sigma2 / 2 + math.sqrt(2 * sigma2) * x)
+        self._pesos = w / math.sqrt(math.pi)
+
+    def lst(self, s):
+        s = np.asarray(s)
+        planos = s.ravel()
+        saida = np.empty(planos.shape, dtype=np.result_type(planos, float))
+        for ini in range(0, len(planos), _BLOCO_QUADRATURA):  # limita a matriz pontos × nós
+            bloco = planos[ini:ini + _BLOCO_QUADRATURA]
+            saida[ini:ini + len(bloco)] = np.exp(-np.multiply.outer(bloco, self._valores)) @ self._pesos
+        return saida.reshape(s.shape)
+
+
+def ajustar(nome: Optional[str], media: float, variancia: Optional[float]) -> Distribuicao:
+    """
+    Distribuição da família ``nome`` com os momentos dados. Sem nome: gama,
+    ou exponencial sem variância e determinística com variância zero (o
+    padrão do M/G/1).
+    """
+    if nome is None:
+        if variancia is None:
+            return Exponencial(media)
+        return Deterministica(media) if variancia == 0 else Gama(media, variancia)
+    nome = nome.lower()
+    if nome not in FAMILIAS:
+        raise ValueError(f"Distribuição desconhecida: {nome} (use {', '.join(FAMILIAS)})")
+    if nome == "exponencial":
+        return Exponencial(media)
+    if nome == "deterministica":
+        return Deterministica(media)
+    if variancia is None:
+        raise ValueError(f"A distribuição {nome} requer a variância do tempo de serviço")
+    if nome == "erlang":
+        if variancia == 0:
+            raise ValueError("A distribuição erlang requer variância > 0")
+        return ErlangK(media, max(1, round(media ** 2 / variancia)))
+    if nome == "hiperexponencial":
+        return Hiperexponencial.ajustar(media, variancia)
+    if nome == "lognormal":
+        return Lognormal(media, variancia)
+    return Gama(media, variancia)
+
+
+def estados_pk(lam: float, servico: Distribuicao, tolerancia: float = 1e-10,
+               max_estados: int = 2 ** 22) -> Tuple[np.ndarray, float]:
+    """
+    P(N = n) do M/G/1 pela função geradora de Pollaczek–Khinchine
+
+        P(z) = (1-ρ)(1-z)·B*(λ(1-z)) / (B*(λ(1-z)) - z),
+
+    invertida por FFT em 2n pontos do círculo |z| = r < 1 (o raio afasta a
+    singularidade removível em z = 1 e amortece o aliasing). n começa perto
+    de 32·L e dobra até que a massa que falta fique abaixo de ``tolerancia``
+    ou se chegue a ``max_estados``. Devolve as probabilidades e a massa
+    truncada.
+    """
+    rho = lam * servico.media
+    if not 0 <= rho < 1:
+        raise ValueError("Sistema instável: λ·E[S] ≥ 1")
+    L = rho + lam ** 2 * servico.segundo_momento / (2 * (1 - rho))
+    n = 1 << max(6, math.ceil(math.log2(32 * (L + 1))))
+    with instrumentacao.medir("estados.pk"):
+        probs, falta = _inverter_pk(lam, rho, servico, n, tolerancia, max_estados)
+    instrumentacao.contar("estados calculados", len(probs))
+    return probs, falta
+
+
+def _inverter_pk(lam, rho, servico, n, tolerancia, max_estados):
+    while True:
+        pontos = 2 * n
+        raio = 10 ** (-4 / pontos)
+        z = raio * np.exp(2j * np.pi * np.arange(pontos) / pontos)
+        B = servico.lst(lam * (1 - z))
+        P = (1 - rho) * (1 - z) * B / (B - z)
+        probs = np.fft.fft(P).real[:n] / pontos * raio ** -np.arange(n)
+        np.maximum(probs, 0, out=probs)
+        falta = max(0.0, 1.0 - float(probs.sum()))
+        if falta <= tolerancia or n >= max_estados:
+            return probs, falta
+        n *= 2
@@ -0,0 +1,232 @@
+# models/erlang.py
+"""
+Núcleo Erlang-B / Erlang-C compartilhado pelos modelos com vários servidores.
+
+Em vez de somar (λ/μ)^n / n! com fatoriais inteiros, usa a recorrência de
+Erlang-B na forma inversa, 1/B(k) = 1 + (k/a)·1/B(k-1), que é O(s) em ponto
+flutuante. O valor é reescalado quando cresce demais, de modo que log(1/B)
+sai exato mesmo quando B é menor que o menor float (a ≪ s). As demais
+grandezas vêm das identidades
+
+    Σ_{n=0}^{s-1} a^n/n! = (a^s/s!)·(1/B - 1)
+    C = B / (1 - ρ·(1 - B))
+
+com a^s/s! sempre em forma logarítmica (``log_termo``).
+"""
+import math
+import threading
+
+import numpy as np
+
+_LIMITE = 1e250
+_LOG_LIMITE = math.log(_LIMITE)
+# até quantas cargas distintas log_inv_erlang_b_lote usa uma SerieErlang por carga
+_MAX_CARGAS_SERIE = 8
+
+
+def log_soma(x: float, y: float) -> float:
+    """log(e^x + e^y) sem overflow."""
+    if x < y:
+        x, y = y, x
+    if y == -math.inf:
+        return x
+    return x + math.log1p(math.exp(y - x))
+
+
+def log_inv_erlang_b(s: int, a: float) -> float:
+    """log(1/B) da Erlang-B para s servidores e carga a = λ/μ > 0."""
+    inv = 1.0
+    um = 1.0       # o termo "1" da recorrência, na escala corrente
+    escala = 0.0   # log do fator já retirado de inv
+    inv_a = 1.0 / a
+    for k in range(1, int(s) + 1):
+        inv = k * inv_a * inv + um
+        if inv > _LIMITE:
+            inv /= _LIMITE
+            um /= _LIMITE
+            escala += _LOG_LIMITE
+    return math.log(inv) + escala
+
+
+def erlang_b(s: int, a: float) -> float:
+    """Probabilidade de bloqueio Erlang-B para s servidores e carga a = λ/μ."""
+    if s < 0 or a < 0:
+        raise ValueError("s e a devem ser não negativos")
+    if a == 0:
+        return 1.0 if s == 0 else 0.0
+    return math.exp(-log_inv_erlang_b(s, a))
+
+
+def erlang_c(s: int, a: float) -> float:
+    """Probabilidade de espera Erlang-C (exige a < s)."""
+    if a >= s:
+        raise ValueError("Sistema instável: λ ≥ s·μ")
+    return erlang_c_de_b(erlang_b(s, a), a / s)
+
+
+def erlang_c_de_b(B: float, rho: float) -> float:
+    """Erlang-C a partir de uma Erlang-B já calculada."""
+    return B / (1 - rho * (1 - B))
+
+
+def log_termo(n: int, a: float) -> float:
+    """log(a^n / n!) sem fatoriais."""
+    if a == 0:
+        return 0.0 if n == 0 else -math.inf
+    return n * math.log(a) - math.lgamma(n + 1)
+
+
+def log_soma_cabeca(log_inv_b: float) -> float:
+    """log(1/B - 1), isto é, log(Σ_{n<s} a^n/n!) - log(a^s/s!)."""
+    return log_inv_b + math.log1p(-math.exp(-log_inv_b))
+
+
+def log_p0_mms(s: int, a: float, log_inv_b: float) -> float:
+    """log P0 do M/M/s (ρ < 1) dado log(1/B)."""
+    rho = a / s
+    return -log_termo(s, a) - log_soma(log_soma_cabeca(log_inv_b), -math.log1p(-rho))
+
+
+def probabilidade_estado_mms(n: int, s: int, a: float, log_p0: float) -> float:
+    """P(n) do M/M/s com capacidade infinita, avaliada em espaço log."""
+    if n < s:
+        log_pn = log_p0 + log_termo(n, a)
+    else:
+        log_pn = log_p0 + log_termo(s, a) + (n - s) * math.log(a / s)
+    return math.exp(log_pn)
+
+
+def log_inv_erlang_b_lote(s, a):
+    """
+    Versão vetorizada de ``log_inv_erlang_b`` para arrays de s (inteiros) e
+    a = λ/μ > 0. Devolve também log(a^s / s!), usado para recuperar P0.
+    """
+    s = s.astype(np.int64)
+    a = np.where(a > 0, a, 1.0)
+    cargas, grupo = np.unique(a, return_inverse=True)
+    if len(cargas) <= _MAX_CARGAS_SERIE:
+        # poucas cargas distintas (ex.: varredura em s): uma série escalar por
+        # carga até o maior s do grupo, em vez do laço sobre todas as linhas
+        grupo = grupo.reshape(a.shape)
+        log_inv_b = np.empty(a.shape)
+        log_ts = np.empty(a.shape)
+        for g, carga in enumerate(cargas):
+            sel = grupo == g
+            serie_inv_b, serie_ts = SerieErlang(float(carga)).ate(s[sel].max())
+            log_inv_b[sel] = serie_inv_b[s[sel]]
+            log_ts[sel] = serie_ts[s[sel]]
+        return log_inv_b, log_ts
+    inv = np.ones(a.shape)
+    um = np.ones(a.shape)
+    escala = np.zeros(a.shape)
+    log_ts = np.zeros(a.shape)
+    log_a = np.log(a)
+    for k in range(1, int(s.max(initial=0)) + 1):
+        ativo = k <= s
+        inv = np.where(ativo, k * inv / a + um, inv)
+        grande = inv > _LIMITE
+        if grande.any():
+            inv = np.where(grande, inv / _LIMITE, inv)
+            um = np.where(grande, um / _LIMITE, um)
+            escala = np.where(grande, escala + _LOG_LIMITE, escala)
+        log_ts = np.where(ativo, log_ts + log_a - math.log(k), log_ts)
+    return np.log(inv) + escala, log_ts
+
+
+class SerieErlang:
+    """
+    log(1/B(s)) e log(a^s/s!) para s = inicio, inicio+1, ... com carga a fixa,
+    estendidos sob demanda: cada novo s custa O(1) a partir do anterior.
+    Pode ser compartilhada entre threads (a extensão é feita com trava).
+    """
+
+    def __init__(self, a: float, inicio: int = 0):
+        if a <= 0:
+            raise ValueError("a = λ/μ deve ser positivo")
+        self.a = a
+        self.inicio = int(inicio)
+        self._trava = threading.Lock()
+        self._inv_a = 1.0 / a
+        self._log_a = math.log(a)
+        self._inv = 1.0
+        self._um = 1.0
+        self._escala = 0.0
+        # até o início só a recorrência é necessária, sem guardar nada
+        for k in range(1, self.inicio + 1):
+            self._inv = k * self._inv_a * self._inv + self._um
+            if self._inv > _LIMITE:
+                self._inv /= _LIMITE
+                self._um /= _LIMITE
+                self._escala += _LOG_LIMITE
+        self._log_inv_b = [math.log(self._inv) + self._escala]
+        self._log_ts = [log_termo(self.inicio, a)]
+
+    def ate(self, s_max: int):
+        """Arrays (log(1/B), log(a^s/s!)) para s = inicio..s_max."""
+        with self._trava:
+            self._estender(s_max)
+            fim = int(s_max) + 1 - self.inicio
+            return np.array(self._log_inv_b[:fim]), np.array(self._log_ts[:fim])
+
+    def em(self, s: int):
+        """(log(1/B), log(a^s/s!)) num único s ≥ inicio, sem montar arrays."""
+        with self._trava:
+            self._estender(s)
+            i = int(s) - self.inicio
+            return self._log_inv_b[i], self._log_ts[i]
+
+    def _estender(self, s_max: int):
+        for k in range(self.inicio + len(self._log_inv_b), int(s_max) + 1):
+            self._inv = k * self._inv_a * self._inv + self._um
+            if self._inv > _LIMITE:
+                self._inv /= _LIMITE
+                self._um /= _LIMITE
+                self._escala += _LOG_LIMITE
+            self._log_inv_b.append(math.log(self._inv) + self._escala)
+            self._log_ts.append(self._log_ts[-1] + self._log_a - math.log(k))
+
+
+# corte (em log) da janela de termos de Poisson: e^-60 ≈ 1e-26 do maior termo
+_CORTE_JANELA = 60.0
+
+
+def _lado_janela(x: float, inicio: int, passo: int, limite: int) -> np.ndarray:
+    """
+    log(t_j / t_inicio) para j = inicio + passo, inicio + 2·passo, ... até
+    ``limite``, com t_j = x^j/j!, parando quando cai abaixo do corte. A razão
+    t_j/t_{j-1} = x/j é acumulada como log1p((x - j)/j), que não perde dígitos
+    perto da moda.
+    """
+    # largura inicial: ~11√x perto da moda (forma gaussiana), corte/|inclinação| se já começa em queda
+    borda = inicio + 1 if passo > 0 else inicio
+    inclinacao = abs(math.log(x / borda)) if borda > 0 else 0.0
+    largura = 64 + int(min(11 * math.sqrt(x), _CORTE_JANELA / inclinacao if inclinacao > 0 else math.inf))
+    while True:
+        fim = inicio + passo * largura
+        fim = min(fim, limite) if passo > 0 else max(fim, limite)
+        j = np.arange(inicio + passo, fim + passo, passo, dtype=float)
+        if not len(j):
+            return j
+        razoes = np.log1p((x - j) / j) if passo > 0 else -np.log1p((x - (j + 1)) / (j + 1))
+        lado = np.cumsum(razoes)
+        if lado[-1] < -_CORTE_JANELA or fim == limite:
+            return lado
+        largura *= 2
+
+
+def janela_poisson(J: int, x: float):
+    """
+    Termos t_j = x^j/j! de j = 0..J que importam, em log relativo ao maior:
+    devolve (j, log t_j - log t_max, log t_max). Como log t_j é côncavo em j,
+    basta crescer a janela a partir da moda min(J, ⌊x⌋) até os termos caírem
+    e^-60 abaixo do maior; o que fica de fora é desprezível em ponto
+    flutuante e o custo é O(√x) em vez de O(J). Σ_j t_j = (1/B(J, x))·x^J/J!
+    é a soma da Erlang-B, sem a recorrência O(J).
+    """
+    J = int(J)
+    moda = min(J, int(math.floor(x)))
+    acima = _lado_janela(x, moda, 1, J)
+    abaixo = _lado_janela(x, moda, -1, 0)
+    log_rel = np.concatenate((abaixo[::-1], [0.0], acima))
+    j = np.arange(moda - len(abaixo), moda + len(acima) + 1)
+    return j, log_rel, log_termo(moda, x)
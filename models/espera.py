@@ -0,0 +1,174 @@
+# models/espera.py
+"""
+Distribuição do tempo de espera: caudas P(Wq > t), P(W > t) e percentis,
+avaliados de uma vez sobre arrays de t (ou de q).
+
+- M/M/s: cauda de Erlang-C, P(Wq > t) = C·e^{-(sμ-λ)t}, e a forma fechada
+  de P(W > t).
+- Modelos finitos (M/M/s/K, M/M/s/N, ...): um cliente admitido que encontra
+  n ≥ s clientes espera uma Erlang(n-s+1, sμ); a cauda é a mistura dessas
+  Erlang pesada pela distribuição vista na chegada, escrita como
+  Σ_j Poisson(j; sμt)·Q_j com Q_j = P(fases > j) (ver
+  ``cauda_mistura_erlang``).
+- M/G/1: inversão numérica da transformada de Laplace de Pollaczek–Khinchine
+  pelo algoritmo de Euler de Abate–Whitt (transformadas do serviço em
+  ``models.distribuicoes``).
+
+Os percentis saem por bisseção vetorizada sobre a cauda.
+"""
+import math
+from typing import Callable
+
+import numpy as np
+
+
+def _como_array(t):
+    t = np.asarray(t, dtype=float)
+    if np.any(t < 0):
+        raise ValueError("t deve ser >= 0")
+    return t
+
+
+def _saida(valor, referencia):
+    return float(valor) if np.ndim(referencia) == 0 else valor
+
+
+# ----------------------------- M/M/s -----------------------------
+def cauda_fila_mms(lam: float, mu: float, s: int, C: float, t):
+    """P(Wq > t) do M/M/s: C·e^{-(sμ-λ)t}."""
+    tt = _como_array(t)
+    return _saida(C * np.exp(-(s * mu - lam) * tt), t)
+
+
+def cauda_sistema_mms(lam: float, mu: float, s: int, C: float, t):
+    """P(W > t) do M/M/s, escrita sem exponenciais crescentes."""
+    tt = _como_array(t)
+    d = s - 1 - lam / mu
+    if abs(d) < 1e-9:
+        valor = np.exp(-mu * tt) * (1 + C * mu * tt)
+    else:
+        valor = np.exp(-mu * tt) + C * (np.exp(-mu * tt) - np.exp(-(s * mu - lam) * tt)) / d
+    return _saida(valor, t)
+
+
+def percentil_fila_mms(lam: float, mu: float, s: int, C: float, q):
+    """Menor t com P(Wq ≤ t) ≥ q, em forma fechada."""
+    qq = _quantis(q)
+    with np.errstate(divide="ignore"):
+        t = np.log(C / (1 - qq)) / (s * mu - lam)
+    return _saida(np.maximum(t, 0.0), q)
+
+
+# ------------------------ mistura de Erlang ------------------------
+def cauda_mistura_erlang(Q: np.ndarray, taxa: float, t, inicio: int = 0):
+    """
+    Σ_j e^{-x}·x^j/j!·Q_j com x = taxa·t: P(espera > t) quando o número de
+    fases exponenciais (taxa ``taxa``) a cumprir tem cauda Q_j = P(fases > j),
+    dada por ``Q[j - inicio]`` (Q_j = Q[0] para j < inicio e 0 além do fim).
+    Para cada t só entram os j na janela x ± 10√x, fora da qual os pesos
+    de Poisson são desprezíveis.
+    """
+    tt = _como_array(t)
+    fim_Q = inicio + len(Q)
+    saida = np.empty(tt.shape)
+    planos = tt.ravel()
+    for i, x in enumerate(taxa * planos):
+        if len(Q) == 0:
+            saida.flat[i] = 0.0
+            continue
+        if x == 0:
+            saida.flat[i] = Q[0]
+            continue
+        largura = 10 * math.sqrt(x) + 10
+        ini = max(0, int(x - largura))
+        fim = min(fim_Q, int(x + largura) + 1)
+        if ini >= fim:
+            saida.flat[i] = 0.0
+            continue
+        j = np.arange(ini, fim)
+        log_fatorial = math.lgamma(ini + 1) + np.concatenate(([0.0], np.cumsum(np.log(j[1:]))))
+        pesos = np.exp(j * math.log(x) - x - log_fatorial)
+        caudas = Q[np.maximum(j - inicio, 0)]
+        saida.flat[i] = np.dot(pesos, caudas)
+    return _saida(np.minimum(saida, 1.0), t)
+
+
+# ----------------------- Laplace (Abate–Whitt) -----------------------
+def _coeficientes_euler(M: int):
+    """β_k e η_k do algoritmo de Euler (Abate & Whitt, 2006) com 2M+1 termos."""
+    xi = np.ones(2 * M + 1)
+    xi[0] = 0.5
+    xi[2 * M] = 2.0 ** -M
+    for k in range(1, M):
+        xi[2 * M - k] = xi[2 * M - k + 1] + 2.0 ** -M * math.comb(M, k)
+    k = np.arange(2 * M + 1)
+    eta = np.where(k % 2 == 0, 1.0, -1.0) * xi
+    beta = M * math.log(10) / 3 + 1j * math.pi * k
+    return beta, eta
+
+
+_EULER = _coeficientes_euler(15)
+
+
+def inverter_laplace(F: Callable[[np.ndarray], np.ndarray], t):
+    """f(t) a partir da transformada F(s) (vetorizada em arrays complexos), para t > 0."""
+    tt = np.atleast_1d(np.asarray(t, dtype=float))
+    beta, eta = _EULER
+    M = (len(beta) - 1) // 2
+    s = beta[:, None] / tt[None, :]
+    valores = F(s).real
+    return 10 ** (M / 3) / tt * (eta @ valores)
+
+
+def cauda_pk(lam: float, media: float, lst_servico: Callable, t, sistema: bool = False):
+    """
+    P(Wq > t) (ou P(W > t) com ``sistema=True``) do M/G/1 por inversão de
+    (1 - W*(s))/s, com W_q*(s) = (1-ρ)s / (s - λ(1 - B*(s))) (Pollaczek–Khinchine).
+    """
+    tt = _como_array(t)
+    rho = lam * media
+
+    def transformada(s):
+        Wq = (1 - rho) * s / (s - lam * (1 - lst_servico(s)))
+        W = Wq * lst_servico(s) if sistema else Wq
+        return (1 - W) / s
+
+    saida = np.empty(tt.shape)
+    positivos = tt.ravel() > 0
+    planos = saida.reshape(-1)
+    planos[~positivos] = 1.0 if sistema else rho
+    if positivos.any():
+        planos[positivos] = inverter_laplace(transformada, tt.ravel()[positivos])
+    return _saida(np.clip(saida, 0.0, 1.0), t)
+
+
+# ----------------------------- percentis -----------------------------
+def _quantis(q):
+    qq = np.asarray(q, dtype=float)
+    if np.any((qq < 0) | (qq >= 1)):
+        raise ValueError("q deve estar em [0, 1)")
+    return qq
+
+
+def percentil(cauda: Callable, q, escala: float, iteracoes: int = 60):
+    """
+    Menor t com P(X > t) ≤ 1 - q para cada q, por bisseção vetorizada; a cauda
+    deve aceitar arrays de t. ``escala`` é um palpite inicial para o limite
+    superior, dobrado até cobrir todos os q.
+    """
+    qq = _quantis(q)
+    alvo = 1 - qq.ravel()
+    alto = np.full(alvo.shape, float(escala))
+    for _ in range(200):
+        fora = np.asarray(cauda(alto)) > alvo
+        if not fora.any():
+            break
+        alto = np.where(fora, 2 * alto, alto)
+    baixo = np.zeros(alvo.shape)
+    for _ in range(iteracoes):
+        meio = (baixo + alto) / 2
+        acima = np.asarray(cauda(meio)) > alvo
+        baixo = np.where(acima, meio, baixo)
+        alto = np.where(acima, alto, meio)
+    resultado = np.where(np.asarray(cauda(np.zeros(alvo.shape))) <= alvo, 0.0, alto).reshape(qq.shape)
+    return _saida(resultado, q)
@@ -0,0 +1,251 @@
+# models/instrumentacao.py
+"""
+Instrumentação dos modelos: cronômetros por fase e contadores, com destino
+plugável. Desligada por padrão; enquanto nenhum coletor está ativo,
+``medir`` devolve sempre o mesmo context manager nulo e ``contar`` só testa
+uma tupla vazia, então o custo nos modelos é o de uma chamada de função.
+
+    from models import instrumentacao as instr
+
+    with instr.instrumentado() as coletor:   # ColetorMemoria
+        MMSK(9, 1, 10, 10**6).resolver()
+    coletor.resumo()["fases"]["estados.pesos"]["total (s)"]
+
+Fases medidas pelo pacote:
+
+- ``validacao``: conferência e conversão dos parâmetros no registro
+- ``<Classe>.construcao`` e ``<Classe>.resultado``: construtor e
+  ``resolver()`` de cada modelo, quando passam pelo registro ou pelo cache
+- ``<chave>.lote``: ``resolver_lote`` via registro
+- ``estados.janela``, ``estados.pesos`` e ``estados.normalizacao``: janela
+  adaptativa, log-pesos e normalização/medidas do motor nascimento-morte
+- ``estados.pk``: distribuição de N do M/G/1 pela FFT
+- ``rede.trafego`` e ``rede.estacoes``: equações de tráfego e medidas das
+  estações da rede de Jackson
+- ``escrita``: gravação de cada bloco na linha de comando
+
+Contadores: ``estados calculados``, ``cache.acertos`` e ``cache.falhas``.
+
+Coletores: ``ColetorMemoria`` (agrega chamadas, tempos e histograma por
+fase), ``ColetorPrometheus`` (o mesmo, gravado no formato texto do
+Prometheus para o textfile collector) e ``ColetorLogging``. Os coletores
+de ``ativar`` são globais ao processo, compartilhados entre threads (linha
+de comando, serviço); os de ``instrumentado`` e ``ativar_no_contexto`` valem
+só para o contexto atual (a thread ou a tarefa asyncio e o que ela chamar),
+de modo que sessões concorrentes do app medem cada uma o seu.
+"""
+import bisect
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+# limites superiores (s) das faixas do histograma de duração
+LIMITES_HISTOGRAMA = (1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+
+_coletores: Tuple = ()
+_no_contexto: contextvars.ContextVar = contextvars.ContextVar("coletores", default=())
+_NULO = contextlib.nullcontext()
+
+
+class _Cronometro:
+    __slots__ = ("fase", "inicio")
+
+    def __init__(self, fase: str):
+        self.fase = fase
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        duracao = time.perf_counter() - self.inicio
+        for coletor in coletores():
+            coletor.tempo(self.fase, duracao)
+        return False
+
+
+def medir(fase: str):
+    """Context manager que mede a duração de ``fase`` (nulo se desativado)."""
+    if not _coletores and not _no_contexto.get():
+        return _NULO
+    return _Cronometro(fase)
+
+
+def contar(nome: str, valor: float = 1):
+    """Soma ``valor`` ao contador ``nome`` nos coletores ativos."""
+    for coletor in coletores():
+        coletor.contador(nome, valor)
+
+
+def ativa() -> bool:
+    return bool(_coletores or _no_contexto.get())
+
+
+def coletores() -> Tuple:
+    """Coletores globais seguidos dos do contexto atual."""
+    locais = _no_contexto.get()
+    return _coletores + locais if locais else _coletores
+
+
+def ativar(*novos):
+    """Ativa, para o processo todo, os coletores dados (ou um ``ColetorMemoria`` novo) e devolve o primeiro."""
+    global _coletores
+    _coletores = tuple(novos) or (ColetorMemoria(),)
+    return _coletores[0]
+
+
+def desativar():
+    global _coletores
+    _coletores = ()
+
+
+def ativar_no_contexto(*novos) -> contextvars.Token:
+    """
+    Troca os coletores do contexto atual pelos dados (nenhum: só os
+    globais). Devolve o token para ``_no_contexto.reset``; o app chama a
+    cada execução do script com o coletor da sessão, ou sem nenhum.
+    """
+    return _no_contexto.set(tuple(novos))
+
+
+@contextlib.contextmanager
+def instrumentado(*novos):
+    """Ativa os coletores (ou um ``ColetorMemoria`` novo) só neste contexto, dentro do bloco."""
+    novos = tuple(novos) or (ColetorMemoria(),)
+    token = _no_contexto.set(novos)
+    try:
+        yield novos[0]
+    finally:
+        _no_contexto.reset(token)
+
+
+# ------------------------------ coletores ------------------------------
+class _Fase:
+    __slots__ = ("chamadas", "total", "minimo", "maximo", "faixas")
+
+    def __init__(self, n_faixas: int):
+        self.chamadas = 0
+        self.total = 0.0
+        self.minimo = float("inf")
+        self.maximo = 0.0
+        self.faixas = [0] * (n_faixas + 1)  # a última é +Inf
+
+
+class ColetorMemoria:
+    """Agrega por fase: chamadas, tempo total, mínimo, máximo e histograma."""
+
+    def __init__(self, limites: Sequence[float] = LIMITES_HISTOGRAMA):
+        self.limites = tuple(sorted(limites))
+        self._trava = threading.Lock()
+        self.fases: Dict[str, _Fase] = {}
+        self.contadores: Dict[str, float] = {}
+
+    def tempo(self, fase: str, segundos: float):
+        with self._trava:
+            f = self.fases.get(fase)
+            if f is None:
+                f = self.fases[fase] = _Fase(len(self.limites))
+            f.chamadas += 1
+            f.total += segundos
+            f.minimo = min(f.minimo, segundos)
+            f.maximo = max(f.maximo, segundos)
+            f.faixas[bisect.bisect_left(self.limites, segundos)] += 1
+
+    def contador(self, nome: str, valor: float):
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + valor
+
+    def resumo(self) -> Dict:
+        """{"fases": {fase: medidas}, "contadores": {...}}, fases em ordem decrescente de tempo total."""
+        with self._trava:
+            fases = sorted(self.fases.items(), key=lambda item: -item[1].total)
+            rotulos = [f"≤ {limite:g} s" for limite in self.limites] + [f"> {self.limites[-1]:g} s"]
+            return {
+                "fases": {
+                    nome: {
+                        "chamadas": f.chamadas,
+                        "total (s)": f.total,
+                        "média (ms)": 1000 * f.total / f.chamadas,
+                        "mínimo (ms)": 1000 * f.minimo,
+                        "máximo (ms)": 1000 * f.maximo,
+                        "histograma": dict(zip(rotulos, f.faixas)),
+                    }
+                    for nome, f in fases
+                },
+                "contadores": dict(self.contadores),
+            }
+
+    def limpar(self):
+        with self._trava:
+            self.fases.clear()
+            self.contadores.clear()
+
+
+def _rotulo_prometheus(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ColetorPrometheus(ColetorMemoria):
+    """
+    ``ColetorMemoria`` exportado no formato texto do Prometheus: histograma
+    ``<prefixo>_fase_segundos{fase=...}`` e contador
+    ``<prefixo>_eventos_total{nome=...}``. ``gravar()`` substitui o arquivo
+    de forma atômica (para o textfile collector do node_exporter).
+    """
+
+    def __init__(self, arquivo: Optional[str] = None, prefixo: str = "filas",
+                 limites: Sequence[float] = LIMITES_HISTOGRAMA):
+        super().__init__(limites)
+        self.arquivo = arquivo
+        self.prefixo = prefixo
+
+    def texto(self) -> str:
+        p = self.prefixo
+        linhas = [
+            f"# HELP {p}_fase_segundos Duração das fases de cálculo dos modelos de filas.",
+            f"# TYPE {p}_fase_segundos histogram",
+        ]
+        with self._trava:
+            for nome, f in sorted(self.fases.items()):
+                fase = _rotulo_prometheus(nome)
+                acumulado = 0
+                for limite, quantidade in zip(self.limites + (float("inf"),), f.faixas):
+                    acumulado += quantidade
+                    le = "+Inf" if limite == float("inf") else repr(float(limite))
+                    linhas.append(f'{p}_fase_segundos_bucket{{fase="{fase}",le="{le}"}} {acumulado}')
+                linhas.append(f'{p}_fase_segundos_sum{{fase="{fase}"}} {f.total!r}')
+                linhas.append(f'{p}_fase_segundos_count{{fase="{fase}"}} {f.chamadas}')
+            linhas += [
+                f"# HELP {p}_eventos_total Contadores dos modelos de filas.",
+                f"# TYPE {p}_eventos_total counter",
+            ]
+            for nome, valor in sorted(self.contadores.items()):
+                linhas.append(f'{p}_eventos_total{{nome="{_rotulo_prometheus(nome)}"}} {valor!r}')
+        return "\n".join(linhas) + "\n"
+
+    def gravar(self, arquivo: Optional[str] = None):
+        arquivo = arquivo or self.arquivo
+        if not arquivo:
+            raise ValueError("Informe o arquivo das métricas")
+        temporario = arquivo + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(self.texto())
+        os.replace(temporario, arquivo)
+
+
+class ColetorLogging:
+    """Registra cada medição no ``logger`` (padrão: ``models.instrumentacao``)."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, nivel: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.nivel = nivel
+
+    def tempo(self, fase: str, segundos: float):
+        self.logger.log(self.nivel, "fase %s: %.3f ms", fase, 1000 * segundos)
+
+    def contador(self, nome: str, valor: float):
+        self.logger.log(self.nivel, "contador %s: +%g", nome, valor)
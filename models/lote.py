@@ -0,0 +1,285 @@
+# models/lote.py
+"""
+Resolução vetorizada (em lote) dos modelos de filas.
+
+Cada função recebe arrays (ou escalares) NumPy com os parâmetros, aplica
+broadcasting entre eles e devolve um array estruturado com uma linha por
+cenário. Cenários instáveis ou inválidos não levantam exceção: ficam com
+``estavel = False`` e as medidas preenchidas com NaN.
+"""
+import math
+
+import numpy as np
+
+from .erlang import janela_poisson, log_inv_erlang_b_lote
+
+CAMPOS = ("rho", "P0", "L", "Lq", "W", "Wq", "lambda_efetivo", "P_bloqueio")
+
+
+def _tabela(estavel, **colunas):
+    """Monta o array estruturado de saída, mascarando as linhas instáveis."""
+    forma = np.broadcast(estavel, *colunas.values()).shape
+    dtype = [(nome, "f8") for nome in CAMPOS] + [("estavel", "?")]
+    saida = np.empty(forma, dtype=dtype)
+    estavel = np.broadcast_to(estavel, forma)
+    for nome in CAMPOS:
+        valor = colunas.get(nome, np.nan)
+        saida[nome] = np.where(estavel, np.broadcast_to(valor, forma), np.nan)
+    saida["estavel"] = estavel
+    return saida
+
+
+def _arrays(*valores):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in valores))
+
+
+def mm1_lote(lam, mu):
+    lam, mu = _arrays(lam, mu)
+    estavel = (lam >= 0) & (mu > 0) & (lam < mu)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lam / mu
+        L = lam / (mu - lam)
+        Lq = lam ** 2 / (mu * (mu - lam))
+        W = 1 / (mu - lam)
+        Wq = lam / (mu * (mu - lam))
+    return _tabela(estavel, rho=rho, P0=1 - rho, L=L, Lq=Lq, W=W, Wq=Wq, lambda_efetivo=lam, P_bloqueio=0.0)
+
+
+def mg1_lote(lam, mu, sigma=np.nan):
+    """``sigma`` é o desvio padrão do tempo de serviço; NaN equivale a serviço exponencial."""
+    lam, mu, sigma = _arrays(lam, mu, sigma)
+    estavel = (lam > 0) & (mu > 0) & (lam < mu)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lam / mu
+        Cs2 = np.where(np.isnan(sigma), 1.0, (sigma * mu) ** 2)
+        Lq = rho ** 2 * (1 + Cs2) / (2 * (1 - rho))
+        Wq = Lq / lam
+        W = Wq + 1 / mu
+    return _tabela(estavel, rho=rho, P0=1 - rho, L=lam * W, Lq=Lq, W=W, Wq=Wq, lambda_efetivo=lam, P_bloqueio=0.0)
+
+
+def mminfinity_lote(lam, mu):
+    lam, mu = _arrays(lam, mu)
+    estavel = (lam >= 0) & (mu > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = lam / mu
+        W = 1 / mu
+    return _tabela(estavel, rho=rho, P0=np.exp(-rho), L=rho, Lq=0.0, W=W, Wq=0.0, lambda_efetivo=lam, P_bloqueio=0.0)
+
+
+def _mms_lote(lam, mu, s, s_min):
+    lam, mu, s = _arrays(lam, mu, s)
+    valido = (lam > 0) & (mu > 0) & (s >= s_min) & (s == np.floor(s))
+    s = np.where(valido, s, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.where(valido, lam / mu, 0.0)
+        rho = a / s
+        estavel = valido & (rho < 1)
+        log_inv_b, log_ts = log_inv_erlang_b_lote(s, a)
+        B = np.exp(-log_inv_b)
+        C = B / (1 - rho * (1 - B))
+        log_cabeca = log_inv_b + np.log1p(-np.exp(-log_inv_b))
+        P0 = np.exp(-log_ts - np.logaddexp(log_cabeca, -np.log1p(-rho)))
+        Lq = C * rho / (1 - rho)
+        Wq = Lq / lam
+        W = Wq + 1 / mu
+    return _tabela(estavel, rho=rho, P0=P0, L=Lq + a, Lq=Lq, W=W, Wq=Wq, lambda_efetivo=lam, P_bloqueio=0.0)
+
+
+def mms_lote(lambd, mi, s):
+    return _mms_lote(lambd, mi, s, s_min=2)
+
+
+def mmc_lote(lam, mu, c):
+    return _mms_lote(lam, mu, c, s_min=1)
+
+
+def mm1k_lote(lam, mu, K):
+    lam, mu, K = _arrays(lam, mu, K)
+    estavel = (lam > 0) & (mu > 0) & (K >= 1) & (lam < mu)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rho = lam / mu
+        # P(n) ∝ e^{n·x}, x = log ρ (λ - μ é exato, então x não perde dígitos perto de ρ = 1);
+        # com expm1 as diferenças 1 - ρ^m não cancelam, e para |m·x| pequeno L sai da série
+        # dos cumulantes da uniforme em 0..K: K/2 + (m² - 1)x/12 - (m⁴ - 1)x³/720
+        x = np.log1p((lam - mu) / mu)
+        m = K + 1
+        P0 = np.where(x == 0, 1 / m, np.expm1(x) / np.expm1(m * x))
+        L = np.where(
+            np.abs(m * x) < 1e-4,
+            K / 2 + (m ** 2 - 1) * x / 12 - (m ** 4 - 1) * x ** 3 / 720,
+            1 / np.expm1(-x) - m / np.expm1(-m * x),
+        )
+        Pb = P0 * np.exp(K * x)
+        lam_eff = lam * (1 - Pb)
+        Lq = np.maximum(L - (1 - P0), 0.0)
+    return _tabela(estavel, rho=rho, P0=P0, L=L, Lq=Lq, W=L / lam_eff, Wq=Lq / lam_eff,
+                   lambda_efetivo=lam_eff, P_bloqueio=Pb)
+
+
+def mmsk_lote(lambd, mi, s, K):
+    """
+    M/M/s/K em forma fechada. As probabilidades são escritas relativas a
+    P(s), o que evita fatoriais: Σ_{n<s} P(n) = P(s)·(1/B - 1) e
+    P(n) = P(s)·ρ^(n-s) para s ≤ n ≤ K, com B a Erlang-B de (s, λ/μ).
+    A normalização é feita em espaço log para não estourar com ρ > 1 e K grande.
+    """
+    lam, mu, s, K = _arrays(lambd, mi, s, K)
+    estavel = (lam > 0) & (mu > 0) & (s >= 1) & (s == np.floor(s)) & (K >= s) & (K == np.floor(K))
+    s = np.where(estavel, s, 1)
+    K = np.where(estavel, K, 1)
+    a = np.where(estavel, lam / mu, 1.0)
+    log_inv_b, log_ts = log_inv_erlang_b_lote(s, a)
+    m = mmsk_forma_fechada(lam, mu, s, K, log_inv_b, log_ts)
+    return _tabela(estavel, rho=m["rho"], P0=m["P0"], L=m["L"], Lq=m["Lq"], W=m["W"], Wq=m["Wq"],
+                   lambda_efetivo=m["lambda_efetivo"], P_bloqueio=m["P_bloqueio"])
+
+
+def _bloco_geometrico(x, m):
+    """
+    log Σ_{j<m} e^(j·x) e a média de j com esses pesos. As formas com expm1
+    não cancelam perto de x = 0; quando |m·x| é pequeno a média vem da série
+    (m-1)/2 + (m²-1)x/12 - (m⁴-1)x³/720.
+    """
+    m = np.asarray(m, dtype=float)
+    mx = m * x
+    log_soma = np.where(
+        x == 0, np.log(m),
+        np.where(x < 0, np.log(np.expm1(mx) / np.expm1(x)),
+                 (m - 1) * x + np.log(np.expm1(-mx) / np.expm1(-x))))
+    media = np.where(np.abs(mx) < 1e-3,
+                     (m - 1) / 2 + (m ** 2 - 1) * x / 12 - (m ** 4 - 1) * x ** 3 / 720,
+                     1 / np.expm1(-x) - m / np.expm1(-mx))
+    return log_soma, media
+
+
+def mmsk_forma_fechada(lam, mu, s, K, log_inv_b, log_ts):
+    """
+    Medidas do M/M/s/K a partir de log(1/B) e log(a^s/s!) já calculados
+    (arrays com broadcasting). Usado por ``mmsk_lote`` e pelo dimensionamento,
+    que obtém a série de Erlang-B incrementalmente.
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore", under="ignore"):
+        a = lam / mu
+        rho = a / s
+        # log ρ sem passar por ρ, para não perder dígitos perto de ρ = 1
+        log_rho = np.log1p((lam - s * mu) / (s * mu))
+        m = K - s + 1  # número de estados com todos os servidores ocupados
+        log_cabeca = log_inv_b + np.log1p(-np.exp(-log_inv_b))
+        log_cauda, media_j = _bloco_geometrico(log_rho, m)
+        log_soma_j = log_cauda + np.log(media_j)
+        log_Z = np.logaddexp(log_cabeca, log_cauda)
+
+        P0 = np.exp(-log_ts - log_Z)
+        PK = np.exp((m - 1) * log_rho - log_Z)
+        Lq = np.exp(log_soma_j - log_Z)
+        lam_eff = lam * (1 - PK)
+        L = Lq + a * (1 - PK)
+        Wq = Lq / lam_eff
+        W = Wq + 1 / mu
+    return {"rho": rho, "P0": P0, "L": L, "Lq": Lq, "W": W, "Wq": Wq, "lambda_efetivo": lam_eff, "P_bloqueio": PK}
+
+
+def _populacao_finita_lote(lam, mu, s, N):
+    """
+    Fonte finita (M/M/s/N) por recorrência nascimento-morte em espaço log,
+    com as somas acumuladas de forma estável (log-sum-exp incremental).
+    """
+    valido = (lam > 0) & (mu > 0) & (s >= 1) & (N >= 1) & (s == np.floor(s)) & (N == np.floor(N))
+    s = np.where(valido, s, 1)
+    N = np.where(valido, N, 1)
+    lam = np.where(valido, lam, 1.0)
+    mu = np.where(valido, mu, 1.0)
+
+    # cenários em ordem decrescente de N: no passo n só as primeiras linhas
+    # (N ≥ n) continuam ativas, e o laço trabalha sobre fatias sem máscaras
+    forma = lam.shape
+    ordem = np.argsort(-N, axis=None, kind="stable")
+    N = N.ravel()[ordem]
+    s = s.ravel()[ordem]
+    log_a = np.log(lam / mu).ravel()[ordem]
+    log_w = np.zeros(N.shape)       # log do peso não normalizado do estado n
+    escala = np.zeros(N.shape)      # maior log_w visto até aqui
+    soma = np.ones(N.shape)         # Σ w_n·e^-escala
+    soma_n = np.zeros(N.shape)      # Σ n·w_n·e^-escala
+    soma_fila = np.zeros(N.shape)   # Σ (n-s)+·w_n·e^-escala
+    ativos = np.searchsorted(-N, -np.arange(int(N.max(initial=0)) + 2), side="right")
+
+    for n in range(1, len(ativos) - 1):
+        m = ativos[n]
+        log_w[:m] += np.log(N[:m] - n + 1) + log_a[:m] - np.log(np.minimum(n, s[:m]))
+        nova = np.maximum(escala[:m], log_w[:m])
+        fator = np.exp(escala[:m] - nova)
+        w = np.exp(log_w[:m] - nova)
+        soma[:m] = soma[:m] * fator + w
+        soma_n[:m] = soma_n[:m] * fator + n * w
+        soma_fila[:m] = soma_fila[:m] * fator + np.maximum(n - s[:m], 0) * w
+        escala[:m] = nova
+
+    def desfazer(x):
+        saida = np.empty(x.shape)
+        saida[ordem] = x
+        return saida.reshape(forma)
+
+    P0 = desfazer(np.exp(-escala) / soma)
+    PN = desfazer(np.exp(log_w - escala) / soma)
+    L = desfazer(soma_n / soma)
+    Lq = desfazer(soma_fila / soma)
+    return valido, P0, PN, L, Lq
+
+
+def populacao_finita_fechada(lam: float, mu: float, s: int, N: int) -> dict:
+    """
+    P0, P_M, L, Lq e λ_efetivo de um M/M/s/N (um cenário) em O(s + √x), sem
+    percorrer os N estados. Contando as fontes ociosas j = N - n, os estados
+    n ≥ s têm pesos x^j/j! relativos a n = N, com x = sμ/λ: uma série de
+    Poisson truncada em J = N - s, somada só na janela que importa
+    (``janela_poisson``). Os s estados n < s vêm das razões
+    kμ / ((N - k + 1)·λ) a partir de n = s. Usado pelo ``with_params`` do
+    M/M/s/N e do M/M/1/N.
+    """
+    s, N = min(int(s), int(N)), int(N)
+    if N == 0:
+        return {"P0": 1.0, "P_M": 1.0, "L": 0.0, "Lq": 0.0, "lambda_efetivo": 0.0}
+    J = N - s
+    x = s * mu / lam
+    j, log_cauda, log_max = janela_poisson(J, x)
+    # cabeça n = 0..s-1: log(p_n/p_s) = Σ_{k=n+1}^{s} log(kμ / ((N-k+1)λ)), relativo ao maior termo da cauda
+    log_ps = log_cauda[-1] if j[-1] == J else J * math.log(x) - math.lgamma(J + 1) - log_max
+    k = np.arange(1, s + 1)
+    log_cabeca = log_ps + np.cumsum(np.log(k * mu / ((N - k + 1) * lam))[::-1])[::-1]
+    ref = max(0.0, float(log_cabeca.max()))
+    cauda = np.exp(log_cauda - ref)
+    cabeca = np.exp(log_cabeca - ref)
+    n = np.arange(s)
+    Z = cauda.sum() + cabeca.sum()
+    # ociosas = N - L somada termo a termo, sem cancelamento quando L ≈ N
+    ociosas = (j @ cauda + (N - n) @ cabeca) / Z
+    return {
+        "P0": cabeca[0] / Z,
+        "P_M": math.exp(-log_max - ref) / Z,
+        "L": (N - j) @ cauda / Z + n @ cabeca / Z,
+        "Lq": (J - j) @ cauda / Z,
+        "lambda_efetivo": lam * ociosas,
+    }
+
+
+def mm1n_lote(lam, mu, N):
+    lam, mu, N = _arrays(lam, mu, N)
+    valido, P0, PN, L, Lq = _populacao_finita_lote(lam, mu, np.ones(lam.shape), N)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lam_eff = lam * (N - L)
+        W = L / lam_eff
+        Wq = Lq / lam_eff
+    return _tabela(valido, rho=lam / mu, P0=P0, L=L, Lq=Lq, W=W, Wq=Wq, lambda_efetivo=lam_eff, P_bloqueio=PN)
+
+
+def mmsn_lote(lam, mu, s, N):
+    lam, mu, s, N = _arrays(lam, mu, s, N)
+    valido, P0, PN, L, Lq = _populacao_finita_lote(lam, mu, s, N)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lam_eff = lam * (N - L)
+        W = L / lam_eff
+        Wq = Lq / lam_eff
+        rho = lam_eff / (s * mu)
+    return _tabela(valido, rho=rho, P0=P0, L=L, Lq=Lq, W=W, Wq=Wq, lambda_efetivo=lam_eff, P_bloqueio=PN)
@@ -1,6 +1,12 @@
 import math
 from typing import Optional
 
+import numpy as np
+
+from . import distribuicoes, espera, lote
+from .nascimento_morte import DistribuicaoEstados
+from .resultado import Preguicoso, Resultado
+
 class MG1:
     def __init__(
         self,
@@ -15,7 +21,9 @@ class MG1:
         L: Optional[float] = None,
         Lq: Optional[float] = None,
         W: Optional[float] = None,
-        Wq: Optional[float] = None
+        Wq: Optional[float] = None,
+        distribuicao: Optional[str] = None,  # família do serviço (ver models.distribuicoes.FAMILIAS)
+        servico: Optional[distribuicoes.Distribuicao] = None
     ):
         self.lam = lam
         self.mu = mu
@@ -29,10 +37,18 @@ class MG1:
         self.Lq = Lq
         self.W = W
         self.Wq = Wq
+        self.distribuicao = distribuicao
+        self.servico = servico
 
         self._calcular_variaveis_faltantes()
 
     def _calcular_variaveis_faltantes(self):
+        if self.servico is not None:
+            if self.mu is None:
+                self.mu = 1 / self.servico.media
+            elif not math.isclose(self.mu * self.servico.media, 1):
+                raise ValueError("μ não confere com a média da distribuição de serviço")
+
         if self.lam is None and self.mu is not None and self.rho is not None:
             self.lam = self.rho * self.mu
         elif self.mu is None and self.lam is not None and self.rho is not None:
@@ -46,12 +62,25 @@ class MG1:
 
         self.rho = self.lam / self.mu
 
+        # distribuição do serviço: gama com a média e variância informadas
+        # (determinístico com σ = 0, exponencial sem σ), salvo outra família
+        informada = self.servico is not None or self.distribuicao is not None
+        if self.servico is None:
+            variancia = None if self.sigma is None else self.sigma ** 2
+            self.servico = distribuicoes.ajustar(self.distribuicao, 1 / self.mu, variancia)
+        if informada:
+            self.sigma = math.sqrt(self.servico.variancia)
+        self._servico_informado = informada
+
         # Fórmulas MG1 usando fator de variabilidade C_s² = (σμ)^2
         Cs2 = (self.sigma * self.mu) ** 2 if self.sigma is not None else 1  # se não informado, assume M/M/1
         self.Lq = (self.rho ** 2 * (1 + Cs2)) / (2 * (1 - self.rho))
         self.Wq = self.Lq / self.lam
         self.W = self.Wq + 1 / self.mu
         self.L = self.lam * self.W
+        self._percentis = {}
+        self._estados = None
+        self.massa_truncada = None
 
     # Probabilidades
     def P0(self):
@@ -60,50 +89,115 @@ class MG1:
     def P_occupied(self):
         return self.rho
 
+    @property
+    def estados(self) -> DistribuicaoEstados:
+        """Distribuição de N (Pollaczek–Khinchine invertida por FFT), calculada na primeira consulta."""
+        if self._estados is None:
+            probs, self.massa_truncada = distribuicoes.estados_pk(self.lam, self.servico)
+            self._estados = DistribuicaoEstados(probs)
+        return self._estados
+
     def P_n(self, n=None):
         n = n if n is not None else self.n
         if n is None:
             return None
-        return (1 - self.rho) * (self.rho ** n)
+        return self.estados.probabilidade(n)
 
     def P_n_greater_than_r(self, r=None):
         r = r if r is not None else self.r
         if r is None:
             return None
-        return self.rho ** (r + 1)
+        return self.estados.prob_acima(r)
+
+    def prob_cauda(self, rs):
+        """P(n > r) para um array de r, em O(1) por consulta (tabela de caudas)."""
+        return self.estados.prob_cauda(rs)
+
+    def quantil(self, q):
+        """Menor r com P(n ≤ r) ≥ q; aceita escalar ou array de q."""
+        return self.estados.quantil(q)
 
     def P_W_greater_than_t(self, t=None):
         t = t if t is not None else self.t_sistema
         if t is None:
             return None
-        return math.exp(- (1 - self.rho) * self.mu * t)
+        return self.cauda_sistema(t)
 
     def P_Wq_greater_than_t(self, t=None):
         t = t if t is not None else self.t_fila
         if t is None:
             return None
-        return self.rho * math.exp(- (1 - self.rho) * self.mu * t)
+        return self.cauda_espera(t)
+
+    # Distribuição do tempo de espera (Pollaczek–Khinchine invertida numericamente)
+    def cauda_espera(self, t):
+        """P(Wq > t); aceita escalar ou array de t."""
+        return espera.cauda_pk(self.lam, 1 / self.mu, self.servico.lst, t)
+
+    def cdf_espera(self, t):
+        return 1 - self.cauda_espera(t)
+
+    def cauda_sistema(self, t):
+        """P(W > t); aceita escalar ou array de t."""
+        if isinstance(self.servico, distribuicoes.Deterministica):
+            # serviço determinístico: W = Wq + 1/μ, sem o salto que a inversão suavizaria
+            tt = np.asarray(t, dtype=float)
+            deslocado = np.maximum(tt - 1 / self.mu, 0)
+            valor = np.where(tt < 1 / self.mu, 1.0, espera.cauda_pk(self.lam, 1 / self.mu, self.servico.lst, deslocado))
+            return float(valor) if valor.ndim == 0 else valor
+        return espera.cauda_pk(self.lam, 1 / self.mu, self.servico.lst, t, sistema=True)
+
+    def cdf_sistema(self, t):
+        return 1 - self.cauda_sistema(t)
+
+    def _percentil(self, cauda, q, chave):
+        if np.ndim(q) == 0 and (chave, float(q)) in self._percentis:
+            return self._percentis[(chave, float(q))]
+        t = espera.percentil(cauda, q, escala=4 * self.W)
+        if np.ndim(q) == 0:
+            self._percentis[(chave, float(q))] = t
+        return t
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q (p95 → q = 0.95); aceita escalar ou array de q."""
+        return self._percentil(self.cauda_espera, q, "Wq")
+
+    def percentil_sistema(self, q):
+        """Menor t com P(W ≤ t) ≥ q; aceita escalar ou array de q."""
+        return self._percentil(self.cauda_sistema, q, "W")
 
     # Resultado padronizado
-    def resolver(self):
-        resultado = {
-            "Modelo": "M/G/1",
-            "Parâmetros": {"λ": self.lam, "μ": self.mu, "ρ": self.rho, "σ": self.sigma},
-            "Medidas de Efetividade": {"L": self.L, "Lq": self.Lq, "W": self.W, "Wq": self.Wq},
-            "Probabilidades": {
-                "P0": self.P0(),
-                "P_occupied": self.P_occupied()
-            }
+    def _probabilidades(self):
+        # P(n) e as caudas de espera dependem da FFT e da inversão de Laplace: só sob demanda
+        probabilidades = {
+            "P0": self.P0(),
+            "P_occupied": self.P_occupied()
         }
 
         if self.n is not None:
-            resultado["Probabilidades"]["P(n)"] = self.P_n()
+            probabilidades["P(n)"] = self.P_n()
         if self.r is not None:
-            resultado["Probabilidades"]["P(n>r)"] = self.P_n_greater_than_r()
-            resultado["Probabilidades"]["P(n<r)"] = 1 - self.P_n_greater_than_r()
+            probabilidades["P(n>r)"] = self.P_n_greater_than_r()
+            probabilidades["P(n<r)"] = 1 - self.P_n_greater_than_r()
         if self.t_sistema is not None:
-            resultado["Probabilidades"]["P(W>t)"] = self.P_W_greater_than_t()
+            probabilidades["P(W>t)"] = self.P_W_greater_than_t()
         if self.t_fila is not None:
-            resultado["Probabilidades"]["P(Wq>t)"] = self.P_Wq_greater_than_t()
+            probabilidades["P(Wq>t)"] = self.P_Wq_greater_than_t()
+
+        return probabilidades
+
+    def resolver(self):
+        parametros = {"λ": self.lam, "μ": self.mu, "ρ": self.rho, "σ": self.sigma}
+        if self._servico_informado:
+            parametros["Serviço"] = self.servico.nome
+        return Resultado({
+            "Modelo": "M/G/1",
+            "Parâmetros": parametros,
+            "Medidas de Efetividade": {"L": self.L, "Lq": self.Lq, "W": self.W, "Wq": self.Wq},
+            "Probabilidades": Preguicoso(self._probabilidades),
+        })
 
-        return resultado
+    @staticmethod
+    def resolver_lote(lam, mu, sigma=float("nan")):
+        """Versão vetorizada de resolver() para arrays de λ, μ e σ (ver models.lote)."""
+        return lote.mg1_lote(lam, mu, sigma)
@@ -1,5 +1,7 @@
 import math
 from typing import Optional
+from . import lote
+from .resultado import Preguicoso, Resultado
 
 class MM1:
     def __init__(
@@ -86,25 +88,33 @@ class MM1:
         return self.rho * math.exp(-self.mu * (1 - self.rho) * t)
 
     # Resultado padronizado
-    def resolver(self):
-        resultado = {
-            "Modelo": "M/M/1",
-            "Parâmetros": {"λ": self.lam, "μ": self.mu, "ρ": self.rho},
-            "Medidas de Efetividade": {"L": self.L, "Lq": self.Lq, "W": self.W, "Wq": self.Wq},
-            "Probabilidades": {
-                "P0": self.P0(),
-                "P_occupied": self.P_occupied()
-            }
+    def _probabilidades(self):
+        probabilidades = {
+            "P0": self.P0(),
+            "P_occupied": self.P_occupied()
         }
 
         if self.n is not None:
-            resultado["Probabilidades"]["P(n)"] = self.P_n()
+            probabilidades["P(n)"] = self.P_n()
         if self.r is not None:
-            resultado["Probabilidades"]["P(n>r)"] = self.P_n_greater_than_r()
-            resultado["Probabilidades"]["P(n<r)"] = 1 - self.P_n_greater_than_r()
+            probabilidades["P(n>r)"] = self.P_n_greater_than_r()
+            probabilidades["P(n<r)"] = 1 - self.P_n_greater_than_r()
         if self.t_sistema is not None:
-            resultado["Probabilidades"]["P(W>t)"] = self.P_W_greater_than_t()
+            probabilidades["P(W>t)"] = self.P_W_greater_than_t()
         if self.t_fila is not None:
-            resultado["Probabilidades"]["P(Wq>t)"] = self.P_Wq_greater_than_t()
+            probabilidades["P(Wq>t)"] = self.P_Wq_greater_than_t()
+
+        return probabilidades
+
+    def resolver(self):
+        return Resultado({
+            "Modelo": "M/M/1",
+            "Parâmetros": {"λ": self.lam, "μ": self.mu, "ρ": self.rho},
+            "Medidas de Efetividade": {"L": self.L, "Lq": self.Lq, "W": self.W, "Wq": self.Wq},
+            "Probabilidades": Preguicoso(self._probabilidades),
+        })
 
-        return resultado
+    @staticmethod
+    def resolver_lote(lam, mu):
+        """Versão vetorizada de resolver() para arrays de λ e μ (ver models.lote)."""
+        return lote.mm1_lote(lam, mu)
@@ -1,6 +1,9 @@
-import math
 from typing import Optional
 
+from .nascimento_morte import ProcessoNascimentoMorte
+from . import lote
+from .resultado import Preguicoso, Resultado
+
 class MM1K:
     """Modelo M/M/1/K - Fila única com capacidade finita"""
     def __init__(
@@ -49,20 +52,16 @@ class MM1K:
 
         self.rho = self.lam / self.mu
 
-        # Probabilidade do sistema vazio
-        if abs(self.rho - 1) < 1e-8:
-            self.P0 = 1 / (self.K + 1)
-            self.L = self.K / 2
-        else:
-            self.P0 = (1 - self.rho) / (1 - self.rho ** (self.K + 1))
-            self.L = (self.rho * (1 - (self.K + 1) * self.rho ** self.K + self.K * self.rho ** (self.K + 1))) / ((1 - self.rho) * (1 - self.rho ** (self.K + 1)))
-
-        self.Pb = self.P0 * self.rho ** self.K
-        self.lam_eff = self.lam * (1 - self.Pb)
+        # Distribuição pelo motor nascimento-morte: λ_n = λ, μ_n = μ
+        self.processo = ProcessoNascimentoMorte(self.lam, self.mu, M=self.K)
+        self.P0 = self.processo.P0
+        self.L = self.processo.L
+        self.Pb = self.processo.P_M
+        self.lam_eff = self.processo.lambda_efetivo
 
-        self.Lq = self.L - (1 - self.P0)
-        self.W = self.L / self.lam_eff
-        self.Wq = self.Lq / self.lam_eff
+        self.Lq = self.processo.Lq
+        self.W = self.processo.W
+        self.Wq = self.processo.Wq
 
     # Probabilidades padronizadas
     def P0_sistema(self):
@@ -75,30 +74,62 @@ class MM1K:
         n = n if n is not None else self.n
         if n is None or n < 0 or n > self.K:
             return 0
-        return self.P0 * self.rho ** n
+        return self.processo.probabilidade(n)
 
     def P_n_greater_than_r(self, r=None):
         r = r if r is not None else self.r
         if r is None:
             return 0
-        if r < 0:
-            return 1
-        elif r >= self.K:
+        return self.processo.prob_acima(r)
+
+    def P_n_less_equal_r(self, r=None):
+        if r is None:
+            r = self.r
+        if r is None:
             return 0
-        prob_acumulada = sum(self.P_n(k) for k in range(r+1))
-        return 1 - prob_acumulada
+        return self.processo.prob_ate(r)
+
+    def prob_cauda(self, rs):
+        """P(n > r) para um array de r, em O(1) por consulta (tabela de caudas)."""
+        return self.processo.prob_cauda(rs)
+
+    def quantil(self, q):
+        """Menor r com P(n ≤ r) ≥ q; aceita escalar ou array de q."""
+        return self.processo.quantil(q)
+
+    def cauda_espera(self, t):
+        """P(Wq > t) de um cliente admitido (FCFS); aceita escalar ou array de t."""
+        return self.processo.cauda_espera(t)
+
+    def cdf_espera(self, t):
+        """P(Wq ≤ t) de um cliente admitido; aceita escalar ou array de t."""
+        return 1 - self.processo.cauda_espera(t)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q entre os admitidos (p95 → q = 0.95); aceita escalar ou array de q."""
+        return self.processo.percentil_espera(q)
+
+    def _probabilidades(self):
+        probabilidades = {"P0": self.P0_sistema(), "P_occupied": self.P_occupied()}
+
+        if self.n is not None:
+            probabilidades[f"P({self.n})"] = self.P_n()
+        if self.r is not None:
+            probabilidades[f"P(n>{self.r})"] = self.P_n_greater_than_r()
+        if self.t_fila is not None:
+            probabilidades["P(Wq>t)"] = self.cauda_espera(self.t_fila)
+
+        return probabilidades
 
     def resolver(self):
-        resultado = {
+        return Resultado({
             "Modelo": "M/M/1/K",
             "Parâmetros": {"λ": self.lam, "μ": self.mu, "K": self.K, "ρ": self.rho, "λ_efetivo": self.lam_eff},
             "Medidas de Efetividade": {"L": self.L, "Lq": self.Lq, "W": self.W, "Wq": self.Wq},
-            "Probabilidades": {"P0": self.P0_sistema(), "P_occupied": self.P_occupied()}
-        }
-
-        if self.n is not None:
-            resultado["Probabilidades"][f"P({self.n})"] = self.P_n()
-        if self.r is not None:
-            resultado["Probabilidades"][f"P(n>{self.r})"] = self.P_n_greater_than_r()
+            "Probabilidades": Preguicoso(self._probabilidades),
+        })
 
-        return resultado
+    @staticmethod
+    def resolver_lote(lam, mu, K):
+        """Versão vetorizada de resolver() para arrays de λ, μ e K (ver models.lote)."""
+        return lote.mm1k_lote(lam, mu, K)
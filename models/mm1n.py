@@ -1,6 +1,10 @@
-import math
+import copy
 from typing import Optional
 
+from . import lote
+from .resultado import Preguicoso, Resultado
+from .nascimento_morte import ProcessoNascimentoMorte
+
 class MM1N:
     """Modelo M/M/1/N — população finita (correto, via processo nascimento-morte)."""
 
@@ -14,64 +18,128 @@ class MM1N:
         if lam <= 0 or mu <= 0 or N <= 0:
             raise ValueError("λ, μ e N devem ser positivos.")
 
+        self._processo: Optional[ProcessoNascimentoMorte] = None
         self._calcular()
 
-    def _calcular(self):
-        a = self.lam / self.mu
-
-        # P0 e lista de probabilidades
-        soma = sum(math.factorial(self.N) / math.factorial(self.N - k) * (a ** k)
-                   for k in range(self.N + 1))
-
-        self.P0 = 1 / soma
-
-        self.probs = [
-            math.factorial(self.N) / math.factorial(self.N - k) * (a ** k) * self.P0
-            for k in range(self.N + 1)
-        ]
-
-        self.PN = self.probs[-1]      # prob. de bloqueio
-
-        # L correto (esperança de n)
-        self.L = sum(k * self.probs[k] for k in range(self.N + 1))
-
-        # Lq correto: nº de clientes na fila = nº total - prob de estar sendo atendido
-        # Número esperado em serviço = (1 - P0)
-        self.Lq = self.L - (1 - self.P0)
+    def _taxa_chegada(self, n):
+        return (self.N - n) * self.lam
 
-        # λ efetivo da população finita: λ * prob. de existir cliente disponível
-        self.lam_eff = self.lam * (self.N - self.L) / self.N
-
-        # tempos
-        if self.lam_eff > 0:
-            self.W = self.L / self.lam_eff
-            self.Wq = self.Lq / self.lam_eff
-        else:
-            self.W = 0
-            self.Wq = 0
+    def _calcular(self):
+        # Razões nascimento-morte p_k / p_{k-1} = (N - k + 1)·λ / μ, acumuladas em
+        # espaço log pelo motor genérico (O(N), sem fatoriais)
+        processo = self.processo
+        self.P0 = processo.P0
+        self.PN = processo.P_M      # prob. de bloqueio
+
+        self.L = processo.L
+        self.Lq = processo.Lq
+
+        # λ efetivo da população finita: Σ (N - n)·λ·p_n = λ·(N - L)
+        self.lam_eff = processo.lambda_efetivo
+        self.W = processo.W
+        self.Wq = processo.Wq
+
+    @property
+    def processo(self) -> ProcessoNascimentoMorte:
+        """Distribuição completa; num modelo de ``with_params`` só é montada aqui, no primeiro uso."""
+        if self._processo is None:
+            self._processo = ProcessoNascimentoMorte(self._taxa_chegada, self.mu, M=self.N)
+        return self._processo
+
+    @property
+    def probs(self):
+        return self.processo.probs
+
+    def with_params(self, **mudancas) -> "MM1N":
+        """
+        Novo M/M/1/N com alguns parâmetros trocados (``lam``, ``mu``, ``N``,
+        ``n``, ``r``) em O(√x), x = μ/λ, em vez de O(N): contando as fontes
+        ociosas j = N - n, o peso de cada estado é x^j/j!, que não depende
+        de N, e só a janela de j em torno da moda é somada
+        (``lote.populacao_finita_fechada`` com s = 1). A distribuição
+        completa só é montada se for consultada.
+        """
+        validos = {"lam", "mu", "N", "n", "r"}
+        desconhecidos = set(mudancas) - validos
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos para M/M/1/N: {', '.join(sorted(desconhecidos))}")
+        p = {nome: getattr(self, nome) for nome in validos}
+        p.update(mudancas)
+        if p["lam"] <= 0 or p["mu"] <= 0 or p["N"] <= 0:
+            return MM1N(**p)
+
+        novo = copy.copy(self)
+        novo.__dict__.update(p)
+        novo.N = int(novo.N)
+        if (novo.lam, novo.mu, novo.N) == (self.lam, self.mu, self.N):
+            return novo  # mesma distribuição; só as consultas n e r mudam
+        novo._processo = None
+        m = lote.populacao_finita_fechada(novo.lam, novo.mu, 1, novo.N)
+        novo.P0, novo.PN, novo.L, novo.Lq = m["P0"], m["P_M"], m["L"], m["Lq"]
+        novo.lam_eff = m["lambda_efetivo"]
+        novo.W = novo.L / novo.lam_eff if novo.lam_eff > 0 else 0.0
+        novo.Wq = novo.Lq / novo.lam_eff if novo.lam_eff > 0 else 0.0
+        return novo
 
     # Probabilidades
     def P_n(self, n=None):
         if n is None:
             n = self.n
-        if n is None or n < 0 or n > self.N:
+        if n is None:
             return 0
-        return self.probs[n]
+        return self.processo.probabilidade(n)
 
     def P_n_greater_than_r(self, r=None):
         if r is None:
             r = self.r
         if r is None:
             return 0
-        if r < 0:
-            return 1
-        if r >= self.N:
+        return self.processo.prob_acima(r)
+
+    def P_n_less_equal_r(self, r=None):
+        if r is None:
+            r = self.r
+        if r is None:
             return 0
-        return sum(self.P_n(k) for k in range(r+1, self.N+1))
+        return self.processo.prob_ate(r)
+
+    def prob_cauda(self, rs):
+        """P(n > r) para um array de r, em O(1) por consulta (tabela de caudas)."""
+        return self.processo.prob_cauda(rs)
+
+    def quantil(self, q):
+        """Menor r com P(n ≤ r) ≥ q; aceita escalar ou array de q."""
+        return self.processo.quantil(q)
+
+    def cauda_espera(self, t):
+        """P(Wq > t) de um cliente admitido (FCFS); aceita escalar ou array de t."""
+        return self.processo.cauda_espera(t)
+
+    def cdf_espera(self, t):
+        """P(Wq ≤ t) de um cliente admitido; aceita escalar ou array de t."""
+        return 1 - self.processo.cauda_espera(t)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q entre os admitidos (p95 → q = 0.95); aceita escalar ou array de q."""
+        return self.processo.percentil_espera(q)
 
     # Saída padronizada
+    def _probabilidades(self):
+        probabilidades = {
+            "P0": self.P0,
+            "PN (bloqueio)": self.PN
+        }
+
+        if self.n is not None:
+            probabilidades[f"P({self.n})"] = self.P_n(self.n)
+
+        if self.r is not None:
+            probabilidades[f"P(n>{self.r})"] = self.P_n_greater_than_r(self.r)
+
+        return probabilidades
+
     def resolver(self):
-        resultado = {
+        return Resultado({
             "Modelo": "M/M/1/N",
             "Parâmetros": {
                 "λ": self.lam,
@@ -85,16 +153,10 @@ class MM1N:
                 "W": self.W,
                 "Wq": self.Wq,
             },
-            "Probabilidades": {
-                "P0": self.P0,
-                "PN (bloqueio)": self.PN
-            }
-        }
-
-        if self.n is not None:
-            resultado["Probabilidades"][f"P({self.n})"] = self.P_n(self.n)
-
-        if self.r is not None:
-            resultado["Probabilidades"][f"P(n>{self.r})"] = self.P_n_greater_than_r(self.r)
+            "Probabilidades": Preguicoso(self._probabilidades),
+        })
 
-        return resultado
+    @staticmethod
+    def resolver_lote(lam, mu, N):
+        """Versão vetorizada de resolver() para arrays de λ, μ e N (ver models.lote)."""
+        return lote.mm1n_lote(lam, mu, N)
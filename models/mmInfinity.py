@@ -1,5 +1,9 @@
 import math
 
+from . import lote
+from .resultado import Preguicoso, Resultado
+from .nascimento_morte import ProcessoNascimentoMorte
+
 class MMInfinity:
     """Modelo M/M/∞ - Servidores infinitos"""
     def __init__(self, lam=None, mu=None, L=None, W=None, Wq=None, n=None):
@@ -21,16 +25,35 @@ class MMInfinity:
         self.W = 1 / self.mu
         self.Wq = 0  # Sem fila em servidores infinitos
         self.P0 = math.exp(-self.rho)
+        self._processo = None
+
+    @property
+    def processo(self):
+        """Poisson(ρ) truncada bem além da cauda, montada pelo motor nascimento-morte."""
+        if self._processo is None:
+            M = math.ceil(self.rho + 10 * math.sqrt(self.rho) + 40)
+            self._processo = ProcessoNascimentoMorte(self.lam, lambda n: n * self.mu, M=M)
+        return self._processo
 
     def probabilidade_estado_n(self, n=None):
         if n is None:
             n = self.n
         if n is None:
             return None
-        return (self.rho ** n / math.factorial(n)) * self.P0
+        return self.processo.probabilidade(n)
+
+    def _probabilidades(self):
+        probabilidades = {
+            "P0": self.P0
+        }
+
+        if self.n is not None:
+            probabilidades[f"P({self.n})"] = self.probabilidade_estado_n()
+
+        return probabilidades
 
     def resolver(self):
-        resultado = {
+        return Resultado({
             "Modelo": "M/M/∞",
             "Parâmetros": {
                 "λ": self.lam,
@@ -42,12 +65,10 @@ class MMInfinity:
                 "W": self.W,
                 "Wq": self.Wq
             },
-            "Probabilidades": {
-                "P0": self.P0
-            }
-        }
-
-        if self.n is not None:
-            resultado["Probabilidades"][f"P({self.n})"] = self.probabilidade_estado_n()
+            "Probabilidades": Preguicoso(self._probabilidades),
+        })
 
-        return resultado
+    @staticmethod
+    def resolver_lote(lam, mu):
+        """Versão vetorizada de resolver() para arrays de λ e μ (ver models.lote)."""
+        return lote.mminfinity_lote(lam, mu)
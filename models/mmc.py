@@ -1,57 +1,10 @@
 import math
 
-class MMInfinity:
-    """Modelo M/M/∞ - Servidores infinitos"""
-    def __init__(self, lam=None, mu=None, L=None, W=None, Wq=None, n=None):
-        self.lam = lam
-        self.mu = mu
-        self.L = L
-        self.W = W
-        self.Wq = Wq
-        self.n = n
-
-        self.calcular_variaveis_faltantes()
-
-    def calcular_variaveis_faltantes(self):
-        if self.lam is None or self.mu is None:
-            raise ValueError("λ e μ devem ser fornecidos")
-
-        self.rho = self.lam / self.mu
-        self.L = self.rho
-        self.W = 1 / self.mu
-        self.Wq = 0  # Sem fila em servidores infinitos
-        self.P0 = math.exp(-self.rho)
-
-    def probabilidade_estado_n(self, n=None):
-        if n is None:
-            n = self.n
-        if n is None:
-            return None
-        return (self.rho ** n / math.factorial(n)) * self.P0
-
-    def resolver(self):
-        resultado = {
-            "Modelo": "M/M/∞",
-            "Parâmetros": {
-                "λ": self.lam,
-                "μ": self.mu,
-                "ρ": self.rho
-            },
-            "Medidas de Efetividade": {
-                "L": self.L,
-                "W": self.W,
-                "Wq": self.Wq
-            },
-            "Probabilidades": {
-                "P0": self.P0
-            }
-        }
-
-        if self.n is not None:
-            resultado["Probabilidades"][f"P({self.n})"] = self.probabilidade_estado_n()
-
-        return resultado
+import numpy as np
 
+from .erlang import erlang_c_de_b, log_inv_erlang_b, log_p0_mms, probabilidade_estado_mms
+from . import espera, lote
+from .resultado import Preguicoso, Resultado
 
 class MMC:
     """Modelo M/M/c - Múltiplos servidores infinitos (capacidade infinita)"""
@@ -73,34 +26,73 @@ class MMC:
 
         self.rho = self.lam / (self.c * self.mu)
 
-        # Probabilidade do sistema ocioso P0
-        soma = sum((self.lam / self.mu) ** n / math.factorial(n) for n in range(self.c))
-        termo_c = ((self.lam / self.mu) ** self.c) / (math.factorial(self.c) * (1 - self.rho))
-        self.P0 = 1 / (soma + termo_c)
+        if self.rho >= 1:
+            raise ValueError("Sistema instável: λ ≥ c·μ")
+
+        # Probabilidade do sistema ocioso P0 (núcleo Erlang, sem fatoriais)
+        a = self.lam / self.mu
+        log_inv_b = log_inv_erlang_b(self.c, a)
+        self.C = erlang_c_de_b(math.exp(-log_inv_b), self.rho)
+        self._log_P0 = log_p0_mms(self.c, a, log_inv_b)
+        self.P0 = math.exp(self._log_P0)
 
         # Lq
-        self.Lq = (self.P0 * ((self.lam / self.mu) ** self.c) * self.rho) / (math.factorial(self.c) * (1 - self.rho) ** 2)
+        self.Lq = self.C * self.rho / (1 - self.rho)
 
         # L
-        self.L = self.Lq + self.lam / self.mu
+        self.L = self.Lq + a
 
         # Wq e W
         self.Wq = self.Lq / self.lam
         self.W = self.L / self.lam
+        self._percentis = {}
 
     def probabilidade_estado_n(self, n=None):
         if n is None:
             n = self.n
         if n is None:
             return None
+        return probabilidade_estado_mms(n, self.c, self.lam / self.mu, self._log_P0)
+
+    def cauda_espera(self, t):
+        """P(Wq > t) = C·e^(-(sμ-λ)t); aceita escalar ou array de t."""
+        return espera.cauda_fila_mms(self.lam, self.mu, self.c, self.C, t)
+
+    def cdf_espera(self, t):
+        return 1 - self.cauda_espera(t)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q (p95 → q = 0.95), em forma fechada; aceita escalar ou array de q."""
+        return espera.percentil_fila_mms(self.lam, self.mu, self.c, self.C, q)
+
+    def cauda_sistema(self, t):
+        """P(W > t) (espera + atendimento); aceita escalar ou array de t."""
+        return espera.cauda_sistema_mms(self.lam, self.mu, self.c, self.C, t)
+
+    def cdf_sistema(self, t):
+        return 1 - self.cauda_sistema(t)
+
+    def percentil_sistema(self, q):
+        """Menor t com P(W ≤ t) ≥ q, por bisseção; percentis escalares ficam guardados."""
+        if np.ndim(q) == 0 and float(q) in self._percentis:
+            return self._percentis[float(q)]
+        t = espera.percentil(self.cauda_sistema, q, escala=4 * self.W)
+        if np.ndim(q) == 0:
+            self._percentis[float(q)] = t
+        return t
+
+    def _probabilidades(self):
+        probabilidades = {
+            "P0": self.P0
+        }
 
-        if n < self.c:
-            return ((self.lam / self.mu) ** n / math.factorial(n)) * self.P0
-        else:
-            return ((self.lam / self.mu) ** n / (math.factorial(self.c) * self.c ** (n - self.c))) * self.P0
+        if self.n is not None:
+            probabilidades[f"P({self.n})"] = self.probabilidade_estado_n()
+
+        return probabilidades
 
     def resolver(self):
-        resultado = {
+        return Resultado({
             "Modelo": "M/M/c",
             "Parâmetros": {
                 "λ": self.lam,
@@ -114,12 +106,10 @@ class MMC:
                 "W": self.W,
                 "Wq": self.Wq
             },
-            "Probabilidades": {
-                "P0": self.P0
-            }
-        }
-
-        if self.n is not None:
-            resultado["Probabilidades"][f"P({self.n})"] = self.probabilidade_estado_n()
+            "Probabilidades": Preguicoso(self._probabilidades),
+        })
 
-        return resultado
+    @staticmethod
+    def resolver_lote(lam, mu, c):
+        """Versão vetorizada de resolver() para arrays de λ, μ e c (ver models.lote)."""
+        return lote.mmc_lote(lam, mu, c)
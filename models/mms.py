@@ -1,6 +1,12 @@
 import math
 from typing import Optional
 
+import numpy as np
+
+from .erlang import erlang_c_de_b, log_inv_erlang_b, log_p0_mms, probabilidade_estado_mms
+from . import dimensionamento, espera, lote, tempo_variavel
+from .resultado import Preguicoso, Resultado
+
 
 class MMS:
     """Modelo M/M/s - Fila múltipla, população infinita"""
@@ -33,31 +39,28 @@ class MMS:
         if self.rho >= 1:
             raise ValueError("Sistema instável: λ ≥ s·μ")
 
-        # P0
-        soma = sum((self.lambd / self.mi) ** n / math.factorial(n) for n in range(self.s))
-        termo = ((self.lambd / self.mi) ** self.s) / (math.factorial(self.s) * (1 - self.rho))
-        self.P0 = 1 / (soma + termo)
+        # P0 e Lq pelo núcleo Erlang (sem fatoriais, estável para s grande)
+        a = self.lambd / self.mi
+        log_inv_b = log_inv_erlang_b(self.s, a)
+        self.C = erlang_c_de_b(math.exp(-log_inv_b), self.rho)
+        self._log_P0 = log_p0_mms(self.s, a, log_inv_b)
+        self.P0 = math.exp(self._log_P0)
 
         # Lq
-        self.Lq = (self.P0 * (self.lambd / self.mi) ** self.s * self.rho) / (
-                    math.factorial(self.s) * (1 - self.rho) ** 2)
+        self.Lq = self.C * self.rho / (1 - self.rho)
 
         # L, Wq, W
-        self.L = self.Lq + (self.lambd / self.mi)
+        self.L = self.Lq + a
         self.Wq = self.Lq / self.lambd
         self.W = self.Wq + (1 / self.mi)
+        self._percentis = {}
 
     def probabilidade_estado_n(self, n=None):
         if n is None:
             n = self.n
         if n is None:
             return 0
-        P0 = self.P0
-        if n < self.s:
-            return ((self.lambd / self.mi) ** n / math.factorial(n)) * P0
-        else:
-            denominador = math.factorial(self.s) * (self.s ** (n - self.s))
-            return ((self.lambd / self.mi) ** n / denominador) * P0
+        return probabilidade_estado_mms(n, self.s, self.lambd / self.mi, self._log_P0)
 
     def probabilidade_de_clientes_ser_superior(self, r=None):
         if r is None:
@@ -65,14 +68,12 @@ class MMS:
         if r is None:
             return 0
 
-        P0 = self.P0
         if r < self.s - 1:
             prob_acum = sum(self.probabilidade_estado_n(k) for k in range(r + 1))
             return 1 - prob_acum
         else:
-            numerador = (self.s * self.rho) ** self.s
-            denominador = math.factorial(self.s) * (1 - self.rho)
-            return (numerador / denominador) * (self.rho ** (r + 1 - self.s)) * P0
+            # P(n > r) = C·ρ^(r+1-s) para r ≥ s-1
+            return self.C * (self.rho ** (r + 1 - self.s))
 
     def probabilidade_sistema_ocioso(self):
         return self.P0
@@ -80,8 +81,56 @@ class MMS:
     def probabilidade_sistema_ocupado(self):
         return 1 - self.P0
 
+    def cauda_espera(self, t):
+        """P(Wq > t) = C·e^(-(sμ-λ)t); aceita escalar ou array de t."""
+        return espera.cauda_fila_mms(self.lambd, self.mi, self.s, self.C, t)
+
+    def cdf_espera(self, t):
+        return 1 - self.cauda_espera(t)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q (p95 → q = 0.95), em forma fechada; aceita escalar ou array de q."""
+        return espera.percentil_fila_mms(self.lambd, self.mi, self.s, self.C, q)
+
+    def cauda_sistema(self, t):
+        """P(W > t) (espera + atendimento); aceita escalar ou array de t."""
+        return espera.cauda_sistema_mms(self.lambd, self.mi, self.s, self.C, t)
+
+    def cdf_sistema(self, t):
+        return 1 - self.cauda_sistema(t)
+
+    def percentil_sistema(self, q):
+        """Menor t com P(W ≤ t) ≥ q, por bisseção; percentis escalares ficam guardados."""
+        if np.ndim(q) == 0 and float(q) in self._percentis:
+            return self._percentis[float(q)]
+        t = espera.percentil(self.cauda_sistema, q, escala=4 * self.W)
+        if np.ndim(q) == 0:
+            self._percentis[float(q)] = t
+        return t
+
+    def _probabilidades(self):
+        probabilidades = {
+            'P(0)': self.probabilidade_sistema_ocioso(),
+            'P(ocupado)': self.probabilidade_sistema_ocupado()
+        }
+
+        if self.n is not None:
+            probabilidades[f'P({self.n})'] = self.probabilidade_estado_n()
+
+        if self.r is not None:
+            probabilidades[f'P(n > {self.r})'] = self.probabilidade_de_clientes_ser_superior()
+            probabilidades[f'P(n < {self.r})'] = 1 - self.probabilidade_de_clientes_ser_superior()
+
+        if self.t_sistema is not None:
+            probabilidades[f'P(W > {self.t_sistema})'] = self.cauda_sistema(self.t_sistema)
+
+        if self.t_fila is not None:
+            probabilidades[f'P(Wq > {self.t_fila})'] = self.cauda_espera(self.t_fila)
+
+        return probabilidades
+
     def resolver(self):
-        resultado = {
+        return Resultado({
             'Modelo': f'M/M/s>1',
             'Parâmetros': {
                 'λ': self.lambd,
@@ -95,17 +144,20 @@ class MMS:
                 'W': self.W,
                 'Wq': self.Wq
             },
-            'Probabilidades': {
-                'P(0)': self.probabilidade_sistema_ocioso(),
-                'P(ocupado)': self.probabilidade_sistema_ocupado()
-            }
-        }
-
-        if self.n is not None:
-            resultado['Probabilidades'][f'P({self.n})'] = self.probabilidade_estado_n()
-
-        if self.r is not None:
-            resultado['Probabilidades'][f'P(n > {self.r})'] = self.probabilidade_de_clientes_ser_superior()
-            resultado['Probabilidades'][f'P(n < {self.r})'] = 1 - self.probabilidade_de_clientes_ser_superior()
-
-        return resultado
+            'Probabilidades': Preguicoso(self._probabilidades),
+        })
+
+    @staticmethod
+    def resolver_lote(lambd, mi, s):
+        """Versão vetorizada de resolver() para arrays de λ, μ e s (ver models.lote)."""
+        return lote.mms_lote(lambd, mi, s)
+
+    @staticmethod
+    def dimensionar(lambd, mi, Wq_max=None, t_fila=None, P_espera_max=None, s_max=10 ** 7):
+        """Menor s que atende Wq ≤ Wq_max e/ou P(Wq > t_fila) ≤ P_espera_max (ver models.dimensionamento)."""
+        return dimensionamento.dimensionar_mms(lambd, mi, Wq_max, t_fila, P_espera_max, s_max)
+
+    @staticmethod
+    def resolver_no_tempo(lambd_t, mi, s, metodo="transiente", **opcoes):
+        """L(t), Lq(t), Wq(t) para λ(t) dado por intervalo: psa, sipp, transiente ou fluido (ver models.tempo_variavel)."""
+        return tempo_variavel.resolver_no_tempo(lambd_t, mi, s, None, metodo, **opcoes)
@@ -1,11 +1,19 @@
-import math
+import copy
 from typing import Optional
 
+import numpy as np
+
+from .erlang import SerieErlang
+from .nascimento_morte import ProcessoNascimentoMorte, tolerancia_para
+from . import dimensionamento, lote, tempo_variavel
+from .resultado import Preguicoso, Resultado
+
 
 class MMSK:
     """Modelo M/M/s/K - Múltiplos servidores com capacidade finita"""
 
-    def __init__(self, lambd=None, mi=None, s=None, K=None, rho=None, W=None, Wq=None, L=None, Lq=None, n=None, r=None):
+    def __init__(self, lambd=None, mi=None, s=None, K=None, rho=None, W=None, Wq=None, L=None, Lq=None, n=None, r=None,
+                 tolerancia=None):
         self.lambd = lambd
         self.mi = mi
         self.s = s
@@ -18,6 +26,10 @@ class MMSK:
         self.Lq = Lq
         self.n = n
         self.r = r
+        # massa desprezável fora da janela de estados calculada (None: exato até 10⁶ estados)
+        self.tolerancia = tolerancia
+        # série de Erlang-B da carga λ/μ para with_params (montada no primeiro uso)
+        self._serie = None
 
         self.calcular_variaveis_faltantes()
 
@@ -29,61 +41,127 @@ class MMSK:
 
         self.rho = self.lambd / (self.s * self.mi)
 
-        # --- Cálculo de P0
-        a = self.lambd / self.mi
-        if abs(self.rho - 1) < 1e-12:  # caso ρ = 1
-            sum_terms = sum((a ** n) / math.factorial(n) for n in range(self.s))
-            tail = (a ** self.s) / math.factorial(self.s) * (self.K - self.s + 1)
-            self.P0 = 1 / (sum_terms + tail)
-        else:
-            sum_terms = sum((a ** n) / math.factorial(n) for n in range(self.s))
-            tail = (a ** self.s) / math.factorial(self.s) * (1 - self.rho ** (self.K - self.s + 1)) / (1 - self.rho)
-            self.P0 = 1 / (sum_terms + tail)
-
-        # Probabilidades Pn
-        self.probs = []
-        for n in range(self.K + 1):
-            if n < self.s:
-                pn = self.P0 * (a ** n) / math.factorial(n)
-            else:
-                pn = self.P0 * (a ** n) / (math.factorial(self.s) * (self.s ** (n - self.s)))
-            self.probs.append(pn)
-
-        self.PK = self.probs[self.K]
-        self.lambda_efetivo = self.lambd * (1 - self.PK)
-
-        # Lq
-        if abs(self.rho - 1) < 1e-12:
-            self.Lq = self.lambda_efetivo * (
-                        sum(n * self.probs[n] for n in range(self.K + 1)) / self.lambda_efetivo - 1 / self.mi)
-        else:
-            self.Lq = (
-                    self.P0
-                    * (a ** self.s)
-                    * self.rho
-                    / (math.factorial(self.s) * (1 - self.rho) ** 2)
-                    * (1 - self.rho ** (self.K - self.s + 1) - (self.K - self.s + 1) * (1 - self.rho) * self.rho ** (
-                        self.K - self.s))
-            )
+        self._processo = None
+        processo = self.processo
+        self._medidas(P0=processo.P0, P_M=processo.P_M, L=processo.L, Lq=processo.Lq,
+                      lambda_efetivo=processo.lambda_efetivo)
+
+    def _taxa_servico(self, n):
+        return np.minimum(n, self.s) * self.mi
+
+    def _medidas(self, P0, P_M, L, Lq, lambda_efetivo):
+        self.P0 = P0
+        self.PK = P_M
+        self.lambda_efetivo = lambda_efetivo
+
+        # Lq = Σ (n - s)·P(n)
+        self.Lq = Lq
 
         # L, Wq, W
-        self.L = sum(n * self.probs[n] for n in range(self.K + 1))
+        self.L = L
         self.Wq = self.Lq / self.lambda_efetivo if self.lambda_efetivo > 0 else 0
         self.W = self.Wq + 1 / self.mi if self.mi > 0 else 0
 
+    @property
+    def processo(self) -> ProcessoNascimentoMorte:
+        """Distribuição completa; num modelo de ``with_params`` só é montada aqui, no primeiro uso."""
+        if self._processo is None:
+            # motor nascimento-morte: λ_n = λ, μ_n = min(n, s)·μ
+            self._processo = ProcessoNascimentoMorte(
+                self.lambd, self._taxa_servico, M=self.K, servidores=self.s,
+                tolerancia=tolerancia_para(self.K, self.tolerancia)
+            )
+        return self._processo
+
+    @property
+    def probs(self):
+        return self.processo.probs
+
+    def _serie_erlang(self) -> SerieErlang:
+        a = self.lambd / self.mi
+        if self._serie is None or self._serie.a != a:
+            self._serie = SerieErlang(a)
+        return self._serie
+
+    def with_params(self, **mudancas) -> "MMSK":
+        """
+        Novo M/M/s/K resolvido com alguns parâmetros trocados (``lambd``,
+        ``mi``, ``s``, ``K``, ``n``, ``r``, ``tolerancia``) sem percorrer os
+        K estados. Os estados 0..s-1 entram por log(1/B(s)) da série de
+        Erlang-B da carga a = λ/μ, compartilhada entre os modelos derivados,
+        e os estados s..K formam um bloco geométrico de razão ρ com soma em
+        forma fechada (``lote.mmsk_forma_fechada``):
+
+        - K (e n, r, tolerancia): O(1)
+        - s: O(1) para s já coberto pela série, O(Δs) para s maior
+        - λ e μ com a mesma carga: O(1); outra carga: O(s) (série nova)
+
+        As medidas são exatas mesmo com ``tolerancia``; a distribuição
+        completa (``processo``, ``probs``) só é montada, com a janela, se
+        for consultada.
+        """
+        validos = {"lambd", "mi", "s", "K", "n", "r", "tolerancia"}
+        desconhecidos = set(mudancas) - validos
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos para M/M/s/K: {', '.join(sorted(desconhecidos))}")
+        p = {nome: getattr(self, nome) for nome in validos}
+        p.update(mudancas)
+        if p["lambd"] <= 0 or p["mi"] <= 0:
+            return MMSK(**p)
+        if p["s"] < 1 or p["K"] < p["s"]:
+            raise ValueError("K deve ser >= s e s >= 1")
+
+        novo = copy.copy(self)
+        novo.__dict__.update(p)
+        novo.rho = novo.lambd / (novo.s * novo.mi)
+        novo._processo = None
+        novo._serie = self._serie_erlang() if novo.lambd / novo.mi == self.lambd / self.mi else None
+        log_inv_b, log_ts = novo._serie_erlang().em(novo.s)
+        m = lote.mmsk_forma_fechada(novo.lambd, novo.mi, novo.s, novo.K, log_inv_b, log_ts)
+        novo._medidas(P0=float(m["P0"]), P_M=float(m["P_bloqueio"]), L=float(m["L"]), Lq=float(m["Lq"]),
+                      lambda_efetivo=float(m["lambda_efetivo"]))
+        return novo
+
     def probabilidade_estado_n(self, n=None):
         if n is None:
             n = self.n
         if n is None or n < 0 or n > self.K:
             return 0
-        return self.probs[int(n)]
+        return self.processo.probabilidade(n)
 
     def probabilidade_de_clientes_ser_superior(self, r=None):
         if r is None:
             r = self.r
         if r is None or r >= self.K:
             return 0
-        return sum(self.probs[int(n)] for n in range(int(r) + 1, self.K + 1))
+        return self.processo.prob_acima(int(r))
+
+    def probabilidade_de_clientes_ate(self, r=None):
+        if r is None:
+            r = self.r
+        if r is None:
+            return 0
+        return self.processo.prob_ate(int(r))
+
+    def prob_cauda(self, rs):
+        """P(n > r) para um array de r, em O(1) por consulta (tabela de caudas)."""
+        return self.processo.prob_cauda(rs)
+
+    def quantil(self, q):
+        """Menor r com P(n ≤ r) ≥ q; aceita escalar ou array de q."""
+        return self.processo.quantil(q)
+
+    def cauda_espera(self, t):
+        """P(Wq > t) de um cliente admitido (FCFS); aceita escalar ou array de t."""
+        return self.processo.cauda_espera(t)
+
+    def cdf_espera(self, t):
+        """P(Wq ≤ t) de um cliente admitido; aceita escalar ou array de t."""
+        return 1 - self.processo.cauda_espera(t)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q entre os admitidos (p95 → q = 0.95); aceita escalar ou array de q."""
+        return self.processo.percentil_espera(q)
 
     def probabilidade_sistema_ocioso(self):
         return self.P0
@@ -91,6 +169,20 @@ class MMSK:
     def probabilidade_sistema_cheio(self):
         return self.PK
 
+    def _probabilidades(self):
+        probabilidades = {
+            'P(0)': self.P0,
+            f'P({self.K})': self.PK
+        }
+
+        if self.n is not None:
+            probabilidades[f'P({self.n})'] = self.probabilidade_estado_n()
+
+        if self.r is not None:
+            probabilidades[f'P(n > {self.r})'] = self.probabilidade_de_clientes_ser_superior()
+
+        return probabilidades
+
     def resolver(self):
         resultado = {
             'Modelo': 'M/M/s/K',
@@ -108,16 +200,26 @@ class MMSK:
                 'W': self.W,
                 'Wq': self.Wq
             },
-            'Probabilidades': {
-                'P(0)': self.P0,
-                f'P({self.K})': self.PK
-            }
+            'Probabilidades': Preguicoso(self._probabilidades),
         }
 
-        if self.n is not None:
-            resultado['Probabilidades'][f'P({self.n})'] = self.probabilidade_estado_n()
+        # modelos de with_params são sempre exatos e não precisam montar a distribuição aqui
+        if self._processo is not None and self._processo.truncamento() is not None:
+            resultado['Truncamento'] = self._processo.truncamento()
 
-        if self.r is not None:
-            resultado['Probabilidades'][f'P(n > {self.r})'] = self.probabilidade_de_clientes_ser_superior()
+        return Resultado(resultado)
+
+    @staticmethod
+    def resolver_lote(lambd, mi, s, K):
+        """Versão vetorizada de resolver() para arrays de λ, μ, s e K (ver models.lote)."""
+        return lote.mmsk_lote(lambd, mi, s, K)
+
+    @staticmethod
+    def dimensionar(lambd, mi, s=None, K=None, P_bloqueio_max=None, Wq_max=None, limite=10 ** 7):
+        """Menor s (K fixo) ou menor K (s fixo) que atende às metas de bloqueio e espera."""
+        return dimensionamento.dimensionar_mmsk(lambd, mi, s, K, P_bloqueio_max, Wq_max, limite)
 
-        return resultado
+    @staticmethod
+    def resolver_no_tempo(lambd_t, mi, s, K, metodo="transiente", **opcoes):
+        """L(t), Wq(t) e bloqueio(t) para λ(t) dado por intervalo (ver models.tempo_variavel)."""
+        return tempo_variavel.resolver_no_tempo(lambd_t, mi, s, K, metodo, **opcoes)
@@ -1,6 +1,12 @@
 # models/mmsn.py
-import math
-from typing import Optional, Dict, List
+import copy
+from typing import Optional, Dict
+
+import numpy as np
+
+from .nascimento_morte import ProcessoNascimentoMorte, tolerancia_para
+from . import dimensionamento, lote
+from .resultado import DistribuicaoMapeada, Preguicoso, Resultado
 
 class MMSN:
     """
@@ -17,7 +23,8 @@ class MMSN:
         s: int,
         N: int,
         n: Optional[int] = None,
-        r: Optional[int] = None
+        r: Optional[int] = None,
+        tolerancia: Optional[float] = None
     ):
         self.lam = float(lam)
         self.mu = float(mu)
@@ -25,6 +32,8 @@ class MMSN:
         self.N = int(N)
         self.n = n
         self.r = r
+        # massa desprezável fora da janela de estados calculada (None: exato até 10⁶ estados)
+        self.tolerancia = tolerancia
 
         if self.lam <= 0 or self.mu <= 0:
             raise ValueError("λ e μ devem ser maiores que zero.")
@@ -37,7 +46,7 @@ class MMSN:
             pass
 
         # resultados
-        self.probs: List[float] = []
+        self._processo: Optional[ProcessoNascimentoMorte] = None
         self.P0: float = 0.0
         self.PN: float = 0.0
         self.L: float = 0.0
@@ -49,59 +58,83 @@ class MMSN:
 
         self._compute_all()
 
-    def _lambda_at(self, n: int) -> float:
+    def _lambda_at(self, n):
         """taxa de chegada em estado n (n clientes presentes)"""
         # chegadas vêm da população restante (N - n) com taxa base lam
         return (self.N - n) * self.lam
 
-    def _mu_at(self, n: int) -> float:
+    def _mu_at(self, n):
         """taxa total de serviço quando há n clientes"""
-        return min(n, self.s) * self.mu
+        return np.minimum(n, self.s) * self.mu
 
     def _compute_all(self):
-        # construir probs iterativamente: p0 = 1 (não normalizado), p_n = p_{n-1} * lambda_{n-1}/mu_n
-        raw = [1.0]  # raw[0] = 1
-        for n in range(1, self.N + 1):
-            lam_prev = self._lambda_at(n - 1)
-            mu_n = self._mu_at(n)
-            # se mu_n == 0 então não há saída (n=0), mas para n>=1 mu_n>0 pois min(n,s) >=1
-            if mu_n == 0:
-                raw.append(0.0)
-            else:
-                raw.append(raw[-1] * (lam_prev / mu_n))
-
-        # normaliza com soma
-        ssum = sum(raw)
-        if ssum == 0:
-            raise ValueError("Soma das probabilidades brutas é zero — verifique parâmetros.")
-        self.probs = [r / ssum for r in raw]
-        self.P0 = self.probs[0]
-        self.PN = self.probs[self.N]
-
-        # L = soma n * p_n
-        self.L = sum(n * p for n, p in enumerate(self.probs))
-
-        # Lq = soma (n - s)_+ * p_n
-        self.Lq = sum(max(n - self.s, 0) * p for n, p in enumerate(self.probs))
-
-        # taxa de chegada efetiva: lambda_eff = sum_{n=0}^{N-1} lambda_n * p_n
-        # mas lambda_n = (N - n) * lam  ==> lambda_eff = lam * sum (N - n) p_n = lam * (N - L)
-        self.lambda_eff = self.lam * (self.N - self.L)
+        processo = self.processo
+        self._medidas(P0=processo.P0, P_M=processo.P_M, L=processo.L, Lq=processo.Lq,
+                      lambda_efetivo=processo.lambda_efetivo)
+
+    def _medidas(self, P0, P_M, L, Lq, lambda_efetivo):
+        self.P0 = P0
+        self.PN = P_M
+
+        # L = soma n * p_n ; Lq = soma (n - s)_+ * p_n
+        self.L = L
+        self.Lq = Lq
+
+        # taxa de chegada efetiva: lambda_eff = sum_{n=0}^{N-1} lambda_n * p_n = lam * (N - L)
+        self.lambda_eff = lambda_efetivo
 
         # tempos médios
-        if self.lambda_eff > 0:
-            self.W = self.L / self.lambda_eff
-            self.Wq = self.Lq / self.lambda_eff
-        else:
-            self.W = 0.0
-            self.Wq = 0.0
+        self.W = self.L / self.lambda_eff if self.lambda_eff > 0 else 0.0
+        self.Wq = self.Lq / self.lambda_eff if self.lambda_eff > 0 else 0.0
 
         # uma medida de 'rho' utilizável: carga por servidor média (usada apenas informativamente)
-        # definida como rho = lam * (N - E[n]) / (s * mu) ? aqui colocamos rho instantâneo aproximado:
-        try:
-            self.rho = (self.lam * (self.N - self.L)) / (self.s * self.mu)
-        except Exception:
-            self.rho = None
+        self.rho = self.lambda_eff / (self.s * self.mu)
+
+    @property
+    def processo(self) -> ProcessoNascimentoMorte:
+        """Distribuição completa; num modelo de ``with_params`` só é montada aqui, no primeiro uso."""
+        if self._processo is None:
+            # motor nascimento-morte (razões λ_{n-1}/μ_n acumuladas em espaço log)
+            self._processo = ProcessoNascimentoMorte(self._lambda_at, self._mu_at, M=self.N, servidores=self.s,
+                                                     tolerancia=tolerancia_para(self.N, self.tolerancia))
+        return self._processo
+
+    @property
+    def probs(self) -> np.ndarray:
+        return self.processo.probs
+
+    def with_params(self, **mudancas) -> "MMSN":
+        """
+        Novo M/M/s/N resolvido com alguns parâmetros trocados (``lam``,
+        ``mu``, ``s``, ``N``, ``n``, ``r``, ``tolerancia``) em O(s + √x), x =
+        sμ/λ, em vez de O(N) (``lote.populacao_finita_fechada``): pelas
+        fontes ociosas j = N - n, os estados n ≥ s têm pesos x^j/j! que não
+        dependem de N, e só a janela de j em torno da moda é somada; os
+        estados n < s são calculados à parte. Isso vale para N, λ, μ e s.
+        n e r sozinhos: O(1). As medidas são exatas mesmo com
+        ``tolerancia``; a distribuição completa (``processo``, ``probs``) só
+        é montada, com a janela, se for consultada.
+        """
+        validos = {"lam", "mu", "s", "N", "n", "r", "tolerancia"}
+        desconhecidos = set(mudancas) - validos
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos para M/M/s/N: {', '.join(sorted(desconhecidos))}")
+        p = {nome: getattr(self, nome) for nome in validos}
+        p.update(mudancas)
+        if p["lam"] <= 0 or p["mu"] <= 0 or int(p["N"]) < 0:
+            return MMSN(**p)
+        if int(p["s"]) < 1:
+            raise ValueError("s (número de servidores) deve ser >= 1.")
+
+        novo = copy.copy(self)
+        novo.__dict__.update(p)
+        novo.lam, novo.mu, novo.s, novo.N = float(novo.lam), float(novo.mu), int(novo.s), int(novo.N)
+        chave = ("lam", "mu", "s", "N", "tolerancia")
+        if all(getattr(novo, nome) == getattr(self, nome) for nome in chave):
+            return novo  # mesma distribuição; só as consultas n e r mudam
+        novo._processo = None
+        novo._medidas(**lote.populacao_finita_fechada(novo.lam, novo.mu, novo.s, novo.N))
+        return novo
 
     # métodos de consulta
     def probabilidade_estado_n(self, n: Optional[int] = None) -> float:
@@ -109,7 +142,7 @@ class MMSN:
             n = self.n
         if n is None or n < 0 or n > self.N:
             return 0.0
-        return float(self.probs[int(n)])
+        return self.processo.probabilidade(n)
 
     def taxa_chegada_efetiva(self) -> float:
         return float(self.lambda_eff)
@@ -125,13 +158,50 @@ class MMSN:
             r = self.r
         if r is None:
             return 0.0
-        if r < 0:
-            return 1.0
-        if r >= self.N:
+        return self.processo.prob_acima(r)
+
+    def probabilidade_ate_r(self, r: Optional[int] = None) -> float:
+        if r is None:
+            r = self.r
+        if r is None:
             return 0.0
-        return float(sum(self.probs[k] for k in range(r + 1, self.N + 1)))
+        return self.processo.prob_ate(r)
+
+    def prob_cauda(self, rs):
+        """P(n > r) para um array de r, em O(1) por consulta (tabela de caudas)."""
+        return self.processo.prob_cauda(rs)
+
+    def quantil(self, q):
+        """Menor r com P(n ≤ r) ≥ q; aceita escalar ou array de q."""
+        return self.processo.quantil(q)
 
-    def resolver(self) -> Dict:
+    def cauda_espera(self, t):
+        """P(Wq > t) de um cliente admitido (FCFS); aceita escalar ou array de t."""
+        return self.processo.cauda_espera(t)
+
+    def cdf_espera(self, t):
+        """P(Wq ≤ t) de um cliente admitido; aceita escalar ou array de t."""
+        return 1 - self.processo.cauda_espera(t)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t) ≥ q entre os admitidos (p95 → q = 0.95); aceita escalar ou array de q."""
+        return self.processo.percentil_espera(q)
+
+    def _probabilidades(self) -> Dict:
+        probabilidades = {
+            "P(0)": self.P0,
+            f"P({self.N}) (bloqueio)": self.PN
+        }
+
+        # se usuário pediu P(n) particular ou r, adiciona
+        if self.n is not None:
+            probabilidades[f"P({self.n})"] = self.probabilidade_estado_n(self.n)
+        if self.r is not None:
+            probabilidades[f"P(n>{self.r})"] = self.probabilidade_acima_de_r(self.r)
+
+        return probabilidades
+
+    def resolver(self) -> Resultado:
         resultado = {
             "Modelo": "M/M/s/N",
             "Parâmetros": {
@@ -148,20 +218,23 @@ class MMSN:
                 "W": self.W,
                 "Wq": self.Wq
             },
-            "Probabilidades": {
-                "P(0)": self.P0,
-                f"P({self.N}) (bloqueio)": self.PN
-            }
+            "Probabilidades": Preguicoso(self._probabilidades),
+            # distribuição completa em "Detalhes" (não bugará a exibição principal); no modo
+            # adaptativo, só os estados da janela. As chaves "P(k)" só são criadas se iteradas.
+            "Distribuicao": Preguicoso(lambda: DistribuicaoMapeada(self.probs, self.processo.deslocamento)),
         }
+        # modelos de with_params são sempre exatos e não precisam montar a distribuição aqui
+        if self._processo is not None and self._processo.truncamento() is not None:
+            resultado["Truncamento"] = self._processo.truncamento()
 
-        # adicionar distribuição completa em "Detalhes" (não bugará a exibição principal)
-        distrib = {f"P({k})": self.probs[k] for k in range(self.N + 1)}
-        resultado["Distribuicao"] = distrib
+        return Resultado(resultado)
 
-        # se usuário pediu P(n) particular ou r, adiciona
-        if self.n is not None:
-            resultado["Probabilidades"][f"P({self.n})"] = self.probabilidade_estado_n(self.n)
-        if self.r is not None:
-            resultado["Probabilidades"][f"P(n>{self.r})"] = self.probabilidade_acima_de_r(self.r)
+    @staticmethod
+    def resolver_lote(lam, mu, s, N):
+        """Versão vetorizada de resolver() para arrays de λ, μ, s e N (ver models.lote)."""
+        return lote.mmsn_lote(lam, mu, s, N)
 
-        return resultado
+    @staticmethod
+    def dimensionar(lam, mu, N, Wq_max=None, P_espera_max=None):
+        """Menor s que atende Wq ≤ Wq_max e/ou P(esperar) ≤ P_espera_max para a população N."""
+        return dimensionamento.dimensionar_mmsn(lam, mu, N, Wq_max, P_espera_max)
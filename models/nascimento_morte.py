@@ -0,0 +1,416 @@
+# models/nascimento_morte.py
+"""
+Motor genérico de processos nascimento-morte finitos, compartilhado pelos
+modelos com espaço de estados finito (M/M/1/K, M/M/s/K, M/M/1/N, M/M/s/N e
+o truncamento do M/M/∞).
+
+Estados n = 0..M. Com λ_n a taxa de chegada no estado n e μ_n a taxa de
+serviço no estado n, a distribuição estacionária satisfaz
+p_n = p_{n-1}·λ_{n-1}/μ_n; o produto acumulado é feito em espaço log
+(soma acumulada NumPy) e reescalado pelo maior termo antes da exponencial,
+o que evita fatoriais e overflow para milhões de estados.
+
+As somas acumuladas P(n ≤ r) e P(n ≥ r) são montadas uma única vez, na
+primeira consulta, e respondem a caudas em O(1) e a quantis em O(log M)
+(``DistribuicaoEstados``, reaproveitada por quem tem a distribuição pronta,
+como o M/G/1).
+O mesmo vale para a distribuição do tempo de espera na fila de um cliente
+admitido (FCFS), usada por ``cauda_espera`` e ``percentil_espera``.
+
+Com ``tolerancia``, só uma janela de estados em torno da moda é calculada:
+quando as razões λ_{n-1}/μ_n não crescem com n (caso de M/M/s/K e
+M/M/s/N), além de um estado m à direita da moda p_{m+k} ≤ p_m·r^k com
+r = λ_m/μ_{m+1} < 1, e a massa fora da janela fica limitada por
+p_m·r/(1 - r) (idem à esquerda). A janela cresce em blocos que dobram até
+esse limite cair abaixo da tolerância, então K ou N de 10⁸ cabem em memória
+e tempo proporcionais à largura da janela (≈ √ da escala da carga), não a M.
+
+As distribuições ficam em vetores float64 contíguos: ``para_pandas`` e
+``para_arrow`` exportam sem copiar, e acima de ``ESTADOS_EM_DISCO`` estados
+(ou com ``em_disco()``) os vetores passam a ser arquivos .npy mapeados em
+memória, apagados quando a distribuição é descartada.
+"""
+import contextlib
+import math
+import os
+import tempfile
+import weakref
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from . import espera, instrumentacao
+
+Taxas = Union[Callable[[np.ndarray], np.ndarray], np.ndarray, list]
+
+# vetores com mais estados que isto vão para disco (arquivos mapeados em memória)
+ESTADOS_EM_DISCO = 1 << 24
+# diretório desses arquivos (None: o temporário do sistema)
+DIRETORIO_EM_DISCO: Optional[str] = None
+
+
+def _remover(caminho: str):
+    with contextlib.suppress(OSError):
+        os.remove(caminho)
+
+
+def _vetor(n: int, em_disco: bool) -> np.ndarray:
+    """Vetor float64 de n posições, em RAM ou num .npy temporário mapeado em memória."""
+    if not em_disco:
+        return np.empty(n)
+    fd, caminho = tempfile.mkstemp(prefix="filas-", suffix=".npy", dir=DIRETORIO_EM_DISCO)
+    os.close(fd)
+    vetor = np.lib.format.open_memmap(caminho, mode="w+", dtype=np.float64, shape=(n,))
+    weakref.finalize(vetor, _remover, caminho)
+    return vetor
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError("A exportação para Arrow requer o pacote pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _avaliar(taxas: Taxas, estados: np.ndarray) -> np.ndarray:
+    if callable(taxas):
+        valores = taxas(estados)
+    else:
+        valores = taxas
+    return np.broadcast_to(np.asarray(valores, dtype=float), estados.shape)
+
+
+class DistribuicaoEstados:
+    """
+    Distribuição discreta de probabilidades nos estados 0..M, com consultas
+    P(N = n), P(N > r), P(N ≤ r) e quantis a partir de somas acumuladas
+    montadas na primeira consulta. ``probs`` pode cobrir só a janela de
+    estados ``deslocamento``..``deslocamento + len(probs) - 1``; fora dela a
+    probabilidade é tratada como zero.
+
+    ``probs`` é um vetor float64 contíguo (protocolo de buffer e
+    ``np.asarray(distribuicao)`` sem cópia); se estiver mapeado em disco, as
+    tabelas acumuladas também ficam em disco.
+    """
+
+    def __init__(self, probs: np.ndarray, deslocamento: int = 0, M: Optional[int] = None):
+        if not (isinstance(probs, np.ndarray) and probs.dtype == np.float64 and probs.flags.c_contiguous):
+            probs = np.ascontiguousarray(probs, dtype=np.float64)
+        self.probs = probs
+        self.deslocamento = int(deslocamento)
+        self.ultimo = self.deslocamento + len(probs) - 1
+        self.M = self.ultimo if M is None else int(M)
+        self._acumulada = None
+        self._cauda = None
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.probs, dtype=dtype)
+        return np.asarray(self.probs, dtype=dtype)
+
+    def __len__(self):
+        return len(self.probs)
+
+    @property
+    def no_disco(self) -> bool:
+        return isinstance(self.probs, np.memmap)
+
+    def em_disco(self) -> "DistribuicaoEstados":
+        """Passa ``probs`` (e as tabelas montadas depois) para um arquivo mapeado em memória."""
+        if not self.no_disco:
+            vetor = _vetor(len(self.probs), True)
+            vetor[:] = self.probs
+            self.probs = vetor
+            self._acumulada = self._cauda = None
+        return self
+
+    def para_pandas(self, nome: str = "Probabilidade"):
+        """``pandas.Series`` de P(N = n) indexada pelos estados, sobre o mesmo buffer de ``probs``."""
+        import pandas as pd
+
+        indice = pd.RangeIndex(self.deslocamento, self.ultimo + 1, name="Estado")
+        return pd.Series(self.probs, index=indice, name=nome, copy=False)
+
+    def para_arrow(self):
+        """``pyarrow.Array`` float64 sobre o mesmo buffer de ``probs`` (posição i ↔ estado deslocamento + i)."""
+        pa = _pyarrow()
+        return pa.Array.from_buffers(pa.float64(), len(self.probs), [None, pa.py_buffer(self.probs)])
+
+    @property
+    def estados(self) -> np.ndarray:
+        """Estados correspondentes a ``probs``."""
+        return np.arange(self.deslocamento, self.ultimo + 1)
+
+    @property
+    def acumulada(self) -> np.ndarray:
+        """P(N ≤ r) para r na janela."""
+        if self._acumulada is None:
+            acumulada = _vetor(len(self.probs), self.no_disco)
+            np.cumsum(self.probs, out=acumulada)
+            self._acumulada = acumulada
+        return self._acumulada
+
+    @property
+    def cauda(self) -> np.ndarray:
+        """P(N ≥ r) para r na janela e mais um; somada a partir do fim para preservar caudas pequenas."""
+        if self._cauda is None:
+            cauda = _vetor(len(self.probs) + 1, self.no_disco)
+            cauda[-1] = 0.0
+            np.cumsum(self.probs[::-1], out=cauda[-2::-1])
+            self._cauda = cauda
+        return self._cauda
+
+    def probabilidade(self, n: int) -> float:
+        """P(N = n)."""
+        if n < self.deslocamento or n > self.ultimo:
+            return 0.0
+        return float(self.probs[int(n) - self.deslocamento])
+
+    def prob_acima(self, r: int) -> float:
+        """P(N > r)."""
+        if r < self.deslocamento:
+            return 1.0
+        if r >= self.ultimo:
+            return 0.0
+        return float(self.cauda[int(r) - self.deslocamento + 1])
+
+    def prob_ate(self, r: int) -> float:
+        """P(N ≤ r)."""
+        if r < self.deslocamento:
+            return 0.0
+        if r >= self.ultimo:
+            return 1.0
+        return float(self.acumulada[int(r) - self.deslocamento])
+
+    def prob_cauda(self, rs) -> np.ndarray:
+        """P(N > r) para um array de r, por indexação na tabela de caudas."""
+        rs = np.asarray(rs, dtype=np.int64)
+        return self.cauda[np.clip(rs - self.deslocamento + 1, 0, len(self.probs))]
+
+    def quantil(self, q):
+        """Menor r com P(N ≤ r) ≥ q (escalar ou array de q), por busca binária."""
+        q = np.asarray(q, dtype=float)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("q deve estar em [0, 1]")
+        r = np.minimum(np.searchsorted(self.acumulada, q, side="left"), len(self.probs) - 1) + self.deslocamento
+        return int(r) if r.ndim == 0 else r
+
+
+class ProcessoNascimentoMorte(DistribuicaoEstados):
+    """
+    Processo nascimento-morte com estados 0..M.
+
+    - ``taxas_chegada``: λ_0..λ_{M-1}, como escalar, array ou função vetorizada de n
+    - ``taxas_servico``: μ_1..μ_M, como escalar, array ou função vetorizada de n
+    - ``M``: último estado (obrigatório quando as taxas não são arrays)
+    - ``servidores``: usado em Lq = Σ (n - s)+·p_n
+    - ``tolerancia``: se informada, calcula só a janela de estados fora da
+      qual a massa é ≤ tolerância (exige razões λ_{n-1}/μ_n não crescentes);
+      o limite da massa desprezada fica em ``erro_truncamento``
+    - ``em_disco``: guarda log-pesos e probabilidades em arquivos mapeados
+      em memória (None: só acima de ``ESTADOS_EM_DISCO`` estados)
+
+    ``taxas_chegada`` e ``taxas_servico`` guardam as taxas dos estados da
+    janela (λ_n para n < M e μ_n para n ≥ 1).
+    """
+
+    def __init__(self, taxas_chegada: Taxas, taxas_servico: Taxas, M: Optional[int] = None, servidores: int = 1,
+                 tolerancia: Optional[float] = None, em_disco: Optional[bool] = None):
+        if M is None:
+            if callable(taxas_chegada) or np.ndim(taxas_chegada) == 0:
+                raise ValueError("Informe M quando as taxas são escalares ou funções")
+            M = len(taxas_chegada)
+        M = int(M)
+        self.servidores = int(servidores)
+        if M < 0:
+            raise ValueError("M deve ser >= 0")
+        if tolerancia is not None and not 0 < tolerancia < 1:
+            raise ValueError("A tolerância deve estar em (0, 1)")
+
+        if tolerancia is None or not (callable(taxas_chegada) or np.ndim(taxas_chegada) == 0):
+            inicio, log_pesos, self.erro_truncamento = 0, None, 0.0
+        else:
+            with instrumentacao.medir("estados.janela"):
+                inicio, log_pesos, self.erro_truncamento = _janela(taxas_chegada, taxas_servico, M, tolerancia)
+        fim = M if log_pesos is None else inicio + len(log_pesos) - 1
+        self._no_disco = em_disco if em_disco is not None else fim - inicio + 1 > ESTADOS_EM_DISCO
+
+        n = np.arange(inicio, fim + 1)
+        self.taxas_chegada = _avaliar(taxas_chegada, n[n < M])
+        self.taxas_servico = _avaliar(taxas_servico, n[n >= 1])
+        if np.any(self.taxas_chegada < 0) or np.any(self.taxas_servico <= 0):
+            raise ValueError("Taxas de chegada devem ser >= 0 e de serviço > 0")
+
+        if log_pesos is None:
+            with instrumentacao.medir("estados.pesos"), np.errstate(divide="ignore"):
+                razoes = np.log(self.taxas_chegada) - np.log(self.taxas_servico)
+                log_pesos = _vetor(M + 1, self._no_disco)
+                log_pesos[0] = 0.0
+                np.cumsum(razoes, out=log_pesos[1:])
+        self.log_pesos = log_pesos
+        self._inicio, self._M = inicio, M
+        with instrumentacao.medir("estados.normalizacao"):
+            self._normalizar()
+        instrumentacao.contar("estados calculados", len(self.log_pesos))
+
+    def _normalizar(self):
+        self._espera = None
+        self._percentis_espera = {}
+        # exp(log p - máx) normalizado, no próprio vetor de saída
+        probs = _vetor(len(self.log_pesos), self._no_disco)
+        np.subtract(self.log_pesos, self.log_pesos.max(), out=probs)
+        np.exp(probs, out=probs)
+        probs /= probs.sum()
+        DistribuicaoEstados.__init__(self, probs, self._inicio, self._M)
+        n = self.estados
+        self.P0 = float(self.probs[0]) if self.deslocamento == 0 else 0.0
+        self.P_M = float(self.probs[-1]) if self.ultimo == self.M else 0.0
+        self.L = float(np.dot(n, self.probs))
+        self.Lq = float(np.dot(np.maximum(n - self.servidores, 0), self.probs))
+        self.lambda_efetivo = float(np.dot(self.taxas_chegada, self.probs[:len(self.taxas_chegada)]))
+        if self.lambda_efetivo > 0:
+            self.W = self.L / self.lambda_efetivo
+            self.Wq = self.Lq / self.lambda_efetivo
+        else:
+            self.W = 0.0
+            self.Wq = 0.0
+
+    def truncamento(self) -> Optional[dict]:
+        """Resumo da janela calculada, ou None quando todos os estados foram calculados."""
+        if self.deslocamento == 0 and self.ultimo == self.M:
+            return None
+        return {
+            "estados calculados": len(self.probs),
+            "janela": (self.deslocamento, self.ultimo),
+            "erro máximo": self.erro_truncamento,
+        }
+
+    def _fases_espera(self):
+        """
+        (Q, taxa, inicio): Q[i] = P(fases > inicio + i) do número de serviços
+        que um cliente admitido espera terminar antes de ser atendido (para
+        j < inicio, P(fases > j) = Q[0]), e a taxa (constante) com que eles
+        terminam quando todos os servidores estão ocupados.
+        """
+        if self._espera is None:
+            s = self.servidores
+            # quem chega no estado n ≥ s espera n - s + 1 términos
+            primeiro = max(s, self.deslocamento)
+            vistos = self.taxas_chegada * self.probs[:len(self.taxas_chegada)]  # ∝ λ_n·p_n
+            total = vistos.sum()
+            q = vistos[primeiro - self.deslocamento:]
+            q = q / total if total > 0 else np.zeros(len(q))
+            Q = np.zeros(len(q))
+            np.cumsum(q[::-1], out=Q[::-1])
+            taxa = 1.0
+            if len(q):
+                servico = self.taxas_servico[primeiro - max(1, self.deslocamento):]
+                taxa = float(servico[0])
+                if not np.allclose(servico, taxa):
+                    raise ValueError("A distribuição de espera requer taxa de serviço constante com todos ocupados")
+            self._espera = (Q, taxa, primeiro - s)
+        return self._espera
+
+    def cauda_espera(self, t):
+        """P(Wq > t | admitido) para t escalar ou array."""
+        Q, taxa, inicio = self._fases_espera()
+        return espera.cauda_mistura_erlang(Q, taxa, t, inicio)
+
+    def percentil_espera(self, q):
+        """Menor t com P(Wq ≤ t | admitido) ≥ q; percentis escalares ficam guardados."""
+        escalar = np.ndim(q) == 0
+        if escalar and float(q) in self._percentis_espera:
+            return self._percentis_espera[float(q)]
+        Q, taxa, inicio = self._fases_espera()
+        J = inicio + len(Q)
+        escala = (J + 10 * math.sqrt(J) + 10) / taxa  # além disso a cauda é desprezível
+        t = espera.percentil(self.cauda_espera, q, escala)
+        if escalar:
+            self._percentis_espera[float(q)] = t
+        return t
+
+
+_BLOCO_JANELA = 1_024
+
+# acima deste número de estados os modelos usam a janela adaptativa por padrão
+ESTADOS_EXATOS = 1_000_000
+TOLERANCIA_PADRAO = 1e-12
+
+
+def tolerancia_para(M: int, tolerancia: Optional[float]) -> Optional[float]:
+    """A tolerância informada, ou a padrão quando M passa de ``ESTADOS_EXATOS``."""
+    if tolerancia is not None:
+        return tolerancia
+    return TOLERANCIA_PADRAO if M > ESTADOS_EXATOS else None
+
+
+def _log_razao(taxas_chegada: Taxas, taxas_servico: Taxas, n: np.ndarray) -> np.ndarray:
+    """log(λ_{n-1}/μ_n) para os estados n ≥ 1."""
+    with np.errstate(divide="ignore"):
+        return np.log(_avaliar(taxas_chegada, n - 1)) - np.log(_avaliar(taxas_servico, n))
+
+
+def _janela(taxas_chegada: Taxas, taxas_servico: Taxas, M: int, tolerancia: float):
+    """
+    (início, log-pesos da janela, limite da massa fora dela) para razões
+    λ_{n-1}/μ_n não crescentes: moda por busca binária e expansão em blocos
+    que dobram, para cada lado, até a cota geométrica da cauda ficar abaixo
+    de ``tolerancia``/2 da massa já somada.
+    """
+    def razao(n):
+        return float(_log_razao(taxas_chegada, taxas_servico, np.array([n]))[0])
+
+    # moda: último n com λ_{n-1}/μ_n ≥ 1 (0 se nenhum)
+    lo, hi = 0, M
+    while lo < hi:
+        meio = (lo + hi + 1) // 2
+        if razao(meio) >= 0:
+            lo = meio
+        else:
+            hi = meio - 1
+    moda = lo
+
+    # à direita: log p_n - log p_moda
+    blocos, ultimo, fim, passo, soma = [np.zeros(1)], 0.0, moda, _BLOCO_JANELA, 1.0
+    cauda_direita = 0.0
+    while fim < M:
+        novo_fim = min(M, fim + passo)
+        lr = _log_razao(taxas_chegada, taxas_servico, np.arange(fim + 1, novo_fim + 1))
+        if np.any(np.diff(lr) > 1e-12):
+            raise ValueError("O modo adaptativo requer razões λ_{n-1}/μ_n não crescentes")
+        bloco = ultimo + np.cumsum(lr)
+        blocos.append(bloco)
+        soma += float(np.exp(bloco).sum())
+        ultimo, fim, passo = float(bloco[-1]), novo_fim, 2 * passo
+        if fim < M:
+            r = math.exp(razao(fim + 1))
+            cauda_direita = math.exp(ultimo) * r / (1 - r) if r < 1 else math.inf
+            if cauda_direita <= tolerancia / 2 * soma:
+                break
+        else:
+            cauda_direita = 0.0
+    direita = np.concatenate(blocos)
+
+    # à esquerda: log p_{n-1} = log p_n - log(λ_{n-1}/μ_n)
+    blocos, primeiro, inicio, passo = [], 0.0, moda, _BLOCO_JANELA
+    cauda_esquerda = 0.0
+    while inicio > 0:
+        novo_inicio = max(0, inicio - passo)
+        lr = _log_razao(taxas_chegada, taxas_servico, np.arange(novo_inicio + 1, inicio + 1))
+        if np.any(np.diff(lr) > 1e-12):
+            raise ValueError("O modo adaptativo requer razões λ_{n-1}/μ_n não crescentes")
+        bloco = primeiro - np.cumsum(lr[::-1])[::-1]
+        blocos.insert(0, bloco)
+        soma += float(np.exp(bloco).sum())
+        primeiro, inicio, passo = float(bloco[0]), novo_inicio, 2 * passo
+        if inicio > 0:
+            r = math.exp(-razao(inicio))  # p_{inicio-1}/p_inicio, decrescente para a esquerda
+            cauda_esquerda = math.exp(primeiro) * r / (1 - r) if r < 1 else math.inf
+            if cauda_esquerda <= tolerancia / 2 * soma:
+                break
+        else:
+            cauda_esquerda = 0.0
+    log_pesos = np.concatenate(blocos + [direita])
+    erro = (cauda_direita + cauda_esquerda) / soma
+    return inicio, log_pesos, erro
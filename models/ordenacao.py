@@ -0,0 +1,129 @@
+# models/ordenacao.py
+"""
+Ordem de prioridade ótima para o M/G/1 com prioridades: a ordem das classes
+que minimiza o custo de espera Σ c_i·λ_i·W_i (c_i = custo por unidade de
+tempo de um cliente da classe i no sistema).
+
+- Sem preempção, a regra cμ (classes em ordem decrescente de c_i/E[S_i]) é
+  ótima e dispensa busca.
+- Com preempção, as ordens candidatas são avaliadas em lote: cada linha de
+  uma matriz de permutações vira somas acumuladas de ρ e de λE[S²] (NumPy
+  ``cumsum`` ao longo das linhas). Até ``exaustivo_ate`` classes todas as
+  permutações são testadas; acima disso, busca local por trocas de pares a
+  partir da ordem cμ, avaliando a vizinhança inteira de uma vez.
+"""
+import itertools
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+_BLOCO_PERMUTACOES = 40_320  # 8!
+
+
+class _Classes:
+    """Arrays por classe (na numeração original) usados na avaliação em lote."""
+
+    def __init__(self, modelo, pesos):
+        self.lam = np.asarray(modelo.lams, dtype=float)
+        self.ES = np.asarray(modelo.ES, dtype=float)
+        self.ES2 = np.asarray(modelo.ES2, dtype=float)
+        self.rho = self.lam * self.ES
+        self.preemptive = modelo.preemptive
+        self.c = np.ones(modelo.m) if pesos is None else np.asarray(pesos, dtype=float)
+        if self.c.shape != (modelo.m,) or np.any(self.c < 0):
+            raise ValueError("Informe um custo ≥ 0 por classe")
+
+    def tempos(self, ordens: np.ndarray) -> np.ndarray:
+        """W por posição para cada linha de ``ordens`` (k × m, maior prioridade primeiro)."""
+        rho = self.rho[ordens]
+        sigma_ate = np.cumsum(rho, axis=1)
+        sigma_antes = sigma_ate - rho
+        denominador = (1 - sigma_antes) * (1 - sigma_ate)
+        ES = self.ES[ordens]
+        if self.preemptive:
+            residual = np.cumsum((self.lam * self.ES2)[ordens], axis=1) / 2
+            return ES / (1 - sigma_antes) + residual / denominador
+        W0 = np.dot(self.lam, self.ES2) / 2
+        return W0 / denominador + ES
+
+    def custos(self, ordens: np.ndarray) -> np.ndarray:
+        return np.sum((self.c * self.lam)[ordens] * self.tempos(ordens), axis=1)
+
+    def regra_cmu(self) -> np.ndarray:
+        # desempate estável pela ordem original
+        indice = np.where(self.ES > 0, self.c / np.where(self.ES > 0, self.ES, 1), np.inf)
+        return np.argsort(-indice, kind="stable")
+
+
+def _exaustivo(classes: _Classes, m: int):
+    melhor, melhor_custo, avaliadas = None, math.inf, 0
+    permutacoes = itertools.permutations(range(m))
+    while True:
+        bloco = np.array(list(itertools.islice(permutacoes, _BLOCO_PERMUTACOES)), dtype=np.intp)
+        if not len(bloco):
+            return melhor, melhor_custo, avaliadas
+        custos = classes.custos(bloco)
+        i = int(np.argmin(custos))
+        avaliadas += len(bloco)
+        if custos[i] < melhor_custo:
+            melhor, melhor_custo = bloco[i].copy(), float(custos[i])
+
+
+def _busca_local(classes: _Classes, inicio: np.ndarray, max_iteracoes: int):
+    m = len(inicio)
+    i, j = np.triu_indices(m, k=1)
+    linhas = np.arange(len(i))
+    atual, custo_atual = inicio.copy(), float(classes.custos(inicio[None, :])[0])
+    avaliadas = 1
+    for _ in range(max_iteracoes):
+        # todas as trocas de pares da ordem atual, avaliadas de uma vez
+        vizinhos = np.repeat(atual[None, :], len(i), axis=0)
+        vizinhos[linhas, i], vizinhos[linhas, j] = atual[j], atual[i]
+        custos = classes.custos(vizinhos)
+        avaliadas += len(vizinhos)
+        k = int(np.argmin(custos))
+        if custos[k] >= custo_atual * (1 - 1e-12):
+            break
+        atual, custo_atual = vizinhos[k], float(custos[k])
+    return atual, custo_atual, avaliadas
+
+
+def otimizar_ordem(
+    classes: List[Dict[str, float]],
+    preemptive: bool = True,
+    pesos: Optional[Sequence[float]] = None,
+    exaustivo_ate: int = 8,
+    max_iteracoes: int = 1_000,
+) -> Dict:
+    """
+    Ordem das ``classes`` (índices 0-based, maior prioridade primeiro) que
+    minimiza Σ c_i·λ_i·W_i, com c_i = ``pesos[i]`` (1 por padrão). Devolve
+    também o W de cada classe nessa ordem e o custo da ordem informada.
+    """
+    from .priority_queue import MPrioridades
+
+    modelo = MPrioridades(classes, preemptive=preemptive)
+    dados = _Classes(modelo, pesos)
+    m = modelo.m
+
+    if not preemptive:
+        ordem, metodo, avaliadas = dados.regra_cmu(), "regra cμ", 1
+        custo = float(dados.custos(ordem[None, :])[0])
+    elif m <= exaustivo_ate:
+        ordem, custo, avaliadas = _exaustivo(dados, m)
+        metodo = "exaustivo"
+    else:
+        ordem, custo, avaliadas = _busca_local(dados, dados.regra_cmu(), max_iteracoes)
+        metodo = "busca local (trocas de pares a partir da regra cμ)"
+
+    W = dados.tempos(ordem[None, :])[0]
+    atual = np.arange(m)
+    return {
+        "ordem": [int(k) for k in ordem],
+        "custo": custo,
+        "W": {int(k): float(w) for k, w in zip(ordem, W)},
+        "custo da ordem informada": float(dados.custos(atual[None, :])[0]),
+        "metodo": metodo,
+        "ordens avaliadas": avaliadas,
+    }
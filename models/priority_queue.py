@@ -1,6 +1,9 @@
 # models/priority_queue.py
-import math
-from typing import List, Dict, Optional
+from typing import List, Dict
+
+import numpy as np
+
+from .resultado import Preguicoso, Resultado
 
 class MPrioridades:
     """
@@ -9,8 +12,8 @@ class MPrioridades:
       - 'lam' ou 'lambda' : taxa de chegada
       - 'mu'              : taxa de serviço
       - 'sigma2'          : variância do tempo de serviço
-    preemptive = True → preemptive-resume (fórmulas clássicas)
-    preemptive = False → non-preemptive (aprox. Kleinrock)
+    preemptive = True → preemptive-resume (fórmulas exatas)
+    preemptive = False → non-preemptive (fórmula exata de Cobham)
 
     Toda saída fica normalizada para float.
     """
@@ -62,100 +65,75 @@ class MPrioridades:
             raise ValueError(f"Sistema instável: ρ_total = {self.rho_total:.6f} ≥ 1")
 
     # -----------------------------------------------------
-    # PREEMPTIVE (EXATO)
+    # SOMAS ACUMULADAS (uma passada, O(m))
     # -----------------------------------------------------
-    def _preemptive_results(self):
-        per_class = {}
-        prefix = 0.0  # soma λ_i E[S_i²]
-
-        for i in range(self.m):
-            lam_i = self.lams[i]
-            es_i = self.ES[i]
-            es2_i = self.ES2[i]
-            rho_i = self.rhos[i]
-
-            prefix += lam_i * es2_i
-
-            sum_rho_before = sum(self.rhos[:i])
-            sum_rho_upto = sum(self.rhos[:i+1])
-
-            denom = 2.0 * (1.0 - sum_rho_before) * (1.0 - sum_rho_upto)
-            if denom <= 0:
-                raise ValueError(f"Estabilidade numérica violada na classe {i+1}.")
-
-            W_i = prefix / denom
-            Wq_i = max(W_i - es_i, 0.0)
-            L_i = lam_i * W_i
-            Lq_i = lam_i * Wq_i
-
-            per_class[i+1] = {
-                "λ": lam_i,
+    def _acumulados(self):
+        """σ_{i-1}, σ_i (carga das classes de prioridade maior/igual) e Σ_{j≤i} λ_j E[S_j²]."""
+        rhos = np.asarray(self.rhos)
+        sigma_ate = np.cumsum(rhos)
+        sigma_antes = np.concatenate(([0.0], sigma_ate[:-1]))
+        residual_ate = np.cumsum(np.asarray(self.lams) * np.asarray(self.ES2))
+        return sigma_antes, sigma_ate, residual_ate
+
+    def _por_classe(self, W, Wq):
+        lams = np.asarray(self.lams)
+        L = lams * W
+        Lq = lams * Wq
+        return {
+            i + 1: {
+                "λ": self.lams[i],
                 "μ": self.mus[i],
                 "σ²": self.sigma2s[i],
-                "ρ": rho_i,
-                "E[S]": es_i,
-                "E[S²]": es2_i,
-                "W": W_i,
-                "Wq": Wq_i,
-                "L": L_i,
-                "Lq": Lq_i,
+                "ρ": self.rhos[i],
+                "E[S]": self.ES[i],
+                "E[S²]": self.ES2[i],
+                "W": float(W[i]),
+                "Wq": float(Wq[i]),
+                "L": float(L[i]),
+                "Lq": float(Lq[i]),
             }
+            for i in range(self.m)
+        }
 
-        totals = {
+    def _totais(self, W, Wq):
+        lams = np.asarray(self.lams)
+        lambda_total = lams.sum()
+        return {
             "ρ_total": self.rho_total,
-            "L": sum(c["L"] for c in per_class.values()),
-            "Lq": sum(c["Lq"] for c in per_class.values()),
-            "W": sum(self.lams[i] * per_class[i+1]["W"] for i in range(self.m)) / sum(self.lams),
-            "Wq": sum(self.lams[i] * per_class[i+1]["Wq"] for i in range(self.m)) / sum(self.lams),
+            "L": float((lams * W).sum()),
+            "Lq": float((lams * Wq).sum()),
+            "W": float(np.dot(lams, W) / lambda_total) if lambda_total > 0 else 0.0,
+            "Wq": float(np.dot(lams, Wq) / lambda_total) if lambda_total > 0 else 0.0,
         }
 
-        return {"per_class": per_class, "totals": totals}
+    def _resultados(self, W, Wq):
+        return {"per_class": self._por_classe(W, Wq), "totals": self._totais(W, Wq)}
 
     # -----------------------------------------------------
-    # NON-PREEMPTIVE (APROX. KLEINROCK)
+    # PREEMPTIVE-RESUME (EXATO)
+    # W_i = E[S_i]/(1-σ_{i-1}) + (Σ_{j≤i} λ_j E[S_j²]/2) / ((1-σ_{i-1})(1-σ_i))
     # -----------------------------------------------------
-    def _non_preemptive_approx(self):
-        per_class = {}
-        lambda_total = sum(self.lams)
-        sum_lambda_es2 = sum(self.lams[i] * self.ES2[i] for i in range(self.m))
-
-        for i in range(self.m):
-            lam_i = self.lams[i]
-            es_i = self.ES[i]
-            es2_i = self.ES2[i]
-
-            rho_upto = sum(self.rhos[:i+1])
-            if rho_upto >= 1:
-                raise ValueError(f"Instabilidade parcial até classe {i+1}")
-
-            base = sum_lambda_es2 / (2 * (1 - self.rho_total))
-            Wq_i = base / (1 - rho_upto)
-            W_i = Wq_i + es_i
-            Lq_i = lam_i * Wq_i
-            L_i = lam_i * W_i
-
-            per_class[i+1] = {
-                "λ": lam_i,
-                "μ": self.mus[i],
-                "σ²": self.sigma2s[i],
-                "ρ": self.rhos[i],
-                "E[S]": es_i,
-                "E[S²]": es2_i,
-                "W": W_i,
-                "Wq": Wq_i,
-                "L": L_i,
-                "Lq": Lq_i,
-            }
+    def _preemptive_tempos(self):
+        sigma_antes, sigma_ate, residual_ate = self._acumulados()
+        ES = np.asarray(self.ES)
+        W = ES / (1 - sigma_antes) + (residual_ate / 2) / ((1 - sigma_antes) * (1 - sigma_ate))
+        return W, W - ES
 
-        totals = {
-            "ρ_total": self.rho_total,
-            "L": sum(c["L"] for c in per_class.values()),
-            "Lq": sum(c["Lq"] for c in per_class.values()),
-            "W": sum(self.lams[i] * per_class[i+1]["W"] for i in range(self.m)) / lambda_total,
-            "Wq": sum(self.lams[i] * per_class[i+1]["Wq"] for i in range(self.m)) / lambda_total,
-        }
+    def _preemptive_results(self):
+        return self._resultados(*self._preemptive_tempos())
+
+    # -----------------------------------------------------
+    # NON-PREEMPTIVE (EXATO, COBHAM)
+    # Wq_i = W0 / ((1-σ_{i-1})(1-σ_i)),  W0 = Σ λ_j E[S_j²] / 2
+    # -----------------------------------------------------
+    def _non_preemptive_tempos(self):
+        sigma_antes, sigma_ate, residual_ate = self._acumulados()
+        W0 = residual_ate[-1] / 2
+        Wq = W0 / ((1 - sigma_antes) * (1 - sigma_ate))
+        return Wq + np.asarray(self.ES), Wq
 
-        return {"per_class": per_class, "totals": totals, "aviso": "Aproximação non-preemptive (Kleinrock)"}
+    def _non_preemptive_results(self):
+        return self._resultados(*self._non_preemptive_tempos())
 
     # -----------------------------------------------------
     # RESOLVER (PRINCIPAL)
@@ -163,34 +141,43 @@ class MPrioridades:
     def calcular(self):
         if self.preemptive:
             return self._preemptive_results()
-        return self._non_preemptive_approx()
+        return self._non_preemptive_results()
+
+    def otimizar_ordem(self, pesos=None, exaustivo_ate: int = 8):
+        """Ordem de prioridade que minimiza Σ c_i·λ_i·W_i (ver models.ordenacao)."""
+        from .ordenacao import otimizar_ordem
+        return otimizar_ordem(self.raw_classes, self.preemptive, pesos, exaustivo_ate)
+
+    def _parametros(self):
+        return {
+            "classes": [
+                {"λ": float(self.lams[i]), "μ": float(self.mus[i]), "σ²": float(self.sigma2s[i]), "ρ": float(self.rhos[i])}
+                for i in range(self.m)
+            ],
+        }
 
     def resolver(self):
-        out = self.calcular()
+        # só os totais são montados aqui; as tabelas por classe ficam para a primeira leitura
+        W, Wq = self._preemptive_tempos() if self.preemptive else self._non_preemptive_tempos()
+        totais = self._totais(W, Wq)
 
         medidas = {
-            "L": float(out["totals"]["L"]),
-            "Lq": float(out["totals"]["Lq"]),
-            "W": float(out["totals"]["W"]),
-            "Wq": float(out["totals"]["Wq"]),
-            "ρ": float(out["totals"]["ρ_total"]),
+            "L": float(totais["L"]),
+            "Lq": float(totais["Lq"]),
+            "W": float(totais["W"]),
+            "Wq": float(totais["Wq"]),
+            "ρ": float(totais["ρ_total"]),
         }
 
         probabilidades = {
-            "P(0)": float(max(0.0, 1 - out["totals"]["ρ_total"])),
-            "ρ_total": float(out["totals"]["ρ_total"]),
+            "P(0)": float(max(0.0, 1 - totais["ρ_total"])),
+            "ρ_total": float(totais["ρ_total"]),
         }
 
-        return {
-            "Modelo": "M/G/1 com prioridades (preemptive)" if self.preemptive else "M/G/1 com prioridades (non-preemptive, approx)",
-            "Parâmetros": {
-                "classes": [
-                    {"λ": float(self.lams[i]), "μ": float(self.mus[i]), "σ²": float(self.sigma2s[i]), "ρ": float(self.rhos[i])}
-                    for i in range(self.m)
-                ],
-            },
+        return Resultado({
+            "Modelo": "M/G/1 com prioridades (preemptive)" if self.preemptive else "M/G/1 com prioridades (non-preemptive)",
+            "Parâmetros": Preguicoso(self._parametros),
             "Medidas de Efetividade": medidas,
             "Probabilidades": probabilidades,
-            "Resultados por Classe": out["per_class"],
-            **({"aviso": out.get("aviso")} if out.get("aviso") else {})
-        }
+            "Resultados por Classe": Preguicoso(lambda: self._por_classe(W, Wq)),
+        })
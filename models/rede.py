@@ -0,0 +1,259 @@
+# models/rede.py
+"""
+Rede de Jackson aberta: estações M/M/1, M/M/c, M/M/s e M/M/∞ ligadas por
+uma matriz de roteamento P (P[i, j] = probabilidade de quem sai de i ir
+para j; o que falta para 1 na linha i sai da rede) e chegadas externas
+Poisson γ.
+
+As equações de tráfego λ = γ + Pᵀλ são resolvidas pelo SciPy esparso
+quando instalado; sem ele, por ``numpy.linalg.solve`` até
+``DENSO_ATE`` estações e, acima disso, por iteração de ponto fixo
+vetorizada (cada passo é um ``bincount`` sobre as arestas, O(arestas)).
+Pelo teorema de Jackson cada estação se comporta como uma fila isolada com
+taxa λ_i, então as medidas por estação saem de um ``resolver_lote`` por
+tipo de modelo (via registro), e o resultado completo de uma estação,
+``estacao(i)``, passa pelo cache dos modelos.
+
+    from models.rede import RedeJackson
+
+    rede = RedeJackson(
+        [{"modelo": "mms", "mu": 1, "s": 4}, {"modelo": "mm1", "mu": 5}],
+        roteamento=[[0, 0.8], [0.1, 0]],
+        chegadas=[3, 0],
+    )
+    rede.W, rede.por_estacao["L"]
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from . import instrumentacao
+from .cache import cache_padrao
+from .registro import modelo
+from .resultado import Preguicoso, Resultado
+
+# modelos que servem de estação (serviço exponencial e capacidade infinita)
+MODELOS_ESTACAO = ("mm1", "mmc", "mms", "mminfinity")
+# sem SciPy, até quantas estações o sistema é resolvido denso
+DENSO_ATE = 2_000
+
+CAMPOS_ESTACAO = ("lam", "visitas", "rho", "L", "Lq", "W", "Wq", "W_ate_saida")
+
+
+def _scipy_esparso():
+    try:
+        from scipy import sparse
+        from scipy.sparse import linalg
+    except ImportError:
+        return None
+    return sparse, linalg
+
+
+def _arestas(roteamento, n: int):
+    """(origem, destino, probabilidade) de uma matriz densa, esparsa do SciPy ou de três sequências."""
+    if hasattr(roteamento, "tocoo"):
+        coo = roteamento.tocoo()
+        origem, destino, prob = coo.row, coo.col, coo.data
+    elif isinstance(roteamento, tuple) and len(roteamento) == 3:
+        origem, destino, prob = roteamento
+    else:
+        matriz = np.asarray(roteamento, dtype=float)
+        if matriz.shape != (n, n):
+            raise ValueError(f"A matriz de roteamento deve ser {n}×{n}")
+        origem, destino = np.nonzero(matriz)
+        prob = matriz[origem, destino]
+    origem = np.asarray(origem, dtype=np.int64).ravel()
+    destino = np.asarray(destino, dtype=np.int64).ravel()
+    prob = np.asarray(prob, dtype=float).ravel()
+    if not len(origem) == len(destino) == len(prob):
+        raise ValueError("origem, destino e probabilidade devem ter o mesmo tamanho")
+    if len(prob) and (min(origem.min(), destino.min()) < 0 or max(origem.max(), destino.max()) >= n):
+        raise ValueError("Índice de estação fora da rede no roteamento")
+    if np.any(~np.isfinite(prob)) or np.any(prob < 0):
+        raise ValueError("As probabilidades de roteamento devem ser >= 0")
+    saida = np.bincount(origem, weights=prob, minlength=n)
+    if np.any(saida > 1 + 1e-9):
+        raise ValueError(f"Probabilidades de roteamento somam mais que 1 na estação {int(np.argmax(saida))}")
+    return origem, destino, prob
+
+
+def resolver_trafego(origem: np.ndarray, destino: np.ndarray, prob: np.ndarray, b: np.ndarray,
+                     transposta: bool = True, tolerancia: float = 1e-12,
+                     max_iteracoes: Optional[int] = None) -> np.ndarray:
+    """
+    x = b + Pᵀx (``transposta=True``, equações de tráfego) ou x = b + Px
+    (tempo até a saída), com P dada pelas arestas. A iteração sem SciPy para
+    em ``max_iteracoes`` (padrão: max(10⁴, 10·n), o bastante para uma
+    cadeia de n estações em série). Levanta ``ValueError`` se
+    o sistema for singular ou a iteração não convergir, o que acontece
+    quando há estações de onde os clientes nunca saem da rede.
+    """
+    n = len(b)
+    linha, coluna = (destino, origem) if transposta else (origem, destino)
+    scipy = _scipy_esparso()
+    if scipy is not None:
+        sparse, linalg = scipy
+        A = sparse.identity(n, format="csc") - sparse.csc_matrix((prob, (linha, coluna)), shape=(n, n))
+        x = np.atleast_1d(linalg.spsolve(A, b))
+    elif n <= DENSO_ATE:
+        A = np.eye(n)
+        np.add.at(A, (linha, coluna), -prob)
+        try:
+            x = np.linalg.solve(A, b)
+        except np.linalg.LinAlgError:
+            raise ValueError("Equações de tráfego singulares: há estações de onde os clientes nunca saem") from None
+    else:
+        x = np.array(b, dtype=float)
+        for _ in range(max_iteracoes or max(10_000, 10 * n)):
+            novo = b + np.bincount(linha, weights=prob * x[coluna], minlength=n)
+            if np.max(np.abs(novo - x)) <= tolerancia * max(1.0, np.max(np.abs(novo))):
+                x = novo
+                break
+            x = novo
+        else:
+            raise ValueError("Equações de tráfego não convergiram: há estações de onde os clientes nunca saem?")
+    if not np.all(np.isfinite(x)) or np.any(x < -tolerancia * max(1.0, np.max(np.abs(b)))):
+        raise ValueError("Equações de tráfego sem solução válida: há estações de onde os clientes nunca saem")
+    return np.maximum(x, 0.0)
+
+
+class RedeJackson:
+    """
+    Rede de Jackson aberta.
+
+    - ``estacoes``: uma especificação por estação, com ``"modelo"`` (``mm1``,
+      ``mmc``, ``mms`` ou ``mminfinity``), os parâmetros canônicos do
+      registro sem ``lam`` (``mu``, ``s``, e opcionalmente ``n``, ``r``) e
+      um ``"nome"`` opcional
+    - ``roteamento``: matriz n×n (lista, array ou matriz esparsa do SciPy)
+      ou uma tupla ``(origem, destino, probabilidade)`` de arrays
+    - ``chegadas``: taxas externas γ_i (escalar vale para todas)
+    """
+
+    def __init__(self, estacoes: Sequence[Dict], roteamento, chegadas, cache=cache_padrao,
+                 tolerancia: float = 1e-12):
+        self.n_estacoes = len(estacoes)
+        if self.n_estacoes == 0:
+            raise ValueError("A rede precisa de pelo menos uma estação")
+        self.estacoes: List[Dict] = []
+        for i, spec in enumerate(estacoes):
+            self.estacoes.append(self._validar_estacao(i, spec))
+        self.nomes = [e.get("nome", str(i)) for i, e in enumerate(self.estacoes)]
+
+        self.chegadas = np.broadcast_to(np.asarray(chegadas, dtype=float), (self.n_estacoes,)).copy()
+        if np.any(~np.isfinite(self.chegadas)) or np.any(self.chegadas < 0):
+            raise ValueError("As chegadas externas (γ) devem ser >= 0")
+        self.gamma = float(self.chegadas.sum())
+        if self.gamma <= 0:
+            raise ValueError("A rede precisa de chegadas externas (γ > 0 em alguma estação)")
+        self.cache = cache
+        self.tolerancia = tolerancia
+        self._tempo_ate_saida: Optional[np.ndarray] = None
+        self._origem, self._destino, self._prob = _arestas(roteamento, self.n_estacoes)
+
+        with instrumentacao.medir("rede.trafego"):
+            self.lam = resolver_trafego(self._origem, self._destino, self._prob, self.chegadas,
+                                        tolerancia=tolerancia)
+        with instrumentacao.medir("rede.estacoes"):
+            self.por_estacao = self._medidas_estacoes()
+
+        instaveis = np.flatnonzero(~np.isfinite(self.por_estacao["L"]))
+        if len(instaveis):
+            lista = ", ".join(self.nomes[i] for i in instaveis[:10]) + (" ..." if len(instaveis) > 10 else "")
+            raise ValueError(f"Sistema instável nas estações {lista}: λ ≥ capacidade de serviço")
+
+        # ponta a ponta, pela lei de Little sobre a rede inteira
+        self.L = float(self.por_estacao["L"].sum())
+        self.Lq = float(self.por_estacao["Lq"].sum())
+        self.W = self.L / self.gamma
+        self.Wq = self.Lq / self.gamma
+
+    @staticmethod
+    def _validar_estacao(i: int, spec: Dict) -> Dict:
+        spec = dict(spec)
+        chave = str(spec.get("modelo", "")).lower()
+        if chave not in MODELOS_ESTACAO:
+            raise ValueError(f"Estação {i}: modelo deve ser um de {', '.join(MODELOS_ESTACAO)}")
+        if "lam" in spec:
+            raise ValueError(f"Estação {i}: λ vem das equações de tráfego, não informe 'lam'")
+        nome = spec.pop("nome", None)
+        spec.pop("modelo")
+        validos = modelo(chave).validar({**spec, "lam": 1.0})
+        del validos["lam"]
+        validos["modelo"] = chave
+        if nome is not None:
+            validos["nome"] = str(nome)
+        return validos
+
+    def _medidas_estacoes(self) -> np.ndarray:
+        """Uma linha por estação; um ``resolver_lote`` por tipo de modelo, estações sem tráfego zeradas."""
+        saida = np.zeros(self.n_estacoes, dtype=[(nome, "f8") for nome in CAMPOS_ESTACAO])
+        saida["lam"] = self.lam
+        saida["visitas"] = self.lam / self.gamma
+        chaves = np.array([e["modelo"] for e in self.estacoes])
+        mu = np.array([e["mu"] for e in self.estacoes])
+        s = np.array([e.get("s", 1) for e in self.estacoes], dtype=float)
+        saida["W"] = 1 / mu  # quem chega a uma estação sem tráfego só é atendido
+        for chave in MODELOS_ESTACAO:
+            idx = np.flatnonzero((chaves == chave) & (self.lam > 0))
+            if not len(idx):
+                continue
+            entrada = {"lam": self.lam[idx], "mu": mu[idx]}
+            if chave in ("mmc", "mms"):
+                entrada["s"] = s[idx]
+            tabela = modelo(chave).resolver_lote(entrada)
+            for campo in ("rho", "L", "Lq", "W", "Wq"):
+                saida[campo][idx] = np.where(tabela["estavel"], tabela[campo], np.inf)
+        return saida
+
+    def tempo_ate_saida(self) -> np.ndarray:
+        """Tempo médio até deixar a rede para um cliente que entra em cada estação: T = W + P·T."""
+        if self._tempo_ate_saida is None:
+            self._tempo_ate_saida = resolver_trafego(self._origem, self._destino, self._prob,
+                                                     self.por_estacao["W"], transposta=False,
+                                                     tolerancia=self.tolerancia)
+            self.por_estacao["W_ate_saida"] = self._tempo_ate_saida
+        return self._tempo_ate_saida
+
+    def estacao(self, i: int) -> Dict:
+        """``resolver()`` completo da estação ``i`` (índice ou nome) como fila isolada, via cache."""
+        if not isinstance(i, (int, np.integer)):
+            i = self.nomes.index(i)
+        spec = {k: v for k, v in self.estacoes[i].items() if k not in ("modelo", "nome")}
+        return modelo(self.estacoes[i]["modelo"]).resolver({**spec, "lam": float(self.lam[i])}, cache=self.cache)
+
+    def _por_estacao(self) -> List[Dict]:
+        self.tempo_ate_saida()
+        linhas = []
+        for i, linha in enumerate(self.por_estacao.tolist()):
+            valores = dict(zip(CAMPOS_ESTACAO, linha))
+            linhas.append({
+                "Estação": self.nomes[i],
+                "Modelo": modelo(self.estacoes[i]["modelo"]).rotulo,
+                "λ": valores["lam"],
+                "Visitas por cliente": valores["visitas"],
+                "ρ": valores["rho"],
+                "L": valores["L"],
+                "Lq": valores["Lq"],
+                "W": valores["W"],
+                "Wq": valores["Wq"],
+                "W até a saída": valores["W_ate_saida"],
+            })
+        return linhas
+
+    def resolver(self) -> Resultado:
+        return Resultado({
+            "Modelo": "Rede de Jackson",
+            "Parâmetros": {
+                "Estações": self.n_estacoes,
+                "Rotas": int(len(self._prob)),
+                "γ total": self.gamma,
+            },
+            "Medidas de Efetividade": {
+                "L": self.L,
+                "Lq": self.Lq,
+                "W": self.W,
+                "Wq": self.Wq,
+            },
+            "Resultados por Estação": Preguicoso(self._por_estacao),
+        })
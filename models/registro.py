@@ -0,0 +1,286 @@
+# models/registro.py
+"""
+Registro dos modelos: cada modelo declara uma única vez seus parâmetros
+(nome canônico, tipo, mínimo, rótulo da interface e nome no construtor), a
+validação e o resolvedor. A interface, a CLI, o serviço e os executores em
+lote despacham por consulta O(1) neste registro, e o módulo de cada modelo
+só é importado quando ele é usado pela primeira vez.
+
+Nomes canônicos: ``lam``, ``mu``, ``s``, ``K``, ``N``, ``sigma2`` (variância
+do tempo de serviço), ``n`` e ``r``; o registro os traduz para os nomes de
+cada construtor (``lambd``/``mi``, ``c``, ``sigma = √σ²`` ...).
+"""
+import importlib
+import math
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from . import instrumentacao
+from .cache import cache_padrao
+
+Minimo = Union[float, Callable[[Dict], float], None]
+
+
+class Parametro:
+    """Parâmetro de um modelo, com o nome canônico e o nome no construtor."""
+
+    __slots__ = ("nome", "rotulo", "simbolo", "tipo", "minimo", "estrito", "argumento", "converter", "obrigatorio")
+
+    def __init__(self, nome: str, rotulo: str, tipo=float, minimo: Minimo = None, estrito: bool = False,
+                 argumento: Optional[str] = None, converter: Optional[Callable] = None, obrigatorio: bool = True,
+                 simbolo: Optional[str] = None):
+        self.nome = nome
+        self.rotulo = rotulo
+        self.simbolo = simbolo or nome
+        self.tipo = tipo
+        self.minimo = minimo
+        self.estrito = estrito
+        self.argumento = argumento or nome
+        self.converter = converter
+        self.obrigatorio = obrigatorio
+
+    def limite(self, valores: Dict) -> Optional[float]:
+        """Valor mínimo, que pode depender de outros parâmetros (ex.: K ≥ s)."""
+        return self.minimo(valores) if callable(self.minimo) else self.minimo
+
+    def validar(self, valor, valores: Dict):
+        if self.tipo in (int, float) and not isinstance(valor, bool) and math.isnan(_numero(valor)):
+            raise ValueError(f"{self.rotulo} deve ser numérico")
+        if self.tipo is int:
+            if isinstance(valor, bool) or float(valor) != int(float(valor)):
+                raise ValueError(f"{self.rotulo} deve ser um inteiro")
+            valor = int(float(valor))
+        elif self.tipo is float:
+            valor = float(valor)
+            if math.isnan(valor):
+                raise ValueError(f"{self.rotulo} deve ser numérico")
+        elif self.tipo is bool:
+            valor = bool(valor)
+        elif not isinstance(valor, self.tipo):
+            raise ValueError(f"{self.rotulo}: tipo inválido ({type(valor).__name__})")
+        minimo = self.limite(valores)
+        if minimo is not None and (valor <= minimo if self.estrito else valor < minimo):
+            relacao = ">" if self.estrito else "≥"
+            raise ValueError(f"{self.rotulo} deve ser {relacao} {minimo:g}")
+        return valor
+
+
+def _numero(valor) -> float:
+    """float(valor), ou NaN se não for numérico (a linha é marcada inválida)."""
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _raiz(valor):
+    """√σ²: o construtor do M/G/1 recebe o desvio padrão (vale para escalares e arrays)."""
+    return valor ** 0.5
+
+
+def _lam(argumento="lam"):
+    return Parametro("lam", "Taxa de chegada (λ)", simbolo="λ", minimo=0, estrito=True, argumento=argumento)
+
+
+def _mu(argumento="mu", rotulo="Taxa de serviço (μ)"):
+    return Parametro("mu", rotulo, simbolo="μ", minimo=0, estrito=True, argumento=argumento)
+
+
+def _opcional(nome, rotulo):
+    return Parametro(nome, rotulo, tipo=int, minimo=0, obrigatorio=False)
+
+
+class Modelo:
+    """Entrada do registro; a classe do modelo só é importada no primeiro acesso."""
+
+    __slots__ = ("chave", "rotulo", "modulo", "nome_classe", "parametros", "_classe", "_por_nome")
+
+    def __init__(self, chave: str, rotulo: str, modulo: str, nome_classe: str, parametros: Tuple[Parametro, ...]):
+        self.chave = chave
+        self.rotulo = rotulo
+        self.modulo = modulo
+        self.nome_classe = nome_classe
+        self.parametros = parametros
+        self._por_nome = {p.nome: p for p in parametros}
+        self._classe = None
+
+    @property
+    def classe(self):
+        if self._classe is None:
+            self._classe = getattr(importlib.import_module(self.modulo, __package__), self.nome_classe)
+        return self._classe
+
+    @property
+    def obrigatorios(self) -> Tuple[str, ...]:
+        return tuple(p.nome for p in self.parametros if p.obrigatorio)
+
+    @property
+    def vetorizavel(self) -> bool:
+        return self.chave != "mprioridades"
+
+    def validar(self, valores: Dict) -> Dict:
+        """Confere os parâmetros (nomes canônicos) e devolve os valores convertidos."""
+        desconhecidos = set(valores) - set(self._por_nome)
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos para {self.rotulo}: {', '.join(sorted(desconhecidos))}")
+        validos = {}
+        for p in self.parametros:
+            valor = valores.get(p.nome)
+            if valor is None:
+                if p.obrigatorio:
+                    raise ValueError(f"Parâmetro obrigatório ausente para {self.rotulo}: {p.nome}")
+                continue
+            validos[p.nome] = p.validar(valor, validos)
+        return validos
+
+    def invalidos(self, colunas: Dict):
+        """
+        Índices das linhas que ``validar`` recusaria, para colunas (listas ou
+        arrays, uma posição por cenário) com os nomes canônicos: tipos e
+        mínimos conferidos de uma vez por coluna. Parâmetros desconhecidos ou
+        obrigatórios ausentes levantam ``ValueError`` como em ``validar``.
+        """
+        import numpy as np
+
+        desconhecidos = set(colunas) - set(self._por_nome)
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos para {self.rotulo}: {', '.join(sorted(desconhecidos))}")
+        tamanho = len(next(iter(colunas.values()))) if colunas else 0
+        ruins = np.zeros(tamanho, dtype=bool)
+        valores = {}
+        for p in self.parametros:
+            if p.nome not in colunas:
+                if p.obrigatorio:
+                    raise ValueError(f"Parâmetro obrigatório ausente para {self.rotulo}: {p.nome}")
+                continue
+            coluna = list(colunas[p.nome])
+            ausente = np.array([v is None for v in coluna])
+            if p.tipo not in (int, float):
+                for i, v in enumerate(coluna):
+                    if v is not None:
+                        try:
+                            p.validar(v, {})
+                        except (TypeError, ValueError):
+                            ruins[i] = True
+                ruins |= ausente & p.obrigatorio
+                continue
+            try:
+                v = np.array([np.nan if x is None else x for x in coluna], dtype=float)
+            except (TypeError, ValueError):
+                v = np.array([_numero(x) for x in coluna])
+            ruim = np.isnan(v) | np.array([isinstance(x, bool) for x in coluna])
+            if p.tipo is int:
+                ruim |= ~np.isfinite(v) | (v != np.floor(v))
+            minimo = p.limite(valores)
+            if minimo is not None:
+                with np.errstate(invalid="ignore"):
+                    ruim |= (v <= minimo) if p.estrito else (v < minimo)
+            ruins |= ruim & (p.obrigatorio | ~ausente)
+            valores[p.nome] = v
+        return np.flatnonzero(ruins)
+
+    def argumentos(self, valores: Dict) -> Dict:
+        """Argumentos do construtor a partir dos nomes canônicos."""
+        with instrumentacao.medir("validacao"):
+            return {
+                self._por_nome[nome].argumento: (self._por_nome[nome].converter or (lambda v: v))(valor)
+                for nome, valor in self.validar(valores).items()
+            }
+
+    def instanciar(self, valores: Dict, cache=None):
+        """Instância do modelo; com ``cache``, a instância compartilhada do cache (não altere)."""
+        if cache is None:
+            return self.classe(**self.argumentos(valores))
+        return cache.modelo(self.classe, **self.argumentos(valores))
+
+    def resolver(self, valores: Dict, cache=cache_padrao):
+        """
+        ``Resultado`` preguiçoso de ``resolver()``: o do cache (compartilhado,
+        não altere; ``to_dict()`` copia) ou, com ``cache=None``, um novo.
+        """
+        kwargs = self.argumentos(valores)
+        if cache is None:
+            with instrumentacao.medir(f"{self.nome_classe}.construcao"):
+                instancia = self.classe(**kwargs)
+            with instrumentacao.medir(f"{self.nome_classe}.resultado"):
+                return instancia.resolver()
+        return cache.resolver(self.classe, **kwargs)
+
+    def resolver_lote(self, valores: Dict):
+        """``resolver_lote`` com arrays (ou escalares) nos nomes canônicos; sem validação por linha."""
+        if not self.vetorizavel:
+            raise ValueError(f"{self.rotulo} não tem versão vetorizada")
+        import numpy as np
+
+        args = []
+        for p in self.parametros:
+            if not p.obrigatorio:
+                continue
+            if p.nome not in valores:
+                raise ValueError(f"Parâmetro obrigatório ausente para {self.rotulo}: {p.nome}")
+            valor = np.asarray(valores[p.nome], dtype=float)
+            args.append(p.converter(valor) if p.converter else valor)
+        with instrumentacao.medir(f"{self.chave}.lote"):
+            return self.classe.resolver_lote(*args)
+
+    def __repr__(self):
+        return f"Modelo({self.chave!r}, {self.rotulo!r})"
+
+
+def _registrar(*modelos: Modelo) -> Dict[str, Modelo]:
+    return {m.chave: m for m in modelos}
+
+
+REGISTRO: Dict[str, Modelo] = _registrar(
+    Modelo("mm1", "M/M/1", ".mm1", "MM1", (
+        _lam(), _mu(), _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mminfinity", "M/M/∞", ".mmInfinity", "MMInfinity", (
+        _lam(), _mu(), _opcional("n", "n"))),
+    Modelo("mmc", "M/M/C", ".mmc", "MMC", (
+        _lam(), _mu(),
+        Parametro("s", "Número de servidores (c)", simbolo="c", tipo=int, minimo=1, argumento="c"),
+        _opcional("n", "n"))),
+    Modelo("mms", "M/M/s>1", ".mms", "MMS", (
+        _lam("lambd"), _mu("mi"),
+        Parametro("s", "Número de servidores (s)", tipo=int, minimo=2),
+        _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mm1k", "M/M/1/K", ".mm1k", "MM1K", (
+        _lam(), _mu(),
+        Parametro("K", "Capacidade do sistema (K)", tipo=int, minimo=1),
+        _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mmsk", "M/M/s>1/K", ".mmsk", "MMSK", (
+        _lam("lambd"), _mu("mi"),
+        Parametro("s", "Número de servidores (s)", tipo=int, minimo=2),
+        Parametro("K", "Capacidade do sistema (K)", tipo=int, minimo=lambda v: v["s"] + 1),
+        _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mm1n", "M/M/1/N", ".mm1n", "MM1N", (
+        _lam(), _mu(),
+        Parametro("N", "Tamanho da população (N)", tipo=int, minimo=1),
+        _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mmsn", "M/M/s>1/N", ".mmsn", "MMSN", (
+        _lam(), _mu(),
+        Parametro("s", "Número de servidores (s)", tipo=int, minimo=2),
+        Parametro("N", "Tamanho da população (N)", tipo=int, minimo=lambda v: v["s"]),
+        _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mg1", "M/G/1", ".mg1", "MG1", (
+        _lam(), _mu(rotulo="Taxa média de serviço (μ)"),
+        Parametro("sigma2", "Variância do tempo de serviço (σ²)", simbolo="σ²", minimo=0, argumento="sigma", converter=_raiz),
+        Parametro("distribuicao", "Distribuição do serviço", tipo=str, obrigatorio=False),
+        _opcional("n", "n"), _opcional("r", "r"))),
+    Modelo("mprioridades", "Modelo com prioridades (M/G/1)", ".priority_queue", "MPrioridades", (
+        Parametro("classes", "Classes de prioridade", tipo=list),
+        Parametro("preemptive", "Preemptiva", tipo=bool, obrigatorio=False))),
+)
+
+_POR_ROTULO = {m.rotulo: m for m in REGISTRO.values()}
+
+
+def modelo(nome: str) -> Modelo:
+    """Entrada do registro pela chave (``"mms"``) ou pelo rótulo da interface (``"M/M/s>1"``)."""
+    encontrado = REGISTRO.get(nome.lower()) or _POR_ROTULO.get(nome)
+    if encontrado is None:
+        raise KeyError(f"Modelo desconhecido: {nome}")
+    return encontrado
+
+
+def rotulos() -> Tuple[str, ...]:
+    return tuple(_POR_ROTULO)
@@ -0,0 +1,143 @@
+# models/resultado.py
+"""
+Resultado de ``resolver()``: um mapeamento somente leitura com as mesmas
+seções de antes ("Modelo", "Parâmetros", "Medidas de Efetividade",
+"Probabilidades", ...), mas com as seções caras calculadas só na primeira
+leitura. Quem só quer W (``res.W`` ou ``res["Medidas de Efetividade"]["W"]``)
+não paga pela distribuição de estados, pelas caudas de espera nem pelas
+tabelas por classe.
+
+``to_dict()`` devolve os dicts aninhados no formato de sempre (é o que o
+serviço JSON e o cache em disco gravam), e o pickle/deepcopy de um
+``Resultado`` passa pelo mesmo caminho.
+"""
+from collections.abc import Mapping
+from typing import Callable, Dict
+
+
+class Preguicoso:
+    """Seção calculada por ``funcao()`` na primeira leitura."""
+
+    __slots__ = ("funcao",)
+
+    def __init__(self, funcao: Callable[[], object]):
+        self.funcao = funcao
+
+
+def _materializar(valor):
+    if isinstance(valor, DistribuicaoMapeada):
+        return valor.to_dict()
+    if isinstance(valor, Mapping):
+        return {k: _materializar(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_materializar(v) for v in valor]
+    return valor
+
+
+class Resultado(Mapping):
+    """Seções de ``resolver()``, na ordem de inserção; ``Preguicoso`` é avaliado sob demanda."""
+
+    __slots__ = ("_secoes",)
+
+    def __init__(self, secoes: Dict):
+        self._secoes = dict(secoes)
+
+    def __getitem__(self, chave):
+        valor = self._secoes[chave]
+        if isinstance(valor, Preguicoso):
+            valor = self._secoes[chave] = valor.funcao()
+        return valor
+
+    def __iter__(self):
+        return iter(self._secoes)
+
+    def __len__(self):
+        return len(self._secoes)
+
+    def __contains__(self, chave):
+        return chave in self._secoes
+
+    @property
+    def modelo(self) -> str:
+        return self._secoes.get("Modelo")
+
+    @property
+    def parametros(self) -> Dict:
+        return self.get("Parâmetros", {})
+
+    @property
+    def medidas(self) -> Dict:
+        return self.get("Medidas de Efetividade", {})
+
+    @property
+    def probabilidades(self) -> Dict:
+        return self.get("Probabilidades", {})
+
+    @property
+    def L(self) -> float:
+        return self.medidas.get("L")
+
+    @property
+    def Lq(self) -> float:
+        return self.medidas.get("Lq")
+
+    @property
+    def W(self) -> float:
+        return self.medidas.get("W")
+
+    @property
+    def Wq(self) -> float:
+        return self.medidas.get("Wq")
+
+    def to_dict(self, omitir=()) -> Dict:
+        """Dicts (e listas) aninhados novos, com todas as seções calculadas exceto as de ``omitir``."""
+        if not omitir:
+            return _materializar(self)
+        return {k: _materializar(self[k]) for k in self._secoes if k not in omitir}
+
+    def __reduce__(self):
+        return Resultado, (self.to_dict(),)
+
+    def __repr__(self):
+        calculadas = [k if not isinstance(v, Preguicoso) else f"{k} (pendente)" for k, v in self._secoes.items()]
+        return f"Resultado({self.modelo!r}, seções={calculadas})"
+
+
+class DistribuicaoMapeada(Mapping):
+    """
+    Visão {"P(n)": p_n} de um array de probabilidades nos estados
+    ``deslocamento``..: as chaves só viram strings quando iteradas, e
+    ``["P(n)"]`` é uma indexação no array.
+    """
+
+    __slots__ = ("probs", "deslocamento")
+
+    def __init__(self, probs, deslocamento: int = 0):
+        self.probs = probs
+        self.deslocamento = int(deslocamento)
+
+    def __getitem__(self, chave):
+        if not (isinstance(chave, str) and chave.startswith("P(") and chave.endswith(")")):
+            raise KeyError(chave)
+        try:
+            i = int(chave[2:-1]) - self.deslocamento
+        except ValueError:
+            raise KeyError(chave) from None
+        if not 0 <= i < len(self.probs):
+            raise KeyError(chave)
+        return float(self.probs[i])
+
+    def __iter__(self):
+        return (f"P({k})" for k in range(self.deslocamento, self.deslocamento + len(self.probs)))
+
+    def __len__(self):
+        return len(self.probs)
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(zip(self, self.probs.tolist()))
+
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
+
+    def __repr__(self):
+        return f"DistribuicaoMapeada({len(self.probs)} estados a partir de {self.deslocamento})"
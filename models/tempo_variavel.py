@@ -0,0 +1,248 @@
+# models/tempo_variavel.py
+"""
+Filas M/M/s e M/M/s/K com taxa de chegada variando no tempo. λ(t) é um
+array de taxas constantes por intervalo de duração ``passo`` (por exemplo,
+λ por minuto ao longo de uma semana, com μ na mesma unidade de tempo).
+
+- ``psa``: aproximação estacionária ponto a ponto, cada intervalo resolvido
+  como se λ fosse constante (uma única chamada vetorizada de ``models.lote``).
+- ``sipp``: períodos estacionários independentes; λ é resumido por período
+  de ``periodo`` intervalos (média ou máximo) e cada período resolvido uma vez.
+- ``transiente``: solução das equações de Kolmogorov do processo
+  nascimento-morte por uniformização, exp(Q·passo) aplicado ao vetor de
+  probabilidades em cada intervalo: p·Σ_k Poisson(k; Λ·passo)·P^k com
+  P = I + Q/Λ tridiagonal, cada termo calculado com operações NumPy sobre
+  o vetor inteiro e a soma ponderada feita num único produto matricial.
+- ``fluido``: modelo fluido determinístico x' = λ(t) - μ·min(x, s), limitado
+  a K, resolvido de forma exata dentro de cada intervalo.
+
+Todas devolvem um dict de arrays com um valor por intervalo, medido no fim
+do intervalo: ``t``, ``L``, ``Lq``, ``Wq`` (espera média de quem chega e é
+admitido) e ``P_bloqueio``; o transiente informa também ``P_espera``,
+``massa_no_limite`` (probabilidade no último estado da truncagem do M/M/s)
+e ``p_final``, a distribuição no fim do horizonte (que serve de ``p0`` para
+continuar a série).
+"""
+import math
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from . import lote
+from .nascimento_morte import ProcessoNascimentoMorte
+
+Serie = Dict[str, np.ndarray]
+
+
+def _validar(lam, mu, s, K, passo) -> np.ndarray:
+    lam = np.asarray(lam, dtype=float)
+    if lam.ndim != 1 or len(lam) == 0:
+        raise ValueError("λ(t) deve ser um array com uma taxa por intervalo")
+    if np.any(~np.isfinite(lam)) or np.any(lam < 0):
+        raise ValueError("As taxas de chegada devem ser finitas e >= 0")
+    if mu <= 0 or passo <= 0:
+        raise ValueError("μ e o passo devem ser > 0")
+    if s < 1 or int(s) != s:
+        raise ValueError("s deve ser um inteiro >= 1")
+    if K is not None and (K < s or int(K) != K):
+        raise ValueError("K deve ser um inteiro >= s")
+    return lam
+
+
+def _tempos(n: int, passo: float) -> np.ndarray:
+    return passo * np.arange(1, n + 1)
+
+
+# ------------------------- aproximações estacionárias -------------------------
+def _estacionario(lam: np.ndarray, mu: float, s: int, K: Optional[int]) -> Serie:
+    """Medidas estacionárias para cada λ, com λ = 0 tratado como sistema vazio."""
+    positivo = np.where(lam > 0, lam, 1.0)
+    tabela = lote.mmc_lote(positivo, mu, s) if K is None else lote.mmsk_lote(positivo, mu, s, K)
+    vazio = lam == 0
+    serie = {campo: np.where(vazio, 0.0, tabela[campo]) for campo in ("L", "Lq", "Wq", "P_bloqueio")}
+    serie["estavel"] = vazio | tabela["estavel"]
+    return serie
+
+
+def psa(lam, mu: float, s: int, K: Optional[int] = None, passo: float = 1.0) -> Serie:
+    """
+    Aproximação estacionária ponto a ponto (PSA). Intervalos com λ ≥ sμ no
+    M/M/s ficam com ``estavel = False`` e medidas NaN.
+    """
+    lam = _validar(lam, mu, s, K, passo)
+    return {"t": _tempos(len(lam), passo), **_estacionario(lam, mu, s, K)}
+
+
+def sipp(lam, mu: float, s: int, K: Optional[int] = None, passo: float = 1.0, periodo: int = 60,
+         regra: str = "media") -> Serie:
+    """
+    Períodos estacionários independentes (SIPP): λ de cada período de
+    ``periodo`` intervalos resumido pela ``regra`` ("media" ou "maximo").
+    """
+    lam = _validar(lam, mu, s, K, passo)
+    if periodo < 1:
+        raise ValueError("O período deve ter ao menos um intervalo")
+    if regra not in ("media", "maximo"):
+        raise ValueError("A regra do SIPP deve ser 'media' ou 'maximo'")
+    inicios = np.arange(0, len(lam), periodo)
+    if regra == "media":
+        resumo = np.add.reduceat(lam, inicios) / np.diff(np.append(inicios, len(lam)))
+    else:
+        resumo = np.maximum.reduceat(lam, inicios)
+    por_periodo = _estacionario(resumo, mu, s, K)
+    repeticoes = np.diff(np.append(inicios, len(lam)))
+    serie = {campo: np.repeat(valores, repeticoes) for campo, valores in por_periodo.items()}
+    return {"t": _tempos(len(lam), passo), **serie}
+
+
+# ------------------------------- transiente -------------------------------
+def _capacidade(lam: np.ndarray, mu: float, s: int, passo: float) -> int:
+    """
+    Truncagem do M/M/s: s + maior fila fluida (Lindley sobre o excesso
+    λ - sμ) + cauda geométrica estacionária até 10⁻¹² na maior carga estável.
+    """
+    S = np.cumsum((lam - s * mu) * passo)
+    fila_fluida = float(np.max(S - np.minimum(np.minimum.accumulate(S), 0.0)))
+    rho = min(float(lam.max()) / (s * mu), 0.999)
+    cauda = math.ceil(12 * math.log(10) / -math.log(rho)) if rho > 0 else 0
+    return s + math.ceil(fila_fluida) + cauda + 10 * math.ceil(math.sqrt(s))
+
+
+def _pesos_poisson(x: float, tolerancia: float) -> np.ndarray:
+    """Poisson(k; x) para k = 0..k_max, com massa truncada ≤ ``tolerancia``."""
+    k_max = max(1, math.ceil(x + 8 * math.sqrt(x) + 10))
+    k = np.arange(k_max + 1)
+    log_fatorial = np.concatenate(([0.0], np.cumsum(np.log(k[1:]))))
+    pesos = np.exp(k * math.log(x) - x - log_fatorial) if x > 0 else (k == 0).astype(float)
+    acumulado = np.cumsum(pesos)
+    corte = int(np.searchsorted(acumulado, 1 - tolerancia)) + 1
+    return pesos[:min(corte, len(pesos))]
+
+
+def transiente(lam, mu: float, s: int, K: Optional[int] = None, passo: float = 1.0,
+               p0: Union[None, str, np.ndarray] = None, capacidade: Optional[int] = None,
+               tolerancia: float = 1e-10) -> Serie:
+    """
+    Distribuição transiente p(t) por uniformização, intervalo a intervalo.
+
+    - ``p0``: None (sistema vazio), "estacionario" (equilíbrio com o λ do
+      primeiro intervalo) ou um array de probabilidades nos estados 0..M
+    - ``capacidade``: último estado do M/M/s truncado (padrão: ver ``_capacidade``)
+    - ``tolerancia``: massa de Poisson desprezada em cada intervalo
+    """
+    lam = _validar(lam, mu, s, K, passo)
+    M = int(K) if K is not None else int(capacidade or _capacidade(lam, mu, s, passo))
+    n = np.arange(M + 1)
+    servico = np.minimum(n, s) * mu        # μ_n
+    tem_chegada = (n < M).astype(float)    # no estado M as chegadas são bloqueadas
+
+    if p0 is None:
+        p = np.zeros(M + 1)
+        p[0] = 1.0
+    elif isinstance(p0, str):
+        if p0 != "estacionario":
+            raise ValueError("p0 deve ser None, 'estacionario' ou um array")
+        p = ProcessoNascimentoMorte(lam[0], servico[1:], M=M, servidores=s).probs.copy() if lam[0] > 0 \
+            else (n == 0).astype(float)
+    else:
+        p = np.array(p0, dtype=float)
+        if p.shape != (M + 1,) or np.any(p < 0) or not math.isclose(p.sum(), 1.0):
+            raise ValueError(f"p0 deve ter {M + 1} probabilidades somando 1")
+
+    fila = np.maximum(n - s, 0)
+    termos_espera = np.where((n >= s) & (n < M), (n - s + 1) / (s * mu), 0.0)
+    espera = ((n >= s) & (n < M)).astype(float)
+    admitidos = tem_chegada
+
+    saida = {campo: np.empty(len(lam)) for campo in ("L", "Lq", "Wq", "P_espera", "P_bloqueio", "massa_no_limite")}
+    V = np.zeros((1, M + 3))               # termos p·P^k com uma borda de zeros de cada lado
+    b = np.empty(M + 1)
+    cache_pesos = {}
+    for i, l in enumerate(lam):
+        Lambda = l + servico[-1]            # taxa de uniformização do intervalo
+        chave = round(Lambda * passo, 12)
+        pesos = cache_pesos.get(chave)
+        if pesos is None:
+            pesos = cache_pesos[chave] = _pesos_poisson(Lambda * passo, tolerancia)
+        if len(pesos) > len(V):
+            V = np.zeros((len(pesos), M + 3))
+        # P = I + Q/Λ: diagonal, subida n → n+1 e descida n → n-1
+        diagonal = 1 - (l * tem_chegada + servico) / Lambda
+        sobe = np.concatenate(([0.0], l * tem_chegada[:-1] / Lambda))   # chega em n vindo de n-1
+        desce = np.concatenate((servico[1:] / Lambda, [0.0]))            # chega em n vindo de n+1
+        V[0, 1:-1] = p
+        for k in range(1, len(pesos)):
+            anterior, atual = V[k - 1], V[k, 1:-1]
+            np.multiply(anterior[1:-1], diagonal, out=atual)
+            np.multiply(anterior[:-2], sobe, out=b)
+            atual += b
+            np.multiply(anterior[2:], desce, out=b)
+            atual += b
+        p = pesos @ V[:len(pesos), 1:-1]
+        p /= p.sum()
+
+        massa_admitida = float(np.dot(admitidos, p))
+        saida["L"][i] = np.dot(n, p)
+        saida["Lq"][i] = np.dot(fila, p)
+        saida["Wq"][i] = np.dot(termos_espera, p) / massa_admitida if massa_admitida > 0 else 0.0
+        saida["P_espera"][i] = np.dot(espera, p) / massa_admitida if massa_admitida > 0 else 0.0
+        saida["P_bloqueio"][i] = p[M] if K is not None else 0.0
+        saida["massa_no_limite"][i] = p[M] if K is None else 0.0
+    saida["t"] = _tempos(len(lam), passo)
+    saida["p_final"] = p
+    return saida
+
+
+# --------------------------------- fluido ---------------------------------
+def fluido(lam, mu: float, s: int, K: Optional[int] = None, passo: float = 1.0, x0: float = 0.0) -> Serie:
+    """
+    Modelo fluido x' = λ - μ·min(x, s) com x ≤ K: abaixo de s, x se aproxima
+    exponencialmente de λ/μ; acima, varia linearmente com λ - sμ; o excesso
+    que chega com x = K é bloqueado.
+    """
+    lam = _validar(lam, mu, s, K, passo)
+    capacidade = math.inf if K is None else float(K)
+    x = float(x0)
+    saida = {campo: np.empty(len(lam)) for campo in ("L", "Lq", "Wq", "P_bloqueio")}
+    for i, l in enumerate(lam):
+        tempo, bloqueado = passo, 0.0
+        while tempo > 0:
+            if x < s or (x <= s and l < s * mu):
+                alvo = l / mu
+                if alvo > s:
+                    ate_s = math.log((alvo - x) / (alvo - s)) / mu
+                    if ate_s < tempo:
+                        x, tempo = float(s), tempo - ate_s
+                        continue
+                x = alvo + (x - alvo) * math.exp(-mu * tempo)
+                tempo = 0.0
+            else:
+                deriva = l - s * mu
+                if deriva < 0:
+                    ate_s = (x - s) / -deriva
+                    if ate_s < tempo:
+                        x, tempo = float(s), tempo - ate_s
+                        continue
+                elif deriva > 0 and x + deriva * tempo > capacidade:
+                    bloqueado += deriva * tempo - (capacidade - x)
+                    x, tempo = capacidade, 0.0
+                    continue
+                x += deriva * tempo
+                tempo = 0.0
+        saida["L"][i] = x
+        saida["Lq"][i] = max(x - s, 0.0)
+        saida["Wq"][i] = max(x - s, 0.0) / (s * mu)
+        saida["P_bloqueio"][i] = bloqueado / (l * passo) if l > 0 else 0.0
+    saida["t"] = _tempos(len(lam), passo)
+    return saida
+
+
+METODOS = {"psa": psa, "sipp": sipp, "transiente": transiente, "fluido": fluido}
+
+
+def resolver_no_tempo(lam, mu: float, s: int, K: Optional[int] = None, metodo: str = "transiente",
+                      **opcoes) -> Serie:
+    """Despacha para ``psa``, ``sipp``, ``transiente`` ou ``fluido``."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo} (use {', '.join(METODOS)})")
+    return METODOS[metodo](lam, mu, s, K, **opcoes)
@@ -0,0 +1,217 @@
+# servico.py
+"""
+Serviço HTTP/JSON (ASGI) com os modelos do pacote ``models``, sem Streamlit.
+
+Rotas:
+  GET  /saude                      → {"status": "ok"}
+  GET  /modelos                    → nomes dos modelos disponíveis
+  POST /modelos/<nome>             → resolver() com os parâmetros do corpo
+                                     (sem "Distribuicao"; ?distribuicao=1 inclui)
+  POST /modelos/<nome>/lote        → {"cenarios": [{...}, ...]} resolvidos de uma vez
+  GET  /cache                      → estatísticas do cache compartilhado
+
+Os modelos e seus parâmetros vêm do registro (``models.registro``), com os
+nomes canônicos (ex.: ``{"lam": 4, "mu": 1, "s": 5}`` para ``mms``, e
+``sigma2`` para a variância do M/G/1). Resoluções simples rodam no
+próprio laço de eventos; modelos pesados (muitos estados) e lotes grandes vão
+para um pool de threads, que compartilha o ``cache_padrao`` do pacote.
+
+Uso: uvicorn servico:app   (ou python servico.py)
+
+Rode um único processo: o cache e o pool de threads são por processo, e com
+``--workers`` cada processo teria os seus, dividindo os acertos do cache. O
+paralelismo dos modelos pesados vem do pool, dimensionado por
+``FILAS_WORKERS`` (padrão: número de CPUs).
+"""
+import asyncio
+import json
+import math
+import os
+from collections.abc import Mapping
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from models import REGISTRO, cache_padrao
+
+# acima destes tamanhos a resolução sai do laço de eventos
+ESTADOS_PESADOS = 10_000
+CENARIOS_PESADOS = 256
+
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=int(os.environ.get("FILAS_WORKERS", os.cpu_count() or 4)))
+    return _pool
+
+
+class ErroRequisicao(Exception):
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _sem_nan(valor):
+    """Troca NaN/±inf por None, arrays NumPy por listas e ``Resultado`` por dicts (JSON estrito)."""
+    if isinstance(valor, float):
+        return valor if math.isfinite(valor) else None
+    if isinstance(valor, Mapping):
+        return {k: _sem_nan(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_sem_nan(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        return _sem_nan(valor.tolist())
+    if isinstance(valor, np.generic):
+        return _sem_nan(valor.item())
+    return valor
+
+
+def _codificar(dados) -> bytes:
+    try:
+        return json.dumps(dados, ensure_ascii=False, allow_nan=False).encode()
+    except (TypeError, ValueError):
+        return json.dumps(_sem_nan(dados), ensure_ascii=False, allow_nan=False).encode()
+
+
+def _pesado(parametros: Dict) -> bool:
+    """Decide pelos parâmetros já validados (e convertidos) por ``espec.validar``."""
+    estados = max((parametros.get(k) or 0 for k in ("K", "N", "s")), default=0)
+    classes = parametros.get("classes")
+    return estados >= ESTADOS_PESADOS or (isinstance(classes, list) and len(classes) >= 100)
+
+
+def resolver(espec, parametros: Dict, distribuicao: bool = False) -> Dict:
+    """Resultado do cache em dicts; a distribuição de estados (uma chave por estado) só se pedida."""
+    return espec.resolver(parametros, cache=cache_padrao).to_dict(omitir=() if distribuicao else ("Distribuicao",))
+
+
+def resolver_lote(espec, cenarios) -> Dict:
+    """Lote vetorizado via ``resolver_lote``; modelos sem versão vetorizada são resolvidos um a um."""
+    if not espec.vetorizavel:
+        return {"resultados": [resolver(espec, c) for c in cenarios]}
+    if any(c.keys() != cenarios[0].keys() for c in cenarios):
+        raise ErroRequisicao(400, "Todos os cenários do lote devem ter os mesmos parâmetros")
+    colunas = {k: [c[k] for c in cenarios] for k in cenarios[0]}
+    invalidos = espec.invalidos(colunas)
+    if len(invalidos):
+        indices = ", ".join(str(i) for i in invalidos[:20]) + (" ..." if len(invalidos) > 20 else "")
+        raise ErroRequisicao(400, f"Cenários inválidos para {espec.rotulo} (índices {indices}); "
+                                  f"o primeiro: {_erro_validacao(espec, cenarios[int(invalidos[0])])}")
+    tabela = espec.resolver_lote(colunas)
+    return {
+        "colunas": {campo: tabela[campo].tolist() for campo in tabela.dtype.names},
+        "cenarios": len(cenarios),
+    }
+
+
+def _erro_validacao(espec, cenario: Dict) -> str:
+    try:
+        espec.validar(cenario)
+    except (TypeError, ValueError) as e:
+        return str(e)
+    return "valor inválido"
+
+
+async def _despachar(metodo: str, caminho: str, corpo: bytes, consulta: bytes = b"") -> Tuple[int, object]:
+    partes = [p for p in caminho.split("/") if p]
+    if metodo == "GET" and partes == ["saude"]:
+        return 200, {"status": "ok"}
+    if metodo == "GET" and partes == ["modelos"]:
+        return 200, {"modelos": {
+            chave: {"rotulo": m.rotulo, "parametros": [p.nome for p in m.parametros]}
+            for chave, m in REGISTRO.items()
+        }}
+    if metodo == "GET" and partes == ["cache"]:
+        return 200, cache_padrao.estatisticas()
+    if not partes or partes[0] != "modelos" or len(partes) not in (2, 3) or (len(partes) == 3 and partes[2] != "lote"):
+        raise ErroRequisicao(404, f"Rota inexistente: {caminho}")
+    if metodo != "POST":
+        raise ErroRequisicao(405, "Use POST para resolver modelos")
+    espec = REGISTRO.get(partes[1].lower())
+    if espec is None:
+        raise ErroRequisicao(404, f"Modelo desconhecido: {partes[1]}")
+    try:
+        dados = json.loads(corpo or b"{}")
+    except ValueError:
+        raise ErroRequisicao(400, "Corpo da requisição não é um JSON válido")
+    if not isinstance(dados, dict):
+        raise ErroRequisicao(400, "O corpo deve ser um objeto JSON")
+
+    laco = asyncio.get_running_loop()
+    if len(partes) == 3:
+        cenarios = dados.get("cenarios")
+        if not isinstance(cenarios, list) or not cenarios or not all(isinstance(c, dict) for c in cenarios):
+            raise ErroRequisicao(400, "Informe 'cenarios' como uma lista não-vazia de objetos")
+        if len(cenarios) >= CENARIOS_PESADOS:
+            return 200, await laco.run_in_executor(_executor(), resolver_lote, espec, cenarios)
+        return 200, resolver_lote(espec, cenarios)
+    distribuicao = parse_qs(consulta.decode()).get("distribuicao", ["0"])[-1].lower() in ("1", "true", "sim")
+    valores = espec.validar(dados)
+    if _pesado(valores):
+        return 200, await laco.run_in_executor(_executor(), resolver, espec, valores, distribuicao)
+    return 200, resolver(espec, valores, distribuicao)
+
+
+async def _ler_corpo(receive) -> bytes:
+    partes = []
+    while True:
+        mensagem = await receive()
+        partes.append(mensagem.get("body", b""))
+        if not mensagem.get("more_body"):
+            return b"".join(partes)
+
+
+async def _responder(send, status: int, dados):
+    corpo = _codificar(dados)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json; charset=utf-8"),
+                    (b"content-length", str(len(corpo)).encode())],
+    })
+    await send({"type": "http.response.body", "body": corpo})
+
+
+async def _ciclo_de_vida(receive, send):
+    global _pool
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "lifespan.startup":
+            _executor()
+            await send({"type": "lifespan.startup.complete"})
+        elif mensagem["type"] == "lifespan.shutdown":
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+                _pool = None
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """Aplicação ASGI."""
+    if scope["type"] == "lifespan":
+        await _ciclo_de_vida(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    corpo = await _ler_corpo(receive)
+    try:
+        status, dados = await _despachar(scope["method"], scope["path"], corpo, scope.get("query_string", b""))
+    except ErroRequisicao as e:
+        status, dados = e.status, {"erro": str(e)}
+    except (ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+        status, dados = 400, {"erro": str(e)}
+    except Exception as e:  # noqa: BLE001 - o serviço não pode cair por um cenário
+        status, dados = 500, {"erro": f"Erro interno: {e}"}
+    await _responder(send, status, dados)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.environ.get("FILAS_HOST", "127.0.0.1"), port=int(os.environ.get("FILAS_PORTA", 8000)))